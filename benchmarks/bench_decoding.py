@@ -0,0 +1,104 @@
+"""
+Benchmark decoding of list pages: ``response.json()`` + ``from_json`` against
+decoding the raw bytes straight into msgspec structs.
+
+Usage::
+
+    python benchmarks/bench_decoding.py [--resource calls] [--repeat 20] [recorded_page.json ...]
+
+Recorded pages are raw response bodies saved from the API. Without them a
+synthetic page of calls is used.
+"""
+import argparse
+import json
+import random
+import time
+import typing
+
+from pycallrail.callrail import CallRail
+import pycallrail.structs as structs
+
+
+def synthetic_calls_page(records: int = 250) -> bytes:
+    rng = random.Random(0)
+    calls = []
+    for i in range(records):
+        calls.append({
+            'answered': rng.random() > 0.3,
+            'business_phone_number': None,
+            'customer_city': rng.choice(['Denver', 'Atlanta', 'Boston']),
+            'customer_country': 'US',
+            'customer_name': f'Customer {i}',
+            'customer_phone_number': f'+1303{i:07d}',
+            'customer_state': rng.choice(['CO', 'GA', 'MA']),
+            'direction': rng.choice(['inbound', 'outbound']),
+            'duration': rng.randint(0, 900),
+            'id': f'CAL{i:032x}',
+            'recording': f'https://api.callrail.com/v3/a/1/calls/{i}/recording.json',
+            'recording_duration': str(rng.randint(0, 900)),
+            'recording_player': f'https://app.callrail.com/calls/{i}/recording',
+            'start_time': f'2023-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T11:27:48.119-05:00',
+            'tracking_phone_number': '+13038163491',
+            'voicemail': False,
+            'company_id': 'COM8154748ae6bd4e278a7cddd38a662f4f',
+            'company_name': 'Widget Shop',
+            'source': rng.choice(['Google Ads', 'Direct', 'Bing']),
+            'medium': rng.choice(['cpc', 'organic', 'direct']),
+            'tags': ['New Client'],
+            'lead_status': rng.choice(['good_lead', 'not_a_lead', None]),
+        })
+    return json.dumps({
+        'page': 1,
+        'per_page': records,
+        'total_pages': 1,
+        'total_records': records,
+        'calls': calls,
+    }).encode()
+
+
+def bench(label: str, func: typing.Callable[[], typing.Any], repeat: int, records: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f'{label:<28} {elapsed * 1000:8.2f} ms/page  {elapsed / records * 1e6:8.2f} us/record')
+    return elapsed
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('pages', nargs='*', help='recorded page bodies')
+    arg_parser.add_argument('--resource', default='calls', choices=sorted(structs.MODELS))
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    if args.pages:
+        contents = [open(path, 'rb').read() for path in args.pages]
+    else:
+        args.resource = 'calls'
+        contents = [synthetic_calls_page()]
+
+    model = structs.MODELS[args.resource]
+    api_client = CallRail(api_key='benchmark')
+    records = sum(len(json.loads(content)[args.resource]) for content in contents)
+
+    def from_json() -> None:
+        for content in contents:
+            for record in json.loads(content)[args.resource]:
+                if args.resource == 'accounts':
+                    model.from_json(api_client, record)
+                else:
+                    model.from_json(api_client, 'benchmark', record)
+
+    def from_bytes() -> None:
+        for content in contents:
+            structs.decode_page(args.resource, content)
+
+    baseline = bench('response.json() + from_json', from_json, args.repeat, records)
+    fast = bench('msgspec structs', from_bytes, args.repeat, records)
+    print(f'speedup: {baseline / fast:.1f}x over {records} {args.resource}')
+
+
+if __name__ == '__main__':
+    main()
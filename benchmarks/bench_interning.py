@@ -0,0 +1,91 @@
+"""
+Memory benchmark for string interning of low-cardinality call fields.
+
+Decodes a synthetic dataset shaped like a large account (a few hundred companies,
+tracking numbers and sources) with and without ``intern_strings`` and reports the
+memory retained by the decoded Call objects.
+
+Usage::
+
+    python benchmarks/bench_interning.py [--calls 200000] [--companies 300]
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+import typing
+
+from pycallrail.callrail import CallRail
+from pycallrail.objects.calls import Call
+
+
+def synthetic_pages(calls: int, companies: int, page_size: int = 250) -> typing.List[bytes]:
+    rng = random.Random(0)
+    company_ids = [f'COM{i:032x}' for i in range(companies)]
+    company_names = {company_id: f'Company {i}' for i, company_id in enumerate(company_ids)}
+    numbers = [f'+1404555{i:04d}' for i in range(companies * 2)]
+    sources = ['Google Ads', 'Google Organic', 'Bing Ads', 'Direct', 'Facebook', 'Yelp']
+    mediums = ['cpc', 'organic', 'direct', 'referral']
+    states = ['GA', 'CO', 'NY', 'CA', 'TX', 'FL', 'MA']
+
+    pages: typing.List[bytes] = []
+    for start in range(0, calls, page_size):
+        records = []
+        for i in range(start, min(start + page_size, calls)):
+            company_id = rng.choice(company_ids)
+            records.append({
+                'id': f'CAL{i:032x}',
+                'answered': True,
+                'customer_phone_number': f'+1303{i:07d}',
+                'customer_state': rng.choice(states),
+                'customer_country': 'US',
+                'direction': rng.choice(['inbound', 'outbound']),
+                'duration': rng.randint(0, 900),
+                'start_time': '2023-05-01T11:27:48.119-05:00',
+                'tracking_phone_number': rng.choice(numbers),
+                'voicemail': False,
+                'company_id': company_id,
+                'company_name': company_names[company_id],
+                'source': rng.choice(sources),
+                'medium': rng.choice(mediums),
+            })
+        pages.append(json.dumps({'calls': records}).encode())
+    return pages
+
+
+def retained_bytes(pages: typing.List[bytes], intern_strings: bool) -> int:
+    api_client = CallRail(api_key='benchmark', intern_strings=intern_strings)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    decoded = [
+        Call.from_json(api_client, 'benchmark', record)
+        for page in pages for record in json.loads(page)['calls']
+    ]
+
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del decoded
+    return retained
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--calls', type=int, default=200000)
+    arg_parser.add_argument('--companies', type=int, default=300)
+    args = arg_parser.parse_args()
+
+    pages = synthetic_pages(args.calls, args.companies)
+    plain = retained_bytes(pages, intern_strings=False)
+    interned = retained_bytes(pages, intern_strings=True)
+
+    print(f'{"without interning":<20} {plain / 2**20:8.1f} MiB  {plain / args.calls:6.0f} B/call')
+    print(f'{"with interning":<20} {interned / 2**20:8.1f} MiB  {interned / args.calls:6.0f} B/call')
+    print(f'reduction: {1 - interned / plain:.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,192 @@
+import copy
+import datetime as dt
 import typing
 
+import pycallrail.decoders as decoders
+import pycallrail.identity as identity
+import pycallrail.interning as interning
+
+_default_client: typing.Any = None
+
+def set_default_client(api_client: typing.Any) -> None:
+    """
+    Set the client that unpickled models are attached to.
+
+    Models are pickled without their API client. Call this once per worker process,
+    e.g. from a ``ProcessPoolExecutor`` initializer, so models received by the worker
+    can talk to the API again.
+
+    :param api_client: The CallRail API client, or None to detach.
+    """
+    global _default_client
+    _default_client = api_client
+
+def get_default_client() -> typing.Any:
+    """
+    Return the client that unpickled models are attached to.
+    """
+    return _default_client
+
+def _restore_model(
+    cls: type,
+    state: typing.Dict[str, typing.Any],
+    attached: bool
+) -> typing.Any:
+    """
+    Rebuild a pickled model and attach it to the default client.
+    """
+    obj = cls.__new__(cls)
+    obj.__setstate__(state)
+    if attached:
+        obj.api_client = _default_client
+    return obj
+
+def _json_value(value: typing.Any) -> typing.Any:
+    # JSON form of a field value, in the shape the API returns it
+    if isinstance(value, CallRailBase):
+        return value.to_json()
+    if isinstance(value, (dt.datetime, dt.date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    return value
+
 class CallRailBase(object):
     def __init__(self) -> None:
         self.id: typing.Union[str, None, int] = None
 
     def __hash__(self) -> int:
         class_name = type(self).__name__
-        return hash((class_name, self.id))
\ No newline at end of file
+        return hash((class_name, self.id))
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        """
+        Data fields of the model. The API client (and its session) is left out,
+        the account is kept by reference through ``account_id``.
+        """
+        state = self.__dict__.copy()
+        state.pop('api_client', None)
+        return state
+
+    def __setstate__(self, state: typing.Dict[str, typing.Any]) -> None:
+        self.__dict__.update(state)
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return (_restore_model, (type(self), self.__getstate__(), 'api_client' in self.__dict__))
+
+    def __copy__(self) -> typing.Any:
+        obj = type(self).__new__(type(self))
+        obj.__dict__.update(self.__dict__)
+        return obj
+
+    def __deepcopy__(self, memo: typing.Dict[int, typing.Any]) -> typing.Any:
+        obj = type(self).__new__(type(self))
+        memo[id(self)] = obj
+        obj.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        if 'api_client' in self.__dict__:
+            obj.api_client = self.api_client
+        return obj
+
+    def to_json(self) -> typing.Dict[str, typing.Any]:
+        """
+        JSON data of the model's fields in the shape the API returns them, so
+        ``from_json`` rebuilds the model. Datetimes are written in ISO 8601.
+        """
+        fields: typing.Dict[str, None] = {}
+        for cls in reversed(type(self).__mro__):
+            fields.update(dict.fromkeys(cls.__dict__.get('__annotations__', {})))
+
+        return {name: _json_value(self.__dict__[name]) for name in fields if name in self.__dict__}
+
+    def attach(self, api_client: typing.Any) -> None:
+        """
+        Attach the model to an API client, e.g. after unpickling it in another process.
+
+        :param api_client: The CallRail API client.
+        """
+        self.api_client = api_client
+
+    @classmethod
+    def _decode(
+        cls,
+        api_client: typing.Any,
+        account_id: str,
+        json_data: typing.Dict[str, typing.Any]
+    ) -> typing.Any:
+        """
+        Build an instance from API data using the generated decoder of the class.
+        When the client keeps an identity map, the live instance is refreshed and returned.
+
+        :param api_client: The CallRail API client.
+        :param account_id: The account ID.
+        :param json_data: The JSON data.
+        """
+        return cls._decode_page(api_client, account_id, (json_data,))[0]
+
+    @classmethod
+    def _decode_page(
+        cls,
+        api_client: typing.Any,
+        account_id: str,
+        records: typing.Iterable[typing.Dict[str, typing.Any]]
+    ) -> typing.List[typing.Any]:
+        """
+        Build instances from a page of API data like ``_decode``, looking the decoder up
+        once for the whole page.
+
+        :param api_client: The CallRail API client.
+        :param account_id: The account ID.
+        :param records: The JSON data of the page.
+        """
+        decoder: decoders.Decoder = decoders.get_decoder(cls)
+        intern: typing.Any = interning.intern_for(api_client)
+        objs: typing.List[typing.Any] = []
+
+        for json_data in records:
+            obj = cls.__new__(cls)
+            CallRailBase.__init__(obj)
+            obj.api_client = api_client
+            obj.account_id = account_id
+            decoder(obj, json_data, intern=intern)
+            obj._mark_clean()
+            objs.append(identity.merge(api_client, obj))
+
+        return objs
+
+    @classmethod
+    def from_json_page(
+        cls,
+        api_client: typing.Any,
+        account_id: str,
+        records: typing.Iterable[typing.Dict[str, typing.Any]]
+    ) -> typing.List[typing.Any]:
+        """
+        Deserialize a page of JSON data. Models decoded with ``_decode`` decode the
+        whole page at once, the others call ``from_json`` per record.
+
+        :param api_client: The CallRail API client.
+        :param account_id: The account ID.
+        :param records: The JSON data of the page.
+        """
+        return [cls.from_json(api_client, account_id, json_data) for json_data in records] # type: ignore
+
+    def _refresh(self, json_data: typing.Dict[str, typing.Any]) -> None:
+        """
+        Update the instance in place from API data.
+
+        :param json_data: The JSON data.
+        """
+        decoders.get_decoder(type(self))(
+            self,
+            json_data,
+            partial=True,
+            intern=interning.intern_for(getattr(self, 'api_client', None))
+        )
+        self._mark_clean()
+
+    def _mark_clean(self) -> None:
+        """
+        Hook called after the instance was loaded from API data.
+        """
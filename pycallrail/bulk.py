@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+import typing
+
+import requests
+
+from pycallrail.concurrency import RateLimiter
+
+DEFAULT_CONCURRENCY: int = 8
+DEFAULT_MAX_RETRIES: int = 3
+DEFAULT_BACKOFF: float = 0.5
+MAX_BACKOFF: float = 30.0
+
+TRANSIENT_STATUS_CODES: typing.FrozenSet[int] = frozenset((429, 500, 502, 503, 504))
+
+# item key, function making the request and optionally which errors to retry
+Task = typing.Union[
+    typing.Tuple[typing.Hashable, typing.Callable[[], typing.Any]],
+    typing.Tuple[typing.Hashable, typing.Callable[[], typing.Any], typing.Callable[[BaseException], bool]]
+]
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a failed request is worth retrying: rate limiting, server errors and
+    connection problems.
+
+    :param error: The exception raised by the request.
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return False
+
+
+def is_unprocessed(error: BaseException) -> bool:
+    """
+    Whether a failed request certainly had no effect, so even a non-idempotent
+    request like a create can be retried: it was rate limited or never connected.
+
+    :param error: The exception raised by the request.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429
+    return False
+
+
+def idempotency_key(item: typing.Any) -> str:
+    """
+    Key identifying an item by its content, for items without a natural key.
+
+    :param item: A JSON-serializable item.
+    """
+    return hashlib.sha256(json.dumps(item, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def iter_queue(source: queue.Queue, sentinel: typing.Any = None) -> typing.Iterator[typing.Any]:
+    """
+    Yield the items put on a queue until the sentinel is put.
+
+    :param source: The queue.
+    :param sentinel: Item marking the end of the input.
+    """
+    while True:
+        item = source.get()
+        if item is sentinel:
+            return
+        yield item
+
+
+def retry_after(error: BaseException) -> typing.Optional[float]:
+    """
+    Seconds to wait before retrying as requested by the API's Retry-After header, if any.
+
+    :param error: The exception raised by the request.
+    """
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers['Retry-After'])
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+class BulkResult(object):
+    """
+    Outcome of a single item of a bulk operation.
+    """
+
+    def __init__(
+            self,
+            key: typing.Hashable,
+            ok: bool,
+            attempts: int,
+            response: typing.Any = None,
+            error: typing.Optional[BaseException] = None,
+            skipped: bool = False
+    ) -> None:
+        """
+        :param key: Identifies the item, e.g. the call id.
+        :param ok: Whether the item succeeded.
+        :param attempts: Number of attempts made for the item.
+        :param response: The decoded response of the successful request.
+        :param error: The exception of the last failed request.
+        :param skipped: The item was done before, by an earlier run or a duplicate.
+        """
+        self.key: typing.Hashable = key
+        self.ok: bool = ok
+        self.attempts: int = attempts
+        self.response: typing.Any = response
+        self.error: typing.Optional[BaseException] = error
+        self.skipped: bool = skipped
+
+    def __repr__(self) -> str:
+        if self.skipped:
+            return f'<BulkResult {self.key!r} skipped>'
+        if self.ok:
+            return f'<BulkResult {self.key!r} ok attempts={self.attempts}>'
+        return f'<BulkResult {self.key!r} failed attempts={self.attempts} error={self.error!r}>'
+
+
+class BulkReport(object):
+    """
+    Per-item results of a bulk operation, in the order the items completed.
+    """
+
+    def __init__(self, results: typing.List[BulkResult], elapsed: float) -> None:
+        """
+        :param results: The per-item results.
+        :param elapsed: Seconds the operation took.
+        """
+        self.results: typing.List[BulkResult] = results
+        self.elapsed: float = elapsed
+
+    @property
+    def succeeded(self) -> typing.List[BulkResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> typing.List[BulkResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def throughput(self) -> float:
+        """
+        Items completed per second.
+        """
+        return len(self.results) / self.elapsed if self.elapsed > 0 else float(len(self.results))
+
+    def summary(self) -> typing.Dict[str, typing.Any]:
+        """
+        Counts of succeeded, failed, skipped and retried items, attempts made and throughput.
+        """
+        return {
+            'total': len(self.results),
+            'succeeded': len(self.succeeded),
+            'failed': len(self.failed),
+            'skipped': sum(1 for result in self.results if result.skipped),
+            'retried': sum(1 for result in self.results if result.attempts > 1),
+            'attempts': sum(result.attempts for result in self.results),
+            'elapsed': self.elapsed,
+            'throughput': self.throughput,
+        }
+
+    def __iter__(self) -> typing.Iterator[BulkResult]:
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+class BulkExecutor(object):
+    """
+    Runs many independent requests with bounded concurrency, an optional request rate
+    and retries of transient failures.
+
+    Items are pulled lazily from the iterable, so arbitrarily long inputs are not
+    loaded into memory. Transient failures are retried with exponential backoff and
+    jitter, honouring Retry-After; other failures are reported right away.
+    """
+
+    def __init__(
+            self,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            rate: typing.Optional[float] = None,
+            max_retries: int = DEFAULT_MAX_RETRIES,
+            backoff: float = DEFAULT_BACKOFF,
+            sleep: typing.Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        :param concurrency: Maximum number of requests in flight.
+        :param rate: Maximum requests per second of this operation, on top of the client's rate limit.
+        :param max_retries: Retries of an item after a transient failure.
+        :param backoff: Seconds to wait before the first retry, doubled on every further retry.
+        :param sleep: Called to wait between retries.
+        """
+        self.concurrency: int = max(1, concurrency)
+        self.rate_limiter: typing.Optional[RateLimiter] = RateLimiter(rate) if rate else None
+        self.max_retries: int = max_retries
+        self.backoff: float = backoff
+        self.sleep: typing.Callable[[float], None] = sleep
+
+    def _delay(self, attempt: int, error: BaseException) -> float:
+        requested: typing.Optional[float] = retry_after(error)
+        if requested is not None:
+            return requested
+        return min(MAX_BACKOFF, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+    def run_one(
+            self,
+            key: typing.Hashable,
+            fn: typing.Callable[[], typing.Any],
+            retry_on: typing.Callable[[BaseException], bool] = is_transient
+    ) -> BulkResult:
+        """
+        Run a single item, retrying transient failures.
+
+        :param key: Identifies the item.
+        :param fn: Makes the request and returns its decoded response.
+        :param retry_on: Whether an error is retried.
+        """
+        attempt: int = 0
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return BulkResult(key, True, attempt, response=fn())
+            except Exception as e:
+                if attempt > self.max_retries or not retry_on(e):
+                    return BulkResult(key, False, attempt, error=e)
+                self.sleep(self._delay(attempt, e))
+
+    def run(
+            self,
+            tasks: typing.Iterable[Task],
+            on_result: typing.Optional[typing.Callable[[BulkResult], None]] = None
+    ) -> BulkReport:
+        """
+        Run all items and return their results.
+
+        :param tasks: Pairs of item key and a function making the item's request,
+            optionally followed by a predicate selecting the errors to retry.
+        :param on_result: Called with every result as soon as its item completed.
+        """
+        started: float = time.monotonic()
+        results: typing.List[BulkResult] = []
+        # bounds the submitted but unfinished items
+        slots = threading.BoundedSemaphore(self.concurrency * 2)
+
+        def done(future: concurrent.futures.Future) -> None:
+            slots.release()
+            result: BulkResult = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for task in tasks:
+                slots.acquire()
+                executor.submit(self.run_one, *task).add_done_callback(done)
+
+        return BulkReport(results, time.monotonic() - started)
+
+
+_RecordFileT = typing.TypeVar('_RecordFileT', bound='RecordFile')
+
+
+class RecordFile(object):
+    """
+    Append-only JSON lines file of records keyed by ``key``, loaded back when it is
+    opened again. A later record of a key replaces the earlier one.
+
+    Records are flushed as soon as they are appended, so an interrupted run loses at
+    most a torn last line, which is ignored on load.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: JSON lines file. Created if missing.
+        """
+        self.path: str = path
+        self._records: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # torn last line of an interrupted run
+                        continue
+                    self._apply(record)
+
+        self._file = open(path, 'a')
+
+    def _apply(self, record: typing.Dict[str, typing.Any]) -> None:
+        # called for every loaded and appended record, subclasses keep derived state here
+        self._records[record['key']] = record
+
+    def _append(self, record: typing.Dict[str, typing.Any]) -> None:
+        with self._lock:
+            self._apply(record)
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self: _RecordFileT) -> _RecordFileT:
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class Checkpoint(RecordFile):
+    """
+    Append-only record of completed items, so a rerun skips what was already done.
+
+    Every successful item is written to a JSON lines file as soon as it completed,
+    together with the ID of the object it created or updated, if any.
+    """
+
+    def is_done(self, key: str) -> bool:
+        return key in self._records
+
+    def id_of(self, key: str) -> typing.Any:
+        """
+        ID recorded for a completed item.
+
+        :param key: The item key.
+        """
+        return self._records.get(key, {}).get('id')
+
+    def record(self, key: str, id: typing.Any = None) -> None:
+        """
+        Mark an item as completed.
+
+        :param key: The item key.
+        :param id: ID of the object the item created or updated.
+        """
+        self._append({'key': key, 'id': id})
+
+
+class FileManifest(RecordFile):
+    """
+    Append-only record of the files a bulk download wrote, with their size, so a rerun
+    skips the files that are still intact.
+    """
+
+    def size_of(self, key: str) -> typing.Optional[int]:
+        """
+        Size recorded for a file, or None if it wasn't written yet.
+
+        :param key: The item key.
+        """
+        record: typing.Optional[typing.Dict[str, typing.Any]] = self._records.get(key)
+        return record['size'] if record is not None else None
+
+    def is_intact(self, key: str, path: str) -> bool:
+        """
+        Whether the file of an item exists with the size recorded for it.
+
+        :param key: The item key.
+        :param path: The file.
+        """
+        size: typing.Optional[int] = self.size_of(key)
+        return size is not None and os.path.exists(path) and os.path.getsize(path) == size
+
+    def record(self, key: str, path: str) -> None:
+        """
+        Record a completed file with its current size.
+
+        :param key: The item key.
+        :param path: The file.
+        """
+        self._append({'key': key, 'size': os.path.getsize(path)})
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import copy
+import json
+import threading
+import time
+import typing
+from urllib.parse import urlparse
+
+DEFAULT_MAX_ENTRIES: int = 1024
+
+# seconds a cached response of a resource stays fresh
+DEFAULT_TTLS: typing.Dict[str, float] = {
+    'accounts': 300.0,
+    'companies': 300.0,
+    'tags': 300.0,
+    'calls': 30.0,
+    'form_submissions': 30.0,
+    'text-messages': 30.0,
+}
+DEFAULT_TTL: float = 60.0
+# seconds a 404 is remembered
+DEFAULT_NEGATIVE_TTL: float = 10.0
+
+MISS: typing.Any = object()
+NOT_FOUND: typing.Any = object()
+
+CacheKey = typing.Tuple[str, str]
+
+
+def resource_of(url: str) -> typing.Tuple[typing.Optional[str], typing.Optional[str]]:
+    """
+    Split an API url into the account id and resource it belongs to.
+
+    ``.../a/ACC/companies/COM.json`` gives ``('ACC', 'companies')`` and
+    ``.../a/ACC.json`` gives ``('ACC', 'accounts')``.
+
+    :param url: The request url.
+    """
+    parts: typing.List[str] = urlparse(url).path.strip('/').split('/')
+    if parts and parts[0].startswith('v') and parts[0][1:].isdigit():
+        parts = parts[1:]
+
+    if not parts or parts[0] not in ('a', 'a.json'):
+        return None, None
+    if parts[0] == 'a.json':
+        return None, 'accounts'
+    if len(parts) == 2:
+        return parts[1].split('.json')[0], 'accounts'
+    if len(parts) > 2:
+        return parts[1], parts[2].split('.json')[0]
+    return None, None
+
+
+def copy_response(value: typing.Any) -> typing.Any:
+    """
+    Copy a decoded response so callers can't mutate the cached one.
+
+    Models keep nested values such as ``tags`` lists as-is, so the copy is deep.
+
+    :param value: A decoded JSON response.
+    """
+    return copy.deepcopy(value)
+
+
+class ResponseCache(object):
+    """
+    Thread-safe in-memory cache of GET responses, bounded in size and freshness.
+
+    Entries are evicted least recently used first once ``max_entries`` is reached
+    and expire after the TTL of their resource. Writes made through the client
+    invalidate the cached responses of the resource they touch.
+
+    Pass an instance to ``CallRail(cache=...)``. Only single-object responses are
+    cached unless ``cache_lists`` is set, either to True or to the resources whose
+    lists are cached. A 404 for a single object is remembered for ``negative_ttl``
+    seconds, during which requesting it again raises ``CachedNotFoundError`` without
+    a request.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = DEFAULT_MAX_ENTRIES,
+            ttls: typing.Optional[typing.Mapping[str, float]] = None,
+            default_ttl: float = DEFAULT_TTL,
+            cache_lists: typing.Union[bool, typing.Collection[str]] = False,
+            negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+            clock: typing.Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        :param max_entries: Maximum number of cached responses.
+        :param ttls: Seconds a response stays fresh, per resource. Merged over ``DEFAULT_TTLS``.
+        :param default_ttl: Seconds a response of any other resource stays fresh.
+        :param cache_lists: Also cache paginated list responses, of all resources or of the given ones.
+        :param negative_ttl: Seconds a 404 is remembered. 0 disables it.
+        :param clock: Monotonic time source, in seconds.
+        """
+        self.max_entries: int = max_entries
+        self.ttls: typing.Dict[str, float] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl: float = default_ttl
+        self.cache_lists: typing.Union[bool, typing.Collection[str]] = cache_lists
+        self.negative_ttl: float = negative_ttl
+        self.clock: typing.Callable[[], float] = clock
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.negative_hits: int = 0
+
+        # key -> (expires at, account id, resource, value)
+        self._entries: collections.OrderedDict[CacheKey, typing.Tuple[float, typing.Optional[str], typing.Optional[str], typing.Any]] = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    @staticmethod
+    def key_for(url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> CacheKey:
+        """
+        Cache key of a request.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        """
+        return (url, json.dumps(params or {}, sort_keys=True, default=str))
+
+    def ttl_for(self, resource: typing.Optional[str]) -> float:
+        """
+        Seconds a response of the resource stays fresh.
+
+        :param resource: The resource name, e.g. ``companies``.
+        """
+        return self.ttls.get(resource, self.default_ttl) if resource else self.default_ttl
+
+    def caches_list(self, url: str) -> bool:
+        """
+        Whether list responses of a url are cached.
+
+        :param url: The request url.
+        """
+        if isinstance(self.cache_lists, bool):
+            return self.cache_lists
+        return resource_of(url)[1] in self.cache_lists
+
+    @contextlib.contextmanager
+    def bypass(self) -> typing.Iterator[None]:
+        """
+        Within the block, lookups from the current thread miss while responses are
+        still stored, so a refresh replaces entries without serving them.
+        """
+        self._local.bypass = True
+        try:
+            yield
+        finally:
+            self._local.bypass = False
+
+    def get(self, url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> typing.Any:
+        """
+        Return a copy of the cached response, ``NOT_FOUND`` for a remembered 404, or ``MISS``.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        """
+        if getattr(self._local, 'bypass', False):
+            return MISS
+
+        key: CacheKey = self.key_for(url, params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISS
+
+            self._entries.move_to_end(key)
+            if entry[3] is NOT_FOUND:
+                self.negative_hits += 1
+                return NOT_FOUND
+            self.hits += 1
+            return copy_response(entry[3])
+
+    def set(
+            self,
+            url: str,
+            params: typing.Optional[typing.Mapping[str, typing.Any]],
+            value: typing.Any,
+            ttl: typing.Optional[float] = None
+    ) -> None:
+        """
+        Cache a copy of a response.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        :param value: The decoded response, or ``NOT_FOUND`` to remember a 404.
+        :param ttl: Seconds the response stays fresh, overriding the TTL of its resource,
+            e.g. the time left of a response loaded earlier.
+        """
+        key: CacheKey = self.key_for(url, params)
+        account_id, resource = resource_of(url)
+        if ttl is None:
+            ttl = self.negative_ttl if value is NOT_FOUND else self.ttl_for(resource)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        if value is not NOT_FOUND:
+            value = copy_response(value)
+
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, account_id, resource, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, account_id: typing.Optional[str] = None, resource: typing.Optional[str] = None) -> int:
+        """
+        Drop the cached responses of an account and/or resource. Returns the number dropped.
+
+        :param account_id: Only drop responses of this account.
+        :param resource: Only drop responses of this resource, e.g. ``companies``.
+        """
+        with self._lock:
+            stale: typing.List[CacheKey] = [
+                key for key, (_, entry_account, entry_resource, _) in self._entries.items()
+                if (account_id is None or entry_account == account_id)
+                and (resource is None or entry_resource == resource)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.negative_hits = 0
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Hit, remembered 404 and miss counters and the number of cached responses.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'size': len(self._entries)
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
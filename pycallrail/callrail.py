@@ -1,10 +1,34 @@
 from __future__ import with_statement, print_function, absolute_import, annotations
+import datetime as dt
 import requests
 import typing
 import collections
 
 from pycallrail.objects.accounts import Account
+from pycallrail.objects.calls import Call
+from pycallrail.objects.form_submissions import FormSubmission
 from pycallrail.helpers import build_url
+from pycallrail.identity import IdentityMap
+from pycallrail.interning import InternTable
+from pycallrail.cache import ResponseCache, MISS, NOT_FOUND, copy_response
+from pycallrail.concurrency import DEFAULT_FAN_OUT_WORKERS, RateLimiter, SingleFlight, fan_out
+from pycallrail.errors import CachedNotFoundError
+from pycallrail.http_cache import ConditionalCache
+from pycallrail.disk_cache import DiskCache
+from pycallrail.preload import Preloader
+import pycallrail.structs as structs
+
+T = typing.TypeVar('T')
+
+class _Session(requests.Session):
+    """requests.Session waiting for the client's rate limiter before every request"""
+
+    rate_limiter: typing.Optional[RateLimiter] = None
+
+    def request(self, *args: typing.Any, **kwargs: typing.Any) -> requests.Response:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return super(_Session, self).request(*args, **kwargs)
 
 class CallRail(object):
     """Base class for CallRail API access"""
@@ -13,13 +37,27 @@ class CallRail(object):
             self, 
             api_key: str, 
             proxies: typing.Optional[collections.MutableMapping[str, str]] = None, 
-            default_pagination_type: typing.Optional[str] = 'relative'
+            default_pagination_type: typing.Optional[str] = 'relative',
+            identity_map: bool = False,
+            intern_strings: bool = False,
+            cache: typing.Optional[ResponseCache] = None,
+            http_cache: typing.Optional[ConditionalCache] = None,
+            disk_cache: typing.Optional[DiskCache] = None,
+            coalesce_requests: bool = True,
+            rate_limit: typing.Optional[float] = None
         ) -> None:
         """
         Constructor
         
         :api_key: API Key for the CallRail Account.
         :proxies: Set of proxies to use.
+        :identity_map: Reuse a single live instance per object fetched through this client.
+        :intern_strings: Share the strings of low-cardinality fields between decoded objects.
+        :cache: Response cache for GET requests. Writes through this client invalidate it.
+        :http_cache: Conditional cache revalidating GET pages with their ETag / Last-Modified.
+        :disk_cache: Persistent cache of GET pages, read before going to the API.
+        :coalesce_requests: Share one request between concurrent identical GET requests.
+        :rate_limit: Maximum requests per second started through this client.
         """
         if api_key is None:
             raise ValueError('API key is required')
@@ -27,7 +65,9 @@ class CallRail(object):
         self.api_key: str = api_key
         self.proxies: typing.Union[collections.MutableMapping[str, str], None] = proxies
         
-        self.session: requests.Session = requests.Session()
+        self.session: requests.Session = _Session()
+        self.rate_limiter: typing.Optional[RateLimiter] = RateLimiter(rate_limit) if rate_limit else None
+        self.session.rate_limiter = self.rate_limiter # type: ignore
         
         if proxies is not None:
             self.session.proxies = typing.cast(collections.MutableMapping[str, str], proxies)
@@ -38,12 +78,74 @@ class CallRail(object):
 
         self.session.headers.update(self.auth_header)
 
+        self.identity_map: typing.Optional[IdentityMap] = IdentityMap() if identity_map else None
+        self.intern_table: typing.Optional[InternTable] = InternTable() if intern_strings else None
+        self.cache: typing.Optional[ResponseCache] = cache
+        self.http_cache: typing.Optional[ConditionalCache] = http_cache
+        self.disk_cache: typing.Optional[DiskCache] = disk_cache
+        self.single_flight: typing.Optional[SingleFlight] = SingleFlight() if coalesce_requests else None
+        # account id -> TagRegistry, created through Account.tag_registry
+        self.tag_registries: typing.Dict[str, typing.Any] = {}
+
         if default_pagination_type == 'relative':
             self.default_pagination_param: collections.MutableMapping[str, str] = {
                 'relative_pagination': 'true'
             }
 
     
+    def _fetch_json(
+            self,
+            url: str,
+            params: typing.Optional[typing.Mapping[str, typing.Any]] = None
+    ) -> typing.Any:
+        """
+        GET a single page and return its decoded body.
+
+        With a disk cache a page it holds is returned without a request. With a
+        conditional cache the page is revalidated with its stored ETag and
+        Last-Modified, and a 304 is answered from the stored body.
+
+        :url: Request url
+        :params: Query string parameters
+        """
+        disk_cache: typing.Optional[DiskCache] = self.disk_cache
+        if disk_cache is not None:
+            cached: typing.Any = disk_cache.get(url, params)
+            if cached is not None:
+                return cached
+
+        http_cache: typing.Optional[ConditionalCache] = self.http_cache
+        headers: typing.Dict[str, str] = http_cache.request_headers(url, params) if http_cache is not None else {}
+
+        response: requests.Response = self.session.get(
+            url=url,
+            params=params,
+            headers=headers or None
+        )
+
+        body: typing.Any = None
+        if response.status_code == 304 and headers:
+            try:
+                body = http_cache.not_modified(url, params) # type: ignore
+            except KeyError:
+                # evicted since the request was sent, fetch it unconditionally
+                response = self.session.get(
+                    url=url,
+                    params=params
+                )
+
+        if body is None:
+            response.raise_for_status()
+            body = response.json()
+
+            if http_cache is not None:
+                http_cache.store(url, params, response.headers, body)
+
+        if disk_cache is not None:
+            disk_cache.set(url, params, body)
+
+        return body
+
     def _relative_paginator(
             self,
             response: requests.Response,
@@ -55,29 +157,51 @@ class CallRail(object):
         :response: Response object
         :response_data_key: Key to use for response data
         """
+        return self._paginate_relative(response.json(), response_data_key)
+
+    def _paginate_relative(
+            self,
+            body: typing.Dict[str, typing.Any],
+            response_data_key: typing.Optional[str] = None
+    ) -> typing.List[typing.Dict[str, typing.Any]]:
+        """
+        Collect the records of a decoded first page and the pages following it.
+
+        :body: Decoded first page
+        :response_data_key: Key to use for response data
+        """
 
         result_bag: list[None] = []
 
-        while True:
-            try:
-                result_bag.extend(response.json()[response_data_key])
-            except KeyError:
-                break
-            if "next_page" not in response.json() \
-                or "has_next_page" not in response.json() \
-                    or response.json()['has_next_page'] is False:
-                break
-            try:
-                response = self.session.get(
-                    url=response.json()['next_page'],
-                    params=self.default_pagination_param
-                )
-                response.raise_for_status()
-            except Exception as e:
-                raise e
+        for page in self._relative_pages(body, response_data_key):
+            result_bag.extend(page)
         
         return typing.cast(typing.List[typing.Dict[str, typing.Any]], result_bag)
 
+    def _relative_pages(
+            self,
+            body: typing.Dict[str, typing.Any],
+            response_data_key: typing.Optional[str] = None
+    ) -> typing.Iterator[typing.List[typing.Dict[str, typing.Any]]]:
+        """
+        Yield the records of a decoded first page and of the pages following it, one page at a time.
+
+        :body: Decoded first page
+        :response_data_key: Key to use for response data
+        """
+        while True:
+            if response_data_key not in body:
+                return
+            yield body[response_data_key]
+            if "next_page" not in body \
+                or "has_next_page" not in body \
+                    or body['has_next_page'] is False:
+                return
+            body = self._fetch_json(
+                url=body['next_page'],
+                params=self.default_pagination_param
+            )
+
     def _offset_paginator(
             self,
             response: requests.Response,
@@ -89,31 +213,91 @@ class CallRail(object):
         :response: Response object
         :response_data_key: Key to use for response data
         """
+        return self._paginate_offset(response.json(), response.url, None, response_data_key)
+
+    def _paginate_offset(
+            self,
+            body: typing.Dict[str, typing.Any],
+            url: str,
+            params: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+            response_data_key: typing.Optional[str] = None
+    ) -> typing.List[typing.Dict[str, typing.Any]]:
+        """
+        Collect the records of a decoded first page and the pages following it.
+
+        :body: Decoded first page
+        :url: Request url of the first page
+        :params: Query string parameters of the first page
+        :response_data_key: Key to use for response data
+        """
 
         result_bag: list[None] = []
-        
-        current_page: int = response.json()['page']
-        total_pages: int = response.json()['total_pages']
+
+        for page in self._offset_pages(body, url, params, response_data_key):
+            result_bag.extend(page)
+
+        return typing.cast(typing.List[typing.Dict[str, typing.Any]], result_bag)
+
+    def _offset_pages(
+            self,
+            body: typing.Dict[str, typing.Any],
+            url: str,
+            params: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+            response_data_key: typing.Optional[str] = None
+    ) -> typing.Iterator[typing.List[typing.Dict[str, typing.Any]]]:
+        """
+        Yield the records of a decoded first page and of the pages following it, one page at a time.
+
+        :body: Decoded first page
+        :url: Request url of the first page
+        :params: Query string parameters of the first page
+        :response_data_key: Key to use for response data
+        """
+        current_page: int = body['page']
+        total_pages: int = body['total_pages']
 
         while True:
-            try:
-                result_bag.extend(response.json()[response_data_key])
-            except KeyError:
-                break
+            if response_data_key not in body:
+                return
+            yield body[response_data_key]
             if current_page == total_pages:
-                break
-            try:
-                response = self.session.get(
-                    url=f'{response.url}',
-                    params={'page': current_page + 1},
-                    headers=self.auth_header
-                )
-                response.raise_for_status()
-            except Exception as e:
-                raise e
-            current_page = response.json()['page']
+                return
+            body = self._fetch_json(
+                url=url,
+                params={**(params or {}), 'page': current_page + 1}
+            )
+            current_page = body['page']
 
-        return typing.cast(typing.List[typing.Dict[str, typing.Any]], result_bag)
+    def _iter_pages(
+            self,
+            endpoint: str,
+            response_data_key: str,
+            path: typing.Optional[str] = None,
+            params: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+            pagination_type: typing.Optional[str] = 'RELATIVE'
+    ) -> typing.Iterator[typing.List[typing.Dict[str, typing.Any]]]:
+        """
+        GET a listing and yield its records one page at a time, requesting a page only
+        once the previous one was consumed. Pages bypass the response cache.
+
+        :endpoint: API endpoint
+        :response_data_key: Key to use for response data
+        :path: API path
+        :params: Query string parameters
+        :pagination_type: OFFSET or RELATIVE
+        """
+        url: str = build_url(base_url=self.BASE_URL, endpoint=endpoint, path=path) if path \
+            else build_url(base_url=self.BASE_URL, endpoint=endpoint)
+
+        if pagination_type == 'RELATIVE':
+            params = {**(params or {}), **self.default_pagination_param}
+
+        body: typing.Any = self._fetch_json(url, params or None)
+
+        if pagination_type == 'OFFSET':
+            yield from self._offset_pages(body, url, params, response_data_key)
+        else:
+            yield from self._relative_pages(body, response_data_key)
     
     def _get(
             self,
@@ -125,6 +309,9 @@ class CallRail(object):
     ) -> typing.Union[typing.List[typing.Dict[str, typing.Any]], typing.Dict[str, typing.Any], None]:
         """
         Make a GET request to the CallRail API.
+
+        Concurrent identical requests share one request unless coalescing was
+        disabled on the client.
         
         :endpoint: API endpoint
         :path: API path
@@ -143,40 +330,151 @@ class CallRail(object):
                 endpoint=endpoint
             )
 
-        if params:
-            if pagination_type == 'RELATIVE':
-                params.update(self.default_pagination_param)
-            first_response: requests.Response = self.session.get(
-                url=url,
-                params=params
-            )
-        else:
-            if pagination_type == 'RELATIVE':
-                first_response: requests.Response = self.session.get( # type: ignore
-                    url=url,
-                    params=self.default_pagination_param
+        # single objects aren't paginated
+        if response_data_key is None:
+            pagination_type = 'NONE'
+
+        cache: typing.Optional[ResponseCache] = self.cache
+        cacheable: bool = cache is not None and (pagination_type == 'NONE' or cache.caches_list(url)) # type: ignore
+        cache_params: typing.Dict[str, typing.Any] = self._cache_params(params, pagination_type)
+        if cacheable:
+            cached = cache.get(url, cache_params) # type: ignore
+            if cached is NOT_FOUND:
+                raise CachedNotFoundError(url)
+            if cached is not MISS:
+                return cached
+
+        try:
+            if self.single_flight is not None:
+                result = self.single_flight.do(
+                    ResponseCache.key_for(url, cache_params),
+                    lambda: self._fetch(url, response_data_key, params, pagination_type),
+                    copy=copy_response
                 )
             else:
-                first_response: requests.Response = self.session.get( # type: ignore
-                    url=url
-                )
+                result = self._fetch(url, response_data_key, params, pagination_type)
+        except requests.HTTPError as e:
+            if cacheable and pagination_type == 'NONE' \
+                    and e.response is not None and e.response.status_code == 404:
+                cache.set(url, cache_params, NOT_FOUND) # type: ignore
+            raise
 
-        first_response.raise_for_status()
+        if cacheable:
+            cache.set(url, cache_params, result) # type: ignore
+
+        return result
+
+    @staticmethod
+    def _cache_params(
+            params: typing.Optional[typing.Mapping[str, typing.Any]],
+            pagination_type: typing.Optional[str]
+    ) -> typing.Dict[str, typing.Any]:
+        """
+        Parameters a GET response is cached under.
+
+        :params: Query string parameters
+        :pagination_type: OFFSET, RELATIVE or NONE
+        """
+        return dict(params or {}, pagination_type=pagination_type)
+
+    def _fetch(
+            self,
+            url: str,
+            response_data_key: typing.Optional[str],
+            params: typing.Optional[typing.MutableMapping[str, typing.Any]],
+            pagination_type: typing.Optional[str]
+    ) -> typing.Union[typing.List[typing.Dict[str, typing.Any]], typing.Dict[str, typing.Any], None]:
+        """
+        Request a url and follow its pagination.
+
+        :url: Request url
+        :response_data_key: Key to use for response data
+        :params: Query string parameters
+        :pagination_type: OFFSET, RELATIVE or NONE
+        """
+        if pagination_type == 'RELATIVE':
+            params = {**(params or {}), **self.default_pagination_param}
+
+        body: typing.Any = self._fetch_json(url, params or None)
 
         if pagination_type == 'OFFSET':
-            return self._offset_paginator(
-                response=first_response,
+            return self._paginate_offset(
+                body=body,
+                url=url,
+                params=params,
                 response_data_key=response_data_key
             )
         elif pagination_type == 'RELATIVE':
-            return self._relative_paginator(
-                response=first_response,
+            return self._paginate_relative(
+                body=body,
                 response_data_key=response_data_key
             )
         
         else:
-            return first_response.json()
+            return body
         
+    def _get_structs(
+            self,
+            endpoint: str,
+            response_data_key: str,
+            path: typing.Optional[str] = None,
+            params: typing.Optional[typing.MutableMapping[str, typing.Any]] = None,
+            pagination_type: typing.Optional[str] = 'RELATIVE'
+    ) -> typing.List[typing.Any]:
+        """
+        Make a GET request to the CallRail API and decode the raw pages straight into
+        msgspec structs, skipping the intermediate dicts and model objects.
+
+        Requires the optional msgspec dependency.
+
+        :endpoint: API endpoint
+        :response_data_key: Key to use for response data
+        :path: API path
+        :params: Query string parameters
+        """
+        url: str = build_url(
+            base_url=self.BASE_URL,
+            endpoint=endpoint,
+            path=path
+        )
+
+        request_params: typing.Dict[str, typing.Any] = dict(params or {})
+        if pagination_type == 'RELATIVE':
+            request_params.update(self.default_pagination_param)
+
+        response: requests.Response = self.session.get(
+            url=url,
+            params=request_params
+        )
+        response.raise_for_status()
+
+        result_bag: typing.List[typing.Any] = []
+
+        while True:
+            page = structs.decode_page(response_data_key, response.content)
+            result_bag.extend(getattr(page, response_data_key))
+
+            if pagination_type == 'RELATIVE':
+                if not page.has_next_page or not page.next_page:
+                    break
+                response = self.session.get(
+                    url=page.next_page,
+                    params=self.default_pagination_param
+                )
+            elif pagination_type == 'OFFSET':
+                if page.page is None or page.total_pages is None or page.page >= page.total_pages:
+                    break
+                response = self.session.get(
+                    url=url,
+                    params={**request_params, 'page': page.page + 1}
+                )
+            else:
+                break
+
+            response.raise_for_status()
+
+        return result_bag
+
     def _post(
             self,
             endpoint: str,
@@ -301,6 +599,22 @@ class CallRail(object):
         )
         response.raise_for_status()
 
+    def _invalidate_cache(
+            self,
+            account_id: typing.Optional[str] = None,
+            resource: typing.Optional[str] = None
+    ) -> None:
+        """
+        Drop cached responses after a write.
+
+        :account_id: Account written to
+        :resource: Resource written to, e.g. companies
+        """
+        if self.cache is not None:
+            self.cache.invalidate(account_id, resource)
+        if self.disk_cache is not None:
+            self.disk_cache.invalidate(account_id, resource)
+
     #########################
     # Accounts
     #########################
@@ -361,4 +675,115 @@ class CallRail(object):
                 pagination_type='NONE'
             ))
         )
-    
\ No newline at end of file
+    
+
+    #########################
+    # Fan-out
+    #########################
+
+    def _fan_out(
+            self,
+            lister: typing.Callable[[Account], typing.Iterable[T]],
+            accounts: typing.Optional[typing.Iterable[Account]],
+            max_workers: int
+    ) -> typing.Iterator[typing.Tuple[str, T]]:
+        """
+        Merge what ``lister`` yields for every account into one stream tagged with the account ID.
+
+        :lister: Lists the objects of an account
+        :accounts: Accounts to list, all accounts of the API key by default
+        :max_workers: Number of accounts listed concurrently
+        """
+        if accounts is None:
+            accounts = self.list_accounts()
+
+        return typing.cast(typing.Iterator[typing.Tuple[str, T]], fan_out(
+            ((account.id, lambda account=account: lister(account)) for account in accounts),
+            max_workers=max_workers
+        ))
+
+    def iter_calls_all_accounts(
+            self,
+            start_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            end_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            accounts: typing.Optional[typing.Iterable[Account]] = None,
+            max_workers: int = DEFAULT_FAN_OUT_WORKERS,
+            **kwargs
+    ) -> typing.Iterator[typing.Tuple[str, Call]]:
+        """
+        Stream the calls of every account as pairs of account ID and call.
+
+        The accounts are paginated concurrently, ``max_workers`` at a time, and their
+        pages merged as they arrive; all requests share the client's rate limit. Takes
+        the keyword arguments of ``Account.iter_calls``.
+
+        :start_date: First day of the calls, a date or ISO 8601 string.
+        :end_date: Last day of the calls, a date or ISO 8601 string.
+        :accounts: Accounts to list, all accounts of the API key by default.
+        :max_workers: Number of accounts paginated concurrently.
+        """
+        return self._fan_out(
+            lambda account: account.iter_calls(start_date=start_date, end_date=end_date, **kwargs),
+            accounts,
+            max_workers
+        )
+
+    def iter_form_submissions_all_accounts(
+            self,
+            start_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            end_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            accounts: typing.Optional[typing.Iterable[Account]] = None,
+            max_workers: int = DEFAULT_FAN_OUT_WORKERS,
+            **kwargs
+    ) -> typing.Iterator[typing.Tuple[str, FormSubmission]]:
+        """
+        Stream the form submissions of every account as pairs of account ID and form submission.
+
+        The accounts are paginated concurrently, ``max_workers`` at a time, and their
+        pages merged as they arrive; all requests share the client's rate limit. Takes
+        the keyword arguments of ``Account.iter_form_submissions``.
+
+        :start_date: First day of the form submissions, a date or ISO 8601 string.
+        :end_date: Last day of the form submissions, a date or ISO 8601 string.
+        :accounts: Accounts to list, all accounts of the API key by default.
+        :max_workers: Number of accounts paginated concurrently.
+        """
+        return self._fan_out(
+            lambda account: account.iter_form_submissions(start_date=start_date, end_date=end_date, **kwargs),
+            accounts,
+            max_workers
+        )
+
+    #########################
+    # Preloading
+    #########################
+
+    def preload(
+            self,
+            snapshot_path: typing.Optional[str] = None,
+            refresh_interval: typing.Optional[float] = None,
+            max_snapshot_age: float = 3600.0,
+            max_workers: int = 8
+    ) -> Preloader:
+        """
+        Load accounts, companies and tags of every account into the response cache.
+
+        A fresh enough snapshot is restored instead of going to the API, otherwise the
+        data is fetched concurrently across accounts and saved to the snapshot. A
+        response cache is enabled on the client if it has none.
+
+        :snapshot_path: JSON file the data is restored from and saved to.
+        :refresh_interval: Refresh in the background every this many seconds.
+        :max_snapshot_age: Seconds after which a snapshot is ignored.
+        :max_workers: Number of accounts loaded concurrently.
+        """
+        preloader: Preloader = Preloader(self, snapshot_path=snapshot_path, max_workers=max_workers)
+
+        restored: bool = preloader.restore(max_snapshot_age)
+        if not restored:
+            preloader.refresh()
+
+        if refresh_interval:
+            preloader.start(refresh_interval, immediately=restored)
+
+        return preloader
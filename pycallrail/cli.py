@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime as dt
+import gzip
+import io
+import json
+import os
+import sys
+import typing
+
+import pycallrail
+import pycallrail.bulk as bulk
+import pycallrail.mirror as mirror
+from pycallrail.callrail import CallRail
+from pycallrail.concurrency import DEFAULT_FAN_OUT_WORKERS, fan_out
+
+API_KEY_ENV: str = 'CALLRAIL_API_KEY'
+
+# command line name -> resource
+RESOURCE_NAMES: typing.Dict[str, str] = {
+    'calls': 'calls',
+    'forms': 'form_submissions',
+    'form_submissions': 'form_submissions',
+    'texts': 'text-messages',
+    'text-messages': 'text-messages',
+    'tags': 'tags',
+    'companies': 'companies',
+}
+
+# resources listed with start_date / end_date and the fields parameter
+DATED_RESOURCES: typing.Tuple[str, ...] = ('calls', 'form_submissions', 'text-messages')
+
+# yielded after the last page of a unit, which is then recorded as done
+_UNIT_DONE = None
+
+# key of the state record naming the output
+_OUTPUT_KEY: str = '#output'
+
+
+class _Unit(object):
+    """
+    One listing of the export: an account and a date window. Resumed units are skipped.
+    """
+
+    def __init__(self, account_id: str, start: typing.Optional[dt.date], end: typing.Optional[dt.date]) -> None:
+        self.account_id: str = account_id
+        self.start: typing.Optional[dt.date] = start
+        self.end: typing.Optional[dt.date] = end
+
+    @property
+    def key(self) -> str:
+        return f'{self.account_id}:{self.start or ""}:{self.end or ""}'
+
+
+def _windows(
+        start: typing.Optional[dt.date],
+        end: typing.Optional[dt.date],
+        days: typing.Optional[int]
+) -> typing.List[typing.Tuple[typing.Optional[dt.date], typing.Optional[dt.date]]]:
+    # splits [start, end] into windows of days, each ending the day before the next starts
+    if not days or start is None or end is None:
+        return [(start, end)]
+
+    windows: typing.List[typing.Tuple[typing.Optional[dt.date], typing.Optional[dt.date]]] = []
+    while start <= end:
+        window_end: dt.date = min(end, start + dt.timedelta(days=days - 1))
+        windows.append((start, window_end))
+        start = window_end + dt.timedelta(days=1)
+    return windows
+
+
+def _columns(resource: str, fields: typing.Optional[typing.List[str]]) -> typing.List[str]:
+    if fields:
+        return ['account_id'] + [field for field in fields if field != 'account_id']
+    return ['account_id'] + list(typing.get_type_hints(mirror.RESOURCES[resource].model))
+
+
+class _Writer(object):
+    """
+    Writes records as NDJSON or CSV and flushes after every page, so the output can be
+    piped into a loader while the export runs.
+    """
+
+    def __init__(
+            self,
+            stream: typing.IO[str],
+            output_format: str,
+            columns: typing.List[str],
+            header: bool,
+            selected: bool = False
+    ) -> None:
+        """
+        :param stream: The output.
+        :param output_format: ndjson or csv.
+        :param columns: Columns of the CSV output.
+        :param header: Write the CSV header.
+        :param selected: Only write the columns to NDJSON too, instead of whole records.
+        """
+        self.stream: typing.IO[str] = stream
+        self.output_format: str = output_format
+        self.columns: typing.List[str] = columns
+        self.selected: bool = selected
+        self.records: int = 0
+        self._csv: typing.Optional[typing.Any] = None
+
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=columns, extrasaction='ignore')
+            if header:
+                self._csv.writeheader()
+
+    def write(self, account_id: str, records: typing.Iterable[typing.Dict[str, typing.Any]]) -> None:
+        for record in records:
+            record = dict(record, account_id=account_id)
+            if self._csv is not None:
+                self._csv.writerow({
+                    name: json.dumps(value, separators=(',', ':')) if isinstance(value, (dict, list)) else value
+                    for name, value in record.items() if name in self.columns
+                })
+            else:
+                if self.selected:
+                    record = {name: record[name] for name in self.columns if name in record}
+                self.stream.write(json.dumps(record, separators=(',', ':')) + '\n')
+            self.records += 1
+        self.stream.flush()
+
+
+def _open_output(path: str, compress: bool) -> typing.Tuple[typing.IO[str], typing.Callable[[], None]]:
+    # text stream of the output and how to close it, '-' is stdout
+    if path == '-':
+        binary: typing.IO[bytes] = sys.stdout.buffer
+        if compress:
+            binary = gzip.GzipFile(fileobj=binary, mode='wb')
+        stream = io.TextIOWrapper(binary, encoding='utf-8', newline='', write_through=True)
+
+        def close() -> None:
+            stream.flush()
+            # leave stdout open, but finish the gzip stream
+            stream.detach()
+            if compress:
+                binary.close()
+
+        return stream, close
+
+    text: typing.IO[str] = gzip.open(path, 'wt', encoding='utf-8', newline='') if compress \
+        else open(path, 'w', encoding='utf-8', newline='')
+    return text, text.close
+
+
+def _output_name(path: str) -> str:
+    # how the state file names an output, '-' is stdout
+    return path if path == '-' else os.path.abspath(path)
+
+
+def _recorded_output(state_path: str) -> typing.Optional[str]:
+    # output named by the first record of a state file, if it exists
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path) as f:
+        try:
+            record: typing.Dict[str, typing.Any] = json.loads(f.readline())
+        except ValueError:
+            return None
+    return record.get('output') if record.get('key') == _OUTPUT_KEY else None
+
+
+class _ResumeState(bulk.RecordFile):
+    """
+    The units of a resumable export in a JSON lines file. Exporting to a file, each
+    unit records the size of the output when it started and once it finished. The
+    first record names the output the state belongs to.
+    """
+
+    def __init__(self, path: str, output: str) -> None:
+        """
+        :param path: JSON lines file. Created if missing.
+        :param output: The output, as named by ``_output_name``.
+        """
+        super().__init__(path)
+        self._done: typing.Set[str] = set()
+        if _OUTPUT_KEY not in self:
+            self._append({'key': _OUTPUT_KEY, 'output': output})
+
+    def resume(self) -> int:
+        """
+        Decide which units are done and return the size the output is truncated to.
+
+        Units interleave in the output, so it is cut at the start of the first
+        unfinished unit; finished units with pages beyond that are exported again.
+        """
+        units: typing.Dict[str, typing.Dict[str, typing.Any]] = {
+            key: record for key, record in self._records.items() if key != _OUTPUT_KEY
+        }
+        done: typing.Set[str] = {key for key, record in units.items() if record['done']}
+
+        while True:
+            starts: typing.List[int] = [
+                record['start'] for key, record in units.items() if key not in done and record.get('start') is not None
+            ]
+            offset: int = min(starts) if starts else max((units[key].get('end') or 0 for key in done), default=0)
+            cut: typing.Set[str] = {key for key in done if (units[key].get('end') or 0) > offset}
+            if not cut:
+                break
+            done -= cut
+
+        self._done = done
+        return offset
+
+    def is_done(self, key: str) -> bool:
+        return key in self._done
+
+    def start(self, key: str, offset: int) -> None:
+        """
+        Record that a unit started.
+
+        :param key: The unit key.
+        :param offset: Size of the output before the unit's first page.
+        """
+        self._append({'key': key, 'start': offset, 'done': False})
+
+    def finish(self, key: str, start: typing.Optional[int] = None, end: typing.Optional[int] = None) -> None:
+        """
+        Mark a unit as finished.
+
+        :param key: The unit key.
+        :param start: Size of the output before the unit's first page.
+        :param end: Size of the output after the unit's last page.
+        """
+        self._append({'key': key, 'start': start, 'end': end, 'done': True})
+
+
+class _ResumableOutput(object):
+    """
+    Output file of a resumable export. Pages are appended as they arrive, as a gzip
+    member of their own when compressed, so the file can be cut back to the start of
+    any page. It is truncated to the size the resume state keeps, which drops what an
+    interrupted run appended for unfinished units.
+    """
+
+    def __init__(self, path: str, compress: bool, offset: int) -> None:
+        """
+        :param path: The output file.
+        :param compress: Compress the appended pages with gzip.
+        :param offset: Size of the output with the finished units.
+        """
+        self.compress: bool = compress
+        exists: bool = os.path.exists(path)
+        self._file: typing.IO[bytes] = open(path, 'r+b' if exists else 'wb')
+        if exists:
+            self._file.truncate(offset)
+        self._file.seek(0, os.SEEK_END)
+
+    @property
+    def size(self) -> int:
+        return self._file.tell()
+
+    def append(self, text: str) -> None:
+        """
+        Append a page of text.
+
+        :param text: The page as written by ``_Writer``.
+        """
+        if not text:
+            return
+        data: bytes = text.encode('utf-8')
+        self._file.write(gzip.compress(data) if self.compress else data)
+        self._file.flush()
+
+    def sync(self) -> None:
+        """
+        Make what was appended durable, before the state records a unit as finished.
+        """
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _drain(buffer: io.StringIO) -> str:
+    # text written to the buffer since it was last drained
+    text: str = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='pycallrail', description='Command line tools for the CallRail API.')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {pycallrail.__version__}')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser(
+        'export',
+        help='Stream a resource of one or all accounts as NDJSON or CSV.',
+        description='Stream a resource of one or all accounts as NDJSON or CSV. Records are written as the '
+                    'pages arrive, each with its account_id.'
+    )
+    export.add_argument('resource', choices=sorted(RESOURCE_NAMES), help='Resource to export.')
+    export.add_argument('--api-key', default=os.environ.get(API_KEY_ENV), help=f'API key, defaults to ${API_KEY_ENV}.')
+    export.add_argument('--account', action='append', dest='accounts', metavar='ID',
+                        help='Account to export, repeatable. Defaults to all accounts of the API key.')
+    export.add_argument('--format', choices=('ndjson', 'csv'), default='ndjson', help='Output format.')
+    export.add_argument('-o', '--output', default='-', help='Output file, - for stdout.')
+    export.add_argument('--gzip', action='store_true', help='Compress the output with gzip.')
+    export.add_argument('--start-date', type=dt.date.fromisoformat, help='First day to export, YYYY-MM-DD.')
+    export.add_argument('--end-date', type=dt.date.fromisoformat, help='Last day to export, YYYY-MM-DD.')
+    export.add_argument('--window-days', type=int, help='Export the date range in windows of this many days.')
+    export.add_argument('--fields', type=lambda value: [field.strip() for field in value.split(',') if field.strip()],
+                        help='Comma separated fields to export.')
+    export.add_argument('--concurrency', type=int, default=DEFAULT_FAN_OUT_WORKERS,
+                        help='Accounts and windows listed concurrently.')
+    export.add_argument('--rate', type=float, help='Maximum requests per second.')
+    export.add_argument('--resume', metavar='STATE',
+                        help='File recording the finished accounts and windows. A rerun skips them and appends to the output, '
+                             'dropping what an interrupted run wrote to an output file for unfinished ones.')
+    return parser
+
+
+def export(args: argparse.Namespace) -> int:
+    """
+    Run ``pycallrail export``. Returns the number of records written.
+
+    :param args: The parsed command line.
+    """
+    resource: str = RESOURCE_NAMES[args.resource]
+    mirrored: mirror.MirroredResource = mirror.RESOURCES[resource]
+    api_client = CallRail(api_key=args.api_key, rate_limit=args.rate)
+
+    account_ids: typing.List[str] = args.accounts or [account.id for account in api_client.list_accounts()]
+    units: typing.List[_Unit] = [
+        _Unit(account_id, start, end)
+        for account_id in account_ids
+        for start, end in _windows(args.start_date, args.end_date, args.window_days)
+    ]
+
+    state: typing.Optional[_ResumeState] = None
+    offset: int = 0
+    if args.resume:
+        state = _ResumeState(args.resume, _output_name(args.output))
+        offset = state.resume()
+        units = [unit for unit in units if not state.is_done(unit.key)]
+
+    def pages(unit: _Unit) -> typing.Iterator[typing.Optional[typing.List[typing.Dict[str, typing.Any]]]]:
+        params: typing.Dict[str, typing.Any] = {}
+        if resource in DATED_RESOURCES:
+            if unit.start is not None:
+                params['start_date'] = unit.start.isoformat()
+            if unit.end is not None:
+                params['end_date'] = unit.end.isoformat()
+            if args.fields:
+                params['fields'] = ','.join(args.fields)
+        yield from api_client._iter_pages(
+            endpoint=f'a/{unit.account_id}',
+            response_data_key=mirrored.response_data_key,
+            path=mirrored.path,
+            params=params or None
+        )
+        yield _UNIT_DONE
+
+    columns: typing.List[str] = _columns(resource, args.fields)
+    by_key: typing.Dict[str, _Unit] = {unit.key: unit for unit in units}
+    sources = ((unit.key, lambda unit=unit: pages(unit)) for unit in units)
+
+    if state is None or args.output == '-':
+        # streamed page by page, a resumed export to stdout repeats an interrupted unit
+        stream, close = _open_output(args.output, args.gzip)
+        writer = _Writer(stream, args.format, columns, header=True, selected=bool(args.fields))
+        try:
+            for key, page in fan_out(sources, max_workers=args.concurrency):
+                if page is _UNIT_DONE:
+                    if state is not None:
+                        state.finish(typing.cast(str, key))
+                    continue
+                writer.write(by_key[typing.cast(str, key)].account_id, page)
+        finally:
+            close()
+            if state is not None:
+                state.close()
+        return writer.records
+
+    output = _ResumableOutput(args.output, args.gzip, offset)
+    buffer = io.StringIO()
+    writer = _Writer(buffer, args.format, columns, header=offset == 0, selected=bool(args.fields))
+    starts: typing.Dict[str, int] = {}
+
+    try:
+        if buffer.tell():
+            output.append(_drain(buffer))
+            output.sync()
+
+        for key, page in fan_out(sources, max_workers=args.concurrency):
+            unit_key: str = typing.cast(str, key)
+            if unit_key not in starts:
+                starts[unit_key] = output.size
+                state.start(unit_key, output.size)
+
+            if page is _UNIT_DONE:
+                output.sync()
+                state.finish(unit_key, starts.pop(unit_key), output.size)
+                continue
+            writer.write(by_key[unit_key].account_id, page)
+            output.append(_drain(buffer))
+    finally:
+        output.close()
+        state.close()
+
+    return writer.records
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    """
+    Entry point of the ``pycallrail`` command.
+
+    :param argv: Command line arguments, defaults to ``sys.argv``.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        if not args.api_key:
+            parser.error(f'an API key is required, pass --api-key or set ${API_KEY_ENV}')
+        if RESOURCE_NAMES[args.resource] not in DATED_RESOURCES and (args.start_date or args.end_date):
+            parser.error(f'{args.resource} cannot be exported by date')
+        if args.window_days is not None and not (args.start_date and args.end_date):
+            parser.error('--window-days needs --start-date and --end-date')
+        if args.resume:
+            recorded: typing.Optional[str] = _recorded_output(args.resume)
+            if recorded is not None and recorded != _output_name(args.output):
+                parser.error(f'{args.resume} resumes the export to {recorded}, not to {args.output}')
+        export(args)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import concurrent.futures
+import queue
+import threading
+import time
+import typing
+
+T = typing.TypeVar('T')
+
+DEFAULT_FAN_OUT_WORKERS: int = 8
+
+
+class _Flight(object):
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.waiters: int = 0
+        self.result: typing.Any = None
+        self.error: typing.Optional[BaseException] = None
+
+
+class SingleFlight(object):
+    """
+    Coalesces concurrent calls with the same key into one.
+
+    The first caller of a key runs the function; callers arriving while it runs wait
+    for it and share its result, or its exception. Nothing is kept once the call
+    finished, so a later call runs the function again.
+    """
+
+    def __init__(self) -> None:
+        self._flights: typing.Dict[typing.Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(
+            self,
+            key: typing.Hashable,
+            fn: typing.Callable[[], T],
+            copy: typing.Optional[typing.Callable[[T], T]] = None
+    ) -> T:
+        """
+        Run ``fn`` unless a call with the same key is in flight, then wait for that one.
+
+        :param key: Identifies identical calls.
+        :param fn: The function to run.
+        :param copy: Applied to the result handed to waiters, so they don't share
+            mutable results with the first caller or each other.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader: bool = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy(flight.result) if copy is not None else flight.result
+
+        result: typing.Any = None
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                waiters: int = flight.waiters
+            try:
+                if waiters and flight.error is None:
+                    # waiters copy from a snapshot taken before the first caller gets to mutate the result
+                    flight.result = copy(result) if copy is not None else result
+            except BaseException as e:
+                flight.error = e
+            flight.done.set()
+
+        return result
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+
+class RateLimiter(object):
+    """
+    Token bucket limiting how many requests are started per second.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``; every request
+    takes one and waits when the bucket is empty. Thread-safe.
+    """
+
+    def __init__(
+            self,
+            rate: float,
+            burst: typing.Optional[int] = None,
+            clock: typing.Callable[[], float] = time.monotonic,
+            sleep: typing.Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        :param rate: Requests per second.
+        :param burst: Requests that may start at once after being idle. Defaults to one second's worth.
+        :param clock: Monotonic time source, in seconds.
+        :param sleep: Called to wait for a token.
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+
+        self.rate: float = rate
+        self.burst: int = burst if burst is not None else max(1, int(rate))
+        self.clock: typing.Callable[[], float] = clock
+        self.sleep: typing.Callable[[float], None] = sleep
+
+        self._tokens: float = float(self.burst)
+        self._updated_at: float = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # take a token, returns the seconds to wait until it is available
+        with self._lock:
+            now: float = self.clock()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        """
+        Wait until a request may start.
+        """
+        wait: float = self._reserve()
+        if wait > 0:
+            self.sleep(wait)
+
+
+class _Failed(object):
+
+    def __init__(self, error: BaseException) -> None:
+        self.error: BaseException = error
+
+
+def fan_out(
+        sources: typing.Iterable[typing.Tuple[typing.Hashable, typing.Callable[[], typing.Iterable[T]]]],
+        max_workers: int = DEFAULT_FAN_OUT_WORKERS,
+        buffer: typing.Optional[int] = None
+) -> typing.Iterator[typing.Tuple[typing.Hashable, T]]:
+    """
+    Run several producers concurrently and merge what they yield into one stream.
+
+    Every item is yielded together with the key of its producer, items of one
+    producer in their order. Producers wait while ``buffer`` items are queued, so
+    memory stays bounded when the consumer is slower. The first exception of a
+    producer is raised to the consumer; it and closing the stream early stop the
+    other producers at their next item.
+
+    :param sources: Pairs of a key and a function returning the producer's items.
+    :param max_workers: Number of producers run at once.
+    :param buffer: Items queued between the producers and the consumer. Defaults to 64 per worker.
+    """
+    sources = list(sources)
+    entries: queue.Queue = queue.Queue(maxsize=buffer or max(1, max_workers) * 64)
+    stop = threading.Event()
+    finished = object()
+
+    def put(entry: typing.Any) -> bool:
+        while not stop.is_set():
+            try:
+                entries.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(key: typing.Hashable, fn: typing.Callable[[], typing.Iterable[T]]) -> None:
+        try:
+            for item in fn():
+                if not put((key, item)):
+                    return
+        except BaseException as e:
+            put(_Failed(e))
+        finally:
+            put(finished)
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = [executor.submit(produce, key, fn) for key, fn in sources]
+    try:
+        remaining: int = len(futures)
+        while remaining:
+            entry = entries.get()
+            if entry is finished:
+                remaining -= 1
+            elif isinstance(entry, _Failed):
+                raise entry.error
+            else:
+                yield entry
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import typing
+
+from pycallrail.helpers import parse_datetime
+
+Decoder = typing.Callable[..., None]
+
+_DECODERS: typing.Dict[type, Decoder] = {}
+_LOCK = threading.Lock()
+
+
+def _is_datetime(hint: typing.Any) -> bool:
+    if isinstance(hint, str):
+        # unresolvable forward reference, fall back to the annotation text
+        return 'datetime' in hint
+    if hint is dt.datetime:
+        return True
+    return typing.get_origin(hint) is typing.Union and dt.datetime in typing.get_args(hint)
+
+
+def datetime_fields(cls: type) -> typing.Tuple[str, ...]:
+    """
+    Names of the fields of a model class that are annotated as datetimes.
+
+    :param cls: The model class.
+    """
+    annotations: typing.Dict[str, typing.Any] = cls.__annotations__
+
+    try:
+        hints = typing.get_type_hints(cls)
+    except Exception:
+        hints = {}
+
+    return tuple(
+        name for name, annotation in annotations.items()
+        if _is_datetime(hints.get(name, annotation))
+    )
+
+
+def compile_decoder(cls: type) -> Decoder:
+    """
+    Generate a decoder specialised for a model class from its annotations.
+
+    The generated function has the signature ``decode(obj, json_data, partial=False, intern=None)``
+    and populates ``obj`` with ``json_data``. Unknown keys raise an AttributeError,
+    the class' ``REQUIRED_FIELDS`` raise a KeyError when missing (unless ``partial``
+    is set), datetime fields are parsed inline and string values of the class'
+    ``INTERNED_FIELDS`` are passed through ``intern`` when given.
+
+    :param cls: The model class.
+    """
+    name: str = cls.__name__
+    required: typing.Tuple[str, ...] = tuple(getattr(cls, 'REQUIRED_FIELDS', ()))
+    interned: typing.Tuple[str, ...] = tuple(getattr(cls, 'INTERNED_FIELDS', ()))
+
+    lines: typing.List[str] = [
+        'def decode(obj, json_data, partial=False, intern=None):',
+        '    if not json_data.keys() <= _fields:',
+        '        for key in json_data:',
+        '            if key not in _fields:',
+        f'                raise AttributeError(f"{{key}} is not a valid attribute for {name}")',
+    ]
+
+    if required:
+        lines.append('    if not partial:')
+    for field in required:
+        lines += [
+            f'        if {field!r} not in json_data:',
+            f'            raise KeyError({field!r})',
+        ]
+
+    lines += [
+        '    state = obj.__dict__',
+        '    state.update(json_data)',
+    ]
+
+    for field in datetime_fields(cls):
+        lines += [
+            f'    value = state.get({field!r})',
+            '    if value.__class__ is str:',
+            f'        state[{field!r}] = _parse_datetime(value) if value else None',
+        ]
+
+    if interned:
+        lines.append('    if intern is not None:')
+    for field in interned:
+        lines += [
+            f'        value = state.get({field!r})',
+            '        if value.__class__ is str:',
+            f'            state[{field!r}] = intern(value)',
+        ]
+
+    namespace: typing.Dict[str, typing.Any] = {
+        '_fields': frozenset(cls.__annotations__),
+        '_parse_datetime': parse_datetime,
+    }
+
+    source: str = '\n'.join(lines) + '\n'
+    exec(compile(source, f'<decoder {cls.__module__}.{cls.__qualname__}>', 'exec'), namespace)
+
+    decoder: Decoder = namespace['decode']
+    decoder.__source__ = source # type: ignore
+    return decoder
+
+
+def get_decoder(cls: type) -> Decoder:
+    """
+    Return the cached decoder for a model class, compiling it on first use.
+
+    The decoder is kept until ``invalidate_decoder`` is called, e.g. after changing
+    the annotations of the class.
+
+    :param cls: The model class.
+    """
+    decoder: typing.Optional[Decoder] = _DECODERS.get(cls)
+    if decoder is not None:
+        return decoder
+
+    with _LOCK:
+        decoder = _DECODERS.get(cls)
+        if decoder is None:
+            decoder = _DECODERS[cls] = compile_decoder(cls)
+
+    return decoder
+
+
+def invalidate_decoder(cls: type) -> None:
+    """
+    Drop the cached decoder of a model class, so the next use compiles it from the
+    current annotations.
+
+    :param cls: The model class.
+    """
+    with _LOCK:
+        _DECODERS.pop(cls, None)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import typing
+import zlib
+
+from pycallrail.cache import resource_of
+from pycallrail.helpers import normalize_url
+
+DEFAULT_MAX_BYTES: int = 512 * 1024 * 1024
+DEFAULT_MAX_AGE: float = 7 * 24 * 3600.0
+
+_SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    account_id TEXT,
+    resource TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_resource ON responses (account_id, resource);
+'''
+
+
+class DiskCache(object):
+    """
+    Persistent cache of decoded GET pages in a SQLite file, compressed with zlib.
+
+    Pass an instance to ``CallRail(disk_cache=...)``. Every page requested through
+    the client, of either paginator, is looked up by its normalized url before going
+    to the API, so a rerun of a failed backfill reads the pages it already fetched
+    from disk. Pages expire after ``max_age`` seconds and the least recently used
+    pages are evicted once the compressed pages exceed ``max_bytes``.
+
+    Writes through the client drop the cached pages of the resource they touch.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            max_age: float = DEFAULT_MAX_AGE,
+            clock: typing.Callable[[], float] = time.time
+    ) -> None:
+        """
+        :param path: SQLite database file. Created if missing.
+        :param max_bytes: Maximum total size of the compressed pages.
+        :param max_age: Seconds a page stays valid.
+        :param clock: Wall clock time source, in seconds.
+        """
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.max_age: float = max_age
+        self.clock: typing.Callable[[], float] = clock
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        # running total of the compressed page sizes, so sets don't sum the table
+        self._bytes: int = self._total()
+
+    def _total(self) -> int:
+        return self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def key_for(url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> str:
+        """
+        Cache key of a request.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        """
+        return normalize_url(url, params)
+
+    def get(self, url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> typing.Any:
+        """
+        Return the cached page, or None.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        """
+        key: str = self.key_for(url, params)
+        now: float = self.clock()
+
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                'SELECT body, created_at, size FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None or row[1] + self.max_age <= now:
+                if row is not None:
+                    self._connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._bytes -= row[2]
+                self.misses += 1
+                return None
+
+            self._connection.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, url: str, params: typing.Optional[typing.Mapping[str, typing.Any]], body: typing.Any) -> None:
+        """
+        Cache a page, evicting the least recently used pages beyond ``max_bytes``.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        :param body: The decoded page.
+        """
+        key: str = self.key_for(url, params)
+        account_id, resource = resource_of(url)
+        blob: bytes = zlib.compress(json.dumps(body, separators=(',', ':')).encode('utf-8'))
+        now: float = self.clock()
+
+        if len(blob) > self.max_bytes:
+            return
+
+        with self._lock, self._connection:
+            replaced = self._connection.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, account_id, resource, blob, len(blob), now, now)
+            )
+            self._bytes += len(blob) - (replaced[0] if replaced is not None else 0)
+            self._evict()
+
+    def _evict(self) -> None:
+        total: int = self._bytes
+        if total <= self.max_bytes:
+            return
+
+        stale: typing.List[typing.Tuple[str]] = []
+        for key, size in self._connection.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+
+        self._connection.executemany('DELETE FROM responses WHERE key = ?', stale)
+        self._bytes = total
+
+    def purge(self) -> int:
+        """
+        Delete expired pages. Returns the number deleted.
+        """
+        with self._lock, self._connection:
+            deleted: int = self._connection.execute(
+                'DELETE FROM responses WHERE created_at <= ?', (self.clock() - self.max_age,)
+            ).rowcount
+            self._bytes = self._total()
+            return deleted
+
+    def invalidate(self, account_id: typing.Optional[str] = None, resource: typing.Optional[str] = None) -> int:
+        """
+        Delete the cached pages of an account and/or resource. Returns the number deleted.
+
+        :param account_id: Only delete pages of this account.
+        :param resource: Only delete pages of this resource, e.g. ``calls``.
+        """
+        query: str = 'DELETE FROM responses WHERE 1 = 1'
+        args: typing.List[str] = []
+        if account_id is not None:
+            query += ' AND account_id = ?'
+            args.append(account_id)
+        if resource is not None:
+            query += ' AND resource = ?'
+            args.append(resource)
+
+        with self._lock, self._connection:
+            deleted: int = self._connection.execute(query, args).rowcount
+            self._bytes = self._total()
+            return deleted
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses')
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        self._connection.close()
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Hit and miss counters, the number of cached pages and their compressed size.
+        """
+        with self._lock:
+            count: int = self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'size': count, 'bytes': self._bytes}
+
+    def __len__(self) -> int:
+        return self.stats['size']
@@ -1,3 +1,32 @@
+import requests
+
+__all__ = ['LightValidationError', 'CachedNotFoundError', 'IncompleteDownloadError']
+
 class LightValidationError(Exception):
     def __init__(self, message: str) -> None:
         super(LightValidationError, self).__init__(message)
+
+class CachedNotFoundError(requests.HTTPError):
+    """
+    Raised instead of requesting an object the API recently answered with a 404.
+
+    Like the original error it carries a response with the 404 status code and the url,
+    so handlers of ``requests.HTTPError`` treat both alike.
+    """
+    def __init__(self, url: str) -> None:
+        response = requests.Response()
+        response.status_code = 404
+        response.reason = 'Not Found'
+        response.url = url
+        super(CachedNotFoundError, self).__init__(f'404 Client Error: Not Found for url: {url} (cached)', response=response)
+
+class IncompleteDownloadError(IOError):
+    """
+    Raised when a download ended with fewer or more bytes than the server announced,
+    after the retries to resume it were used up.
+    """
+    def __init__(self, url: str, expected: int, received: int) -> None:
+        self.url: str = url
+        self.expected: int = expected
+        self.received: int = received
+        super(IncompleteDownloadError, self).__init__(f'Received {received} of {expected} bytes from {url}')
@@ -1,5 +1,8 @@
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+import datetime as dt
 import typing
+from dateutil import parser as dateparser
+
 def build_url(base_url: str, endpoint: str, path: typing.Optional[str] = None ) -> str:
     
     url_result: str = urljoin(base_url, endpoint)
@@ -15,4 +18,46 @@ def build_url(base_url: str, endpoint: str, path: typing.Optional[str] = None )
 
         url_result: str = urljoin(url_result, path) # type: ignore
 
-    return url_result
\ No newline at end of file
+    return url_result
+
+def parse_datetime(value: str) -> dt.datetime:
+    """
+    Parse a timestamp returned by the CallRail API.
+
+    The API returns ISO 8601 timestamps, which the standard library parses an order of
+    magnitude faster than dateutil. dateutil is kept as a fallback for older Pythons
+    and anything fromisoformat rejects.
+    """
+    try:
+        return dt.datetime.fromisoformat(value)
+    except ValueError:
+        return dateparser.parse(value)
+
+def normalize_url(url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> str:
+    """
+    Canonical form of a request url and its query string parameters.
+
+    Parameters given separately and parameters already in the url are merged and
+    sorted, so ``a.json?page=2`` with ``{'per_page': 10}`` and ``a.json?per_page=10&page=2``
+    normalize to the same url.
+    """
+    parts = urlsplit(url)
+    query: typing.List[typing.Tuple[str, str]] = parse_qsl(parts.query, keep_blank_values=True)
+
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            query.extend((key, str(item)) for item in value)
+        else:
+            query.append((key, str(value)))
+
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(sorted(query)), ''))
+
+def format_date(value: typing.Union[str, dt.date]) -> str:
+    """
+    Query string form of a date or timestamp filter, e.g. ``start_date``.
+
+    Dates and datetimes are sent in ISO 8601, strings as they are.
+    """
+    return value.isoformat() if isinstance(value, dt.date) else value
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+import os
+import threading
+import typing
+
+from pycallrail.cache import copy_response
+from pycallrail.helpers import normalize_url
+
+Entry = typing.Dict[str, typing.Any]
+
+
+class Storage(object):
+    """
+    Where a ``ConditionalCache`` keeps its entries.
+
+    An entry is a JSON-serializable dict with the ``etag``, ``last_modified`` and
+    decoded ``body`` of a response.
+    """
+
+    def get(self, key: str) -> typing.Optional[Entry]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: Entry) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryStorage(Storage):
+    """
+    Keeps entries in memory, evicting the least recently used beyond ``max_entries``.
+
+    Bodies are copied in and out so callers can't mutate the stored ones.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        """
+        :param max_entries: Maximum number of entries kept.
+        """
+        self.max_entries: int = max_entries
+        self._entries: collections.OrderedDict[str, Entry] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> typing.Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy_response(entry)
+
+    def set(self, key: str, entry: Entry) -> None:
+        entry = copy_response(entry)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskStorage(Storage):
+    """
+    Keeps one JSON file per entry in a directory, so validators survive restarts.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: Directory the entries are written to. Created if missing.
+        """
+        self.directory: str = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key: str) -> typing.Optional[Entry]:
+        try:
+            with open(self._path(key)) as f:
+                entry: Entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # guard against hash collisions
+        return entry if entry.get('key') == key else None
+
+    def set(self, key: str, entry: Entry) -> None:
+        path: str = self._path(key)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({**entry, 'key': key}, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
+
+
+class ConditionalCache(object):
+    """
+    Stores the validators (ETag, Last-Modified) of GET responses together with their
+    decoded body.
+
+    Pass an instance to ``CallRail(http_cache=...)``. Repeated requests for a url
+    send ``If-None-Match`` / ``If-Modified-Since``, and a ``304 Not Modified`` is
+    answered from the stored body without downloading or decoding the page again.
+    Responses without validators are not stored.
+    """
+
+    def __init__(self, storage: typing.Optional[Storage] = None) -> None:
+        """
+        :param storage: Where entries are kept. Defaults to a ``MemoryStorage``.
+        """
+        self.storage: Storage = storage if storage is not None else MemoryStorage()
+        self.revalidated: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> str:
+        """
+        Cache key of a request.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        """
+        return normalize_url(url, params)
+
+    def request_headers(self, url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> typing.Dict[str, str]:
+        """
+        Conditional headers to send for a request.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        """
+        entry = self.storage.get(self.key_for(url, params))
+        headers: typing.Dict[str, str] = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def not_modified(self, url: str, params: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> typing.Any:
+        """
+        Return the stored body after a 304 response. Raises a KeyError if the entry is gone.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        """
+        entry = self.storage.get(self.key_for(url, params))
+        if entry is None:
+            raise KeyError(self.key_for(url, params))
+
+        with self._lock:
+            self.revalidated += 1
+        return entry['body']
+
+    def store(
+            self,
+            url: str,
+            params: typing.Optional[typing.Mapping[str, typing.Any]],
+            headers: typing.Mapping[str, str],
+            body: typing.Any
+    ) -> None:
+        """
+        Store the validators and body of a 200 response.
+
+        :param url: The request url.
+        :param params: Query string parameters.
+        :param headers: Response headers.
+        :param body: The decoded response body.
+        """
+        with self._lock:
+            self.misses += 1
+
+        etag: typing.Optional[str] = headers.get('ETag')
+        last_modified: typing.Optional[str] = headers.get('Last-Modified')
+        key: str = self.key_for(url, params)
+
+        if etag or last_modified:
+            self.storage.set(key, {'etag': etag, 'last_modified': last_modified, 'body': body})
+        else:
+            self.storage.delete(key)
+
+    def clear(self) -> None:
+        self.storage.clear()
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Number of responses served from the cache after a 304, and of full downloads.
+        """
+        return {'revalidated': self.revalidated, 'misses': self.misses}
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+import typing
+import weakref
+
+IdentityKey = typing.Tuple[str, typing.Optional[str], typing.Union[str, int, None]]
+
+
+def merge_state(existing: typing.Any, obj: typing.Any) -> None:
+    """
+    Refresh an instance with the data of a freshly built one.
+
+    Fields of the existing instance with unsaved changes keep their value; its
+    loaded state is rebased onto the fresh data, so they stay dirty against the
+    new server values.
+
+    :param existing: The instance to refresh.
+    :param obj: The freshly built instance of the same model.
+    """
+    state: typing.Dict[str, typing.Any] = obj.__getstate__()
+    changed_fields = getattr(existing, 'changed_fields', None)
+    if changed_fields is not None:
+        for field in changed_fields():
+            state.pop(field, None)
+        state['_loaded'] = obj.__dict__['_loaded']
+    existing.__dict__.update(state)
+
+
+class IdentityMap(object):
+    """
+    Weak-valued map of model instances keyed by class name, account and id.
+
+    The key extends the identity used by ``CallRailBase.__hash__`` with the account,
+    so every object fetched through a client resolves to a single live instance.
+    Instances are dropped as soon as nothing else references them.
+    """
+
+    def __init__(self) -> None:
+        self._instances: weakref.WeakValueDictionary[IdentityKey, typing.Any] = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(obj: typing.Any) -> IdentityKey:
+        """
+        Identity key of a model instance.
+
+        :param obj: The model instance.
+        """
+        return (type(obj).__name__, getattr(obj, 'account_id', None), obj.id)
+
+    def get(
+        self,
+        cls: type,
+        account_id: typing.Optional[str],
+        id: typing.Union[str, int, None]
+    ) -> typing.Any:
+        """
+        Return the live instance for a class, account and id, if any.
+        """
+        return self._instances.get((cls.__name__, account_id, id))
+
+    def merge(self, obj: typing.Any) -> typing.Any:
+        """
+        Register a freshly built instance, or refresh the existing one with its data.
+
+        Fields of the existing instance with unsaved changes keep their value; its
+        loaded state is rebased onto the fresh data, so they stay dirty against the
+        new server values.
+
+        :param obj: The freshly built model instance.
+        :return: The instance to hand out.
+        """
+        if obj.id is None:
+            return obj
+
+        key: IdentityKey = self.key_for(obj)
+
+        with self._lock:
+            existing = self._instances.get(key)
+            if existing is None:
+                self._instances[key] = obj
+                return obj
+
+            if existing is not obj:
+                merge_state(existing, obj)
+
+        return existing
+
+    def discard(self, obj: typing.Any) -> None:
+        """
+        Remove an instance from the map, e.g. after it was deleted.
+
+        :param obj: The model instance.
+        """
+        with self._lock:
+            key: IdentityKey = self.key_for(obj)
+            if self._instances.get(key) is obj:
+                del self._instances[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instances.clear()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, obj: typing.Any) -> bool:
+        return self._instances.get(self.key_for(obj)) is obj
+
+
+def identity_map_for(api_client: typing.Any) -> typing.Optional[IdentityMap]:
+    """
+    Return the identity map of a client, if it has one enabled.
+
+    :param api_client: The CallRail API client.
+    """
+    identity_map = getattr(api_client, 'identity_map', None)
+    return identity_map if isinstance(identity_map, IdentityMap) else None
+
+
+def merge(api_client: typing.Any, obj: typing.Any) -> typing.Any:
+    """
+    Resolve a freshly built instance through the identity map of its client.
+
+    Returns ``obj`` unchanged when the client has no identity map.
+
+    :param api_client: The CallRail API client.
+    :param obj: The freshly built model instance.
+    """
+    identity_map = identity_map_for(api_client)
+    return identity_map.merge(obj) if identity_map is not None else obj
+
+
+def discard(api_client: typing.Any, obj: typing.Any) -> None:
+    """
+    Drop an instance from the identity map of its client, if it has one enabled.
+
+    :param api_client: The CallRail API client.
+    :param obj: The model instance.
+    """
+    identity_map = identity_map_for(api_client)
+    if identity_map is not None:
+        identity_map.discard(obj)
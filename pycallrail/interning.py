@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import typing
+
+DEFAULT_MAX_SIZE: int = 100000
+
+
+class InternTable(object):
+    """
+    Bounded table of shared strings for low-cardinality field values.
+
+    Models list such fields in ``INTERNED_FIELDS``; when the client has an intern
+    table, every decoded value of those fields is replaced by the shared copy so a
+    million calls of a few hundred companies hold a few hundred strings. Once the
+    table is full new values are passed through unchanged.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        :param max_size: Maximum number of distinct strings kept.
+        """
+        self.max_size: int = max_size
+        self._strings: typing.Dict[str, str] = {}
+
+    def intern(self, value: str) -> str:
+        """
+        Return the shared copy of a string.
+
+        :param value: The string.
+        """
+        try:
+            return self._strings[value]
+        except KeyError:
+            if len(self._strings) >= self.max_size:
+                return value
+            return self._strings.setdefault(value, value)
+
+    def clear(self) -> None:
+        self._strings.clear()
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._strings
+
+
+def intern_for(api_client: typing.Any) -> typing.Optional[typing.Callable[[str], str]]:
+    """
+    Return the intern function of a client, if it has string interning enabled.
+
+    :param api_client: The CallRail API client.
+    """
+    intern_table = getattr(api_client, 'intern_table', None)
+    return intern_table.intern if isinstance(intern_table, InternTable) else None
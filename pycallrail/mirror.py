@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import sqlite3
+import threading
+import typing
+
+import pycallrail.base as base
+import pycallrail.helpers as helpers
+import pycallrail.objects.calls as calls
+import pycallrail.objects.companies as companies
+import pycallrail.objects.form_submissions as forms
+import pycallrail.objects.tags as tags
+import pycallrail.objects.textmessages as messages
+
+
+class MirroredResource(object):
+    """
+    How a resource is listed and which of its fields are indexed.
+    """
+
+    def __init__(
+            self,
+            model: typing.Any,
+            path: str,
+            response_data_key: str,
+            timestamp_field: str,
+            company_field: str = 'company_id'
+    ) -> None:
+        """
+        :param model: Class the records are decoded to.
+        :param path: Path of the listing below the account.
+        :param response_data_key: Key of the records in a page.
+        :param timestamp_field: Field indexed as the record's time.
+        :param company_field: Field indexed as the record's company.
+        """
+        self.model: typing.Any = model
+        self.path: str = path
+        self.response_data_key: str = response_data_key
+        self.timestamp_field: str = timestamp_field
+        self.company_field: str = company_field
+
+
+RESOURCES: typing.Dict[str, MirroredResource] = {
+    'calls': MirroredResource(calls.Call, 'calls.json', 'calls', 'start_time'),
+    'form_submissions': MirroredResource(forms.FormSubmission, 'form_submissions.json', 'form_submissions', 'submitted_at'),
+    'text-messages': MirroredResource(messages.TextMessageConversation, 'text-messages.json', 'conversations', 'last_message_at'),
+    'tags': MirroredResource(tags.Tag, 'tags.json', 'tags', 'created_at'),
+    'companies': MirroredResource(companies.Company, 'companies.json', 'companies', 'created_at', company_field='id'),
+}
+
+_SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS records (
+    resource TEXT NOT NULL,
+    id TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    company_id TEXT,
+    timestamp REAL,
+    phone_number TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (resource, id)
+);
+CREATE INDEX IF NOT EXISTS records_account ON records (resource, account_id, timestamp);
+CREATE INDEX IF NOT EXISTS records_company ON records (resource, company_id, timestamp);
+CREATE INDEX IF NOT EXISTS records_phone_number ON records (resource, phone_number);
+CREATE TABLE IF NOT EXISTS text_messages (
+    conversation_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    direction TEXT NOT NULL,
+    content TEXT,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (conversation_id, position)
+);
+CREATE INDEX IF NOT EXISTS text_messages_created_at ON text_messages (created_at);
+'''
+
+TimeBound = typing.Union[str, dt.date]
+
+
+def _epoch(value: typing.Any) -> typing.Optional[float]:
+    # seconds since the epoch of an API timestamp or a query bound, naive times and dates are UTC
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = helpers.parse_datetime(value)
+    if not isinstance(value, dt.datetime):
+        value = dt.datetime.combine(value, dt.time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt.timezone.utc)
+    return value.timestamp()
+
+
+class Mirror(object):
+    """
+    Local copy of calls, form submissions, text message conversations, tags and
+    companies in a SQLite file, queried without going to the API.
+
+    Records are upserted by ID, either fetched with ``mirror`` (one transaction per
+    page) or passed as model objects to ``upsert``. They are indexed by account,
+    company, time (``start_time``, ``submitted_at``, ``last_message_at`` or
+    ``created_at``) and customer phone number, and ``query`` returns them as the same
+    model objects the API methods return, attached to the mirror's client.
+    """
+
+    def __init__(self, api_client: typing.Any, path: str) -> None:
+        """
+        :param api_client: The CallRail API client.
+        :param path: SQLite database file. Created if missing.
+        """
+        self.api_client: typing.Any = api_client
+        self.path: str = path
+
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def resource_of(model: base.CallRailBase) -> str:
+        """
+        Name of the mirrored resource of a model object.
+
+        :param model: The model object.
+        """
+        for name, resource in RESOURCES.items():
+            if isinstance(model, resource.model):
+                return name
+        raise TypeError(f'{type(model).__name__} objects are not mirrored')
+
+    def _write(self, resource: str, account_id: str, records: typing.Iterable[typing.Dict[str, typing.Any]]) -> int:
+        mirrored: MirroredResource = RESOURCES[resource]
+        rows: typing.List[typing.Tuple[typing.Any, ...]] = []
+        text_messages: typing.List[typing.Tuple[typing.Any, ...]] = []
+
+        for record in records:
+            record_id: str = str(record['id'])
+            company_id: typing.Any = record.get(mirrored.company_field)
+            rows.append((
+                resource,
+                record_id,
+                account_id,
+                str(company_id) if company_id is not None else None,
+                _epoch(record.get(mirrored.timestamp_field)),
+                record.get('customer_phone_number'),
+                json.dumps(record, separators=(',', ':'))
+            ))
+            if resource == 'text-messages':
+                text_messages.extend(
+                    (record_id, position, message['direction'], message.get('content'), _epoch(message['created_at']))
+                    for position, message in enumerate(record.get('recent_messages') or [])
+                )
+
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            if resource == 'text-messages':
+                self._connection.executemany(
+                    'DELETE FROM text_messages WHERE conversation_id = ?', [(row[1],) for row in rows]
+                )
+                self._connection.executemany('INSERT INTO text_messages VALUES (?, ?, ?, ?, ?)', text_messages)
+
+        return len(rows)
+
+    def upsert(self, models: typing.Iterable[base.CallRailBase]) -> int:
+        """
+        Insert or replace model objects, all in one transaction per resource. Returns
+        the number of objects written.
+
+        :param models: Calls, form submissions, text message conversations, tags or companies.
+        """
+        batches: typing.Dict[typing.Tuple[str, str], typing.List[typing.Dict[str, typing.Any]]] = {}
+        for model in models:
+            batches.setdefault((self.resource_of(model), model.account_id), []).append(model.to_json()) # type: ignore
+        return sum(self._write(resource, account_id, records) for (resource, account_id), records in batches.items())
+
+    def mirror(self, account: typing.Any, resource: str, **kwargs: typing.Any) -> int:
+        """
+        Fetch a resource of an account and upsert it, one transaction per page. Returns
+        the number of records written.
+
+        :param account: The Account.
+        :param resource: calls, form_submissions, text-messages, tags or companies.
+        :param kwargs: Query string parameters, e.g. ``start_date``.
+        """
+        mirrored: MirroredResource = RESOURCES[resource]
+        written: int = 0
+        for page in self.api_client._iter_pages(
+            endpoint=f'a/{account.id}',
+            response_data_key=mirrored.response_data_key,
+            path=mirrored.path,
+            params=kwargs or None
+        ):
+            written += self._write(resource, account.id, page)
+        return written
+
+    def _model(self, resource: str, account_id: str, body: str) -> typing.Any:
+        return RESOURCES[resource].model.from_json(self.api_client, account_id, json.loads(body))
+
+    def get(self, resource: str, id: typing.Union[str, int]) -> typing.Any:
+        """
+        Return a mirrored object by ID, or None.
+
+        :param resource: calls, form_submissions, text-messages, tags or companies.
+        :param id: The object ID.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT account_id, body FROM records WHERE resource = ? AND id = ?', (resource, str(id))
+            ).fetchone()
+        return self._model(resource, *row) if row is not None else None
+
+    def query(
+            self,
+            resource: str,
+            account_id: typing.Optional[str] = None,
+            company_id: typing.Optional[str] = None,
+            start: typing.Optional[TimeBound] = None,
+            end: typing.Optional[TimeBound] = None,
+            phone_number: typing.Optional[str] = None,
+            limit: typing.Optional[int] = None,
+            newest_first: bool = False
+    ) -> typing.List[typing.Any]:
+        """
+        Return the mirrored objects matching all given filters, ordered by time.
+
+        :param resource: calls, form_submissions, text-messages, tags or companies.
+        :param account_id: Only objects of this account.
+        :param company_id: Only objects of this company.
+        :param start: Only objects at or after this time, a datetime, date or ISO 8601 string.
+        :param end: Only objects before this time, a datetime, date or ISO 8601 string.
+        :param phone_number: Only objects of this customer phone number.
+        :param limit: Maximum number of objects returned.
+        :param newest_first: Order from the newest object on.
+        """
+        query: str = 'SELECT account_id, body FROM records WHERE resource = ?'
+        args: typing.List[typing.Any] = [resource]
+
+        if account_id is not None:
+            query += ' AND account_id = ?'
+            args.append(account_id)
+        if company_id is not None:
+            query += ' AND company_id = ?'
+            args.append(company_id)
+        if start is not None:
+            query += ' AND timestamp >= ?'
+            args.append(_epoch(start))
+        if end is not None:
+            query += ' AND timestamp < ?'
+            args.append(_epoch(end))
+        if phone_number is not None:
+            query += ' AND phone_number = ?'
+            args.append(phone_number)
+
+        query += ' ORDER BY timestamp DESC' if newest_first else ' ORDER BY timestamp'
+        if limit is not None:
+            query += ' LIMIT ?'
+            args.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(query, args).fetchall()
+        return [self._model(resource, account_id, body) for account_id, body in rows]
+
+    def text_messages(self, conversation_id: str) -> typing.List[messages.TextMessage]:
+        """
+        Return the mirrored messages of a text message conversation, oldest first.
+
+        :param conversation_id: The conversation ID.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT direction, content, created_at FROM text_messages WHERE conversation_id = ? ORDER BY created_at',
+                (conversation_id,)
+            ).fetchall()
+        return [
+            messages.TextMessage(direction, content, dt.datetime.fromtimestamp(created_at, dt.timezone.utc))
+            for direction, content, created_at in rows
+        ]
+
+    def delete(self, resource: str, id: typing.Union[str, int]) -> bool:
+        """
+        Remove a mirrored object, e.g. after deleting it through the API. Returns whether it was mirrored.
+
+        :param resource: calls, form_submissions, text-messages, tags or companies.
+        :param id: The object ID.
+        """
+        with self._lock, self._connection:
+            if resource == 'text-messages':
+                self._connection.execute('DELETE FROM text_messages WHERE conversation_id = ?', (str(id),))
+            return self._connection.execute(
+                'DELETE FROM records WHERE resource = ? AND id = ?', (resource, str(id))
+            ).rowcount > 0
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def count(self, resource: typing.Optional[str] = None) -> int:
+        """
+        Number of mirrored objects, of a resource or in total.
+
+        :param resource: Only count this resource.
+        """
+        query: str = 'SELECT COUNT(*) FROM records'
+        args: typing.List[str] = []
+        if resource is not None:
+            query += ' WHERE resource = ?'
+            args.append(resource)
+
+        with self._lock:
+            return self._connection.execute(query, args).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
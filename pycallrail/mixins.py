@@ -0,0 +1,95 @@
+import abc
+import typing
+
+def _snapshot_value(value: typing.Any) -> typing.Any:
+    # containers like tags are mutated in place, so keep a copy to diff against
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+class DirtyTrackingMixin(abc.ABC):
+    """
+    Tracks changes to the updatable fields of a model since it was last loaded from
+    or saved to the API.
+
+    Models list the fields the API accepts on update in ``UPDATABLE_FIELDS`` and
+    implement ``_send_update`` to send a body of changed fields.
+    """
+
+    UPDATABLE_FIELDS = () # type: typing.Tuple[str, ...]
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        # the loaded state is derived data, it is rebuilt when the model is restored
+        state: typing.Dict[str, typing.Any] = super().__getstate__() # type: ignore
+        state.pop('_loaded', None)
+        return state
+
+    def __setstate__(self, state: typing.Dict[str, typing.Any]) -> None:
+        super().__setstate__(state) # type: ignore
+        self._mark_clean()
+
+    def _mark_clean(self) -> None:
+        """
+        Record the current value of the updatable fields as the loaded state.
+        """
+        state = self.__dict__
+        state['_loaded'] = {
+            field: _snapshot_value(state[field])
+            for field in self.UPDATABLE_FIELDS if field in state
+        }
+
+    def changed_fields(self) -> typing.Dict[str, typing.Any]:
+        """
+        Updatable fields changed since the object was loaded, with their new values.
+        """
+        state = self.__dict__
+        loaded: typing.Dict[str, typing.Any] = state.get('_loaded', {})
+
+        return {
+            field: state[field]
+            for field in self.UPDATABLE_FIELDS
+            if field in state and (field not in loaded or loaded[field] != state[field])
+        }
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Whether any updatable field changed since the object was loaded.
+        """
+        return bool(self.changed_fields())
+
+    def save(self) -> bool:
+        """
+        Send the changed fields to the API.
+
+        No request is made when nothing changed.
+
+        :return: Whether a request was sent.
+        """
+        return self._save({})
+
+    def _save(self, extra: typing.Dict[str, typing.Any]) -> bool:
+        body: typing.Dict[str, typing.Any] = self.changed_fields()
+        body.update(extra)
+
+        if not body:
+            return False
+
+        response = self._send_update(body)
+
+        if isinstance(response, dict):
+            self._refresh(response) # type: ignore
+        self._mark_clean()
+
+        return True
+
+    @abc.abstractmethod
+    def _send_update(self, body: typing.Dict[str, typing.Any]) -> typing.Any:
+        """
+        Send an update request with the given body.
+
+        :param body: The changed fields to send.
+        :return: The JSON response of the API.
+        """
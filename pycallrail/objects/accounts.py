@@ -3,14 +3,30 @@ from __future__ import annotations
 import datetime as dt
 from dateutil import parser as dateparser
 import pycallrail.base as base
+import pycallrail.bulk as bulk
+import pycallrail.helpers as helpers
+import pycallrail.identity as identity
 import pycallrail.callrail as crl
 import pycallrail.objects.calls as calls
 import pycallrail.objects.tags as tags
 import pycallrail.objects.companies as companies
 import pycallrail.objects.form_submissions as forms
 import pycallrail.objects.textmessages as messages
+import pycallrail.profiling as profiling
+import pycallrail.registry as registry
 import typing
 import logging
+import os
+import queue
+import threading
+import time
+import requests
+from pycallrail.errors import LightValidationError
+
+T = typing.TypeVar('T')
+
+ARCHIVE_MANIFEST: str = '.archive.jsonl'
+ARCHIVE_PROGRESS_EVERY: int = 100
 
 class Account(base.CallRailBase):
     """
@@ -70,8 +86,56 @@ class Account(base.CallRailBase):
         if 'numeric_id' in json_data:
             account.numeric_id = json_data['numeric_id']
 
-        return account
+        return identity.merge(api_client, account)
+
+    @property
+    def tag_registry(self) -> registry.TagRegistry:
+        """
+        Tags of the account indexed by id, name and company, shared by every Account
+        object of this account on the client.
+        """
+        existing: typing.Optional[registry.TagRegistry] = registry.registry_for(self.api_client, self.id)
+        if existing is None:
+            existing = self.api_client.tag_registries.setdefault(self.id, registry.TagRegistry(self))
+        return existing
     
+    def _iter_models(
+            self,
+            model: typing.Type[T],
+            response_data_key: str,
+            path: str,
+            start_date: typing.Optional[typing.Union[str, dt.date]],
+            end_date: typing.Optional[typing.Union[str, dt.date]],
+            kwargs: typing.Mapping[str, typing.Any]
+    ) -> typing.Iterator[T]:
+        # shared by the page iterators, builds the params the way the list methods do
+        field_profile: typing.Optional[profiling.FieldProfile] = kwargs.get('field_profile', None)
+        fields = kwargs.get('fields', None)
+        if field_profile is not None:
+            fields = fields or field_profile.fields_param(model)
+            model = field_profile.profiled(model, self.api_client)
+
+        params: typing.Dict[str, typing.Any] = {}
+
+        for name in ('sorting', 'filtering', 'searching'):
+            if kwargs.get(name, None):
+                params[name] = kwargs[name]
+        if fields:
+            params['fields'] = fields
+        if start_date is not None:
+            params['start_date'] = helpers.format_date(start_date)
+        if end_date is not None:
+            params['end_date'] = helpers.format_date(end_date)
+
+        for page in self.api_client._iter_pages(
+            endpoint=f'a/{self.id}',
+            response_data_key=response_data_key,
+            path=path,
+            params=params or None,
+            pagination_type=kwargs.get('pagination_type', 'RELATIVE'),
+        ):
+            yield from model.from_json_page(self.api_client, self.id, page) # type: ignore
+
     #########################
     # Calls
     #########################
@@ -84,7 +148,9 @@ class Account(base.CallRailBase):
         List all calls associated with this account.
 
         Keyword args acceptable include: Pagination Type, Sorting, Filtering, Field Selection, and Searching.
-        Defaults to relative pagination.
+        Defaults to relative pagination. Pass ``as_structs=True`` to decode the pages straight into
+        msgspec structs instead of Call objects (requires msgspec). Pass a ``field_profile`` to request
+        only the fields a job reads, see ``pycallrail.profiling.FieldProfile``.
         
         More info: https://apidocs.callrail.com/#listing-all-calls
         """
@@ -95,6 +161,12 @@ class Account(base.CallRailBase):
         filtering = kwargs.get('filtering', None)
         searching = kwargs.get('searching', None)
         fields = kwargs.get('fields', None)
+        field_profile: typing.Optional[profiling.FieldProfile] = kwargs.get('field_profile', None)
+
+        model: typing.Type[calls.Call] = calls.Call
+        if field_profile is not None:
+            fields = fields or field_profile.fields_param(calls.Call)
+            model = field_profile.profiled(calls.Call, self.api_client)
 
         params = {}
 
@@ -107,6 +179,15 @@ class Account(base.CallRailBase):
         if fields:
             params['fields'] = fields
 
+        if kwargs.get('as_structs', False):
+            return self.api_client._get_structs(
+                endpoint=f'a/{self.id}',
+                response_data_key='calls',
+                path='calls.json',
+                params=params or None,
+                pagination_type=pagination_type,
+            )
+
         if calls_response := typing.cast(
             typing.Union[typing.List[typing.Dict[str, typing.Any]], None],
             self.api_client._get(
@@ -117,10 +198,28 @@ class Account(base.CallRailBase):
                 pagination_type=pagination_type,
             ),
         ):
-            return [calls.Call.from_json(self.api_client, self.id, call) for call in calls_response]
+            return model.from_json_page(self.api_client, self.id, calls_response)
         else:
             return None
 
+    def iter_calls(
+            self,
+            start_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            end_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            **kwargs
+    ) -> typing.Iterator[calls.Call]:
+        """
+        Iterate over the calls of this account, page by page.
+
+        Unlike ``list_calls`` a page is only requested once the records of the previous
+        one were consumed, so memory doesn't grow with the number of calls.
+        Takes ``start_date`` and ``end_date`` as dates or ISO 8601 strings and the keyword
+        arguments of ``list_calls``, except ``as_structs``.
+
+        More info: https://apidocs.callrail.com/#listing-all-calls
+        """
+        return self._iter_models(calls.Call, 'calls', 'calls.json', start_date, end_date, kwargs)
+
     def get_call(
         self,
         call_id: str,
@@ -171,14 +270,46 @@ class Account(base.CallRailBase):
 
         logging.warning('This method is rate limited. There is no functionality to currently check for rate limits. Be careful!')
 
-        body = {
+        body = self._call_body(
+            caller_id=caller_id,
+            customer_phone_number=customer_phone_number,
+            business_phone_number=business_phone_number,
+            recording_enabled=recording_enabled,
+            outbound_greeting_recording_url=outbound_greeting_recording_url,
+            outbound_greeting_text=outbound_greeting_text,
+            agent_id=agent_id
+        )
+        
+        data = self.api_client._post(
+            endpoint=f'a/{self.id}',
+            path='calls.json',
+            data=body
+        )
+        self.api_client._invalidate_cache(self.id, 'calls')
+
+        return calls.Call.from_json(
+            self.api_client,
+            self.id,
+            typing.cast(typing.Dict[str, typing.Any], data)
+        )
+
+    @staticmethod
+    def _call_body(
+            caller_id: int,
+            customer_phone_number: str,
+            business_phone_number: str,
+            recording_enabled: typing.Optional[bool] = None,
+            outbound_greeting_recording_url: typing.Optional[str] = None,
+            outbound_greeting_text: typing.Optional[str] = None,
+            agent_id: typing.Optional[str] = None
+    ) -> typing.Dict[str, typing.Any]:
+        # request body of create_call, shared with the write queue
+        body: typing.Dict[str, typing.Any] = {
             'caller_id': caller_id,
             'customer_phone_number': customer_phone_number,
             'business_phone_number': business_phone_number
         }
 
-        
-
         if recording_enabled:
             body['recording_enabled'] = recording_enabled
         if outbound_greeting_recording_url:
@@ -187,18 +318,135 @@ class Account(base.CallRailBase):
             body['outbound_greeting_text'] = outbound_greeting_text
         if agent_id:
             body['agent_id'] = agent_id
-        
-        data = self.api_client._post(
-            endpoint=f'a/{self.id}',
-            path='calls.json',
-            data=body
-        )
 
-        return calls.Call.from_json(
-            self.api_client,
-            self.id,
-            typing.cast(typing.Dict[str, typing.Any], data)
-        )
+        return body
+
+    def bulk_update_calls(
+            self,
+            updates: typing.Iterable[typing.Tuple[str, typing.Mapping[str, typing.Any]]],
+            concurrency: int = bulk.DEFAULT_CONCURRENCY,
+            rate: typing.Optional[float] = None,
+            max_retries: int = bulk.DEFAULT_MAX_RETRIES
+    ) -> bulk.BulkReport:
+        """
+        Update many calls by ID without loading them first.
+
+        Every update is a pair of call ID and the fields to change, as accepted by
+        ``Call.update`` including ``append_tags``. The requests run concurrently under
+        the client's rate limit and ``rate``, transient failures are retried and the
+        report holds one result per call. Calls held by the identity map are refreshed
+        with the response.
+
+        More info: https://apidocs.callrail.com/#updating-a-call
+        """
+        updatable: typing.Set[str] = set(calls.Call.UPDATABLE_FIELDS) | {'append_tags'}
+        identity_map = identity.identity_map_for(self.api_client)
+
+        def task(call_id: str, changes: typing.Mapping[str, typing.Any]) -> bulk.Task:
+            def update() -> typing.Any:
+                for field in changes:
+                    if field not in updatable:
+                        raise LightValidationError(f'{field} is not updatable!')
+
+                response = self.api_client._put(
+                    endpoint=f'a/{self.id}',
+                    path=f'calls/{call_id}.json',
+                    data=dict(changes)
+                )
+
+                call = identity_map.get(calls.Call, self.id, call_id) if identity_map is not None else None
+                if call is not None and isinstance(response, dict):
+                    try:
+                        call._refresh(response)
+                    except AttributeError:
+                        # fields the model doesn't know, drop the stale instance instead
+                        identity_map.discard(call) # type: ignore
+
+                return response
+
+            return (call_id, update)
+
+        try:
+            return bulk.BulkExecutor(concurrency=concurrency, rate=rate, max_retries=max_retries).run(
+                task(call_id, changes) for call_id, changes in updates
+            )
+        finally:
+            self.api_client._invalidate_cache(self.id, 'calls')
+
+    def archive_recordings(
+            self,
+            calls_or_filter: typing.Union[typing.Iterable[calls.Call], typing.Mapping[str, typing.Any], None],
+            dest_dir: str,
+            concurrency: int = bulk.DEFAULT_CONCURRENCY,
+            rate: typing.Optional[float] = None,
+            max_retries: int = bulk.DEFAULT_MAX_RETRIES,
+            on_result: typing.Optional[typing.Callable[[bulk.BulkResult], None]] = None,
+            progress_every: int = ARCHIVE_PROGRESS_EVERY
+    ) -> bulk.BulkReport:
+        """
+        Download the recordings of many calls into a directory, concurrently.
+
+        Takes calls, or the keyword arguments of ``iter_calls`` to select them (``None``
+        for all calls), which are then listed page by page as the downloads proceed. Every recording is streamed to ``<dest_dir>/<call id>.mp3`` with
+        ``Call.download_recording``, so memory stays bounded and files appear only once
+        complete. The size of every archived file is recorded in a manifest in the
+        directory; recordings whose file still has that size are skipped on the next
+        run, as are calls without a recording. Progress is logged every
+        ``progress_every`` recordings and the report's results hold the bytes written.
+
+        More info: https://apidocs.callrail.com/#get-the-recording-of-the-call
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        if calls_or_filter is None or isinstance(calls_or_filter, typing.Mapping):
+            selected: typing.Iterable[calls.Call] = self.iter_calls(**(calls_or_filter or {}))
+        else:
+            selected = calls_or_filter
+
+        skipped: typing.List[bulk.BulkResult] = []
+        progress: typing.Dict[str, float] = {'done': 0, 'bytes': 0}
+        started: float = time.monotonic()
+        lock = threading.Lock()
+
+        def report_progress(result: bulk.BulkResult) -> None:
+            with lock:
+                progress['done'] += 1
+                progress['bytes'] += result.response or 0
+                if progress_every and progress['done'] % progress_every == 0:
+                    elapsed: float = time.monotonic() - started
+                    logging.info(
+                        'Archived %d recordings, %d bytes, %.1f recordings/s',
+                        progress['done'], progress['bytes'], progress['done'] / elapsed if elapsed > 0 else 0.0
+                    )
+            if on_result is not None:
+                on_result(result)
+
+        with bulk.FileManifest(os.path.join(dest_dir, ARCHIVE_MANIFEST)) as manifest:
+
+            def task(call: calls.Call, path: str) -> bulk.Task:
+                def download() -> typing.Optional[int]:
+                    written: typing.Optional[int] = call.download_recording(path)
+                    manifest.record(call.id, path)
+                    return written
+
+                return (call.id, download)
+
+            def tasks() -> typing.Iterator[bulk.Task]:
+                for call in selected:
+                    path: str = os.path.join(dest_dir, f'{call.id}.mp3')
+                    if manifest.is_intact(call.id, path) or not getattr(call, 'recording', None):
+                        result = bulk.BulkResult(call.id, True, 0, skipped=True)
+                        skipped.append(result)
+                        report_progress(result)
+                        continue
+                    yield task(call, path)
+
+            report: bulk.BulkReport = bulk.BulkExecutor(concurrency=concurrency, rate=rate, max_retries=max_retries).run(
+                tasks(), on_result=report_progress
+            )
+
+        report.results.extend(skipped)
+        logging.info('Archived recordings: %s, %d bytes', report.summary(), progress['bytes'])
+        return report
     
     #########################
     # Tags
@@ -210,6 +458,7 @@ class Account(base.CallRailBase):
     ) -> typing.Union[typing.List[tags.Tag], None]:
         """
         This endpoint returns a paginated array of tags within the target account.
+        Pass ``as_structs=True`` to get msgspec structs instead of Tag objects.
 
         More info: https://apidocs.callrail.com/#retrieving-all-tags
         """
@@ -223,6 +472,15 @@ class Account(base.CallRailBase):
         if sorting:
             params['sorting'] = sorting
 
+        if kwargs.get('as_structs', False):
+            return self.api_client._get_structs(
+                endpoint=f'a/{self.id}',
+                response_data_key='tags',
+                path='tags.json',
+                params=params or None,
+                pagination_type=pagination_type,
+            )
+
         if tags_response := typing.cast(
             typing.List[typing.Dict[str, typing.Any]],
             self.api_client._get(
@@ -274,12 +532,180 @@ class Account(base.CallRailBase):
             path='tags.json',
             data=body
         )
+        self.api_client._invalidate_cache(self.id, 'tags')
 
-        return tags.Tag.from_json(
+        tag: tags.Tag = tags.Tag.from_json(
             self.api_client,
             self.id,
             typing.cast(typing.Dict[str, typing.Any], data)
         )
+
+        if (tag_registry := registry.registry_for(self.api_client, self.id)) is not None:
+            tag_registry.add(tag)
+
+        return tag
+
+    def _tag_targets(
+            self,
+            names_or_ids: typing.Iterable[typing.Union[str, int]],
+            company_ids: typing.Optional[typing.Iterable[str]]
+    ) -> typing.Tuple[typing.List[tags.Tag], typing.List[bulk.BulkResult]]:
+        # resolves tag ids or names to tags of the registry, unknown ones are reported as skipped
+        tag_registry: registry.TagRegistry = self.tag_registry
+        company_ids = list(company_ids) if company_ids is not None else None
+        found: typing.Dict[typing.Union[str, int], tags.Tag] = {}
+        missing: typing.List[bulk.BulkResult] = []
+
+        for name_or_id in names_or_ids:
+            if name_or_id in tag_registry:
+                matches = [tag_registry.get(name_or_id)]
+            elif company_ids is not None:
+                matches = [tag_registry.exact(typing.cast(str, name_or_id), company_id) for company_id in company_ids]
+            else:
+                matches = tag_registry.named(typing.cast(str, name_or_id))
+
+            if not any(matches):
+                missing.append(bulk.BulkResult(name_or_id, True, 0, skipped=True))
+            for tag in matches:
+                if tag is not None:
+                    found[tag.id] = tag
+
+        return list(found.values()), missing
+
+    def _run_bulk(
+            self,
+            tasks: typing.Iterable[bulk.Task],
+            skipped: typing.List[bulk.BulkResult],
+            concurrency: int,
+            rate: typing.Optional[float],
+            max_retries: int
+    ) -> bulk.BulkReport:
+        report: bulk.BulkReport = bulk.BulkExecutor(concurrency=concurrency, rate=rate, max_retries=max_retries).run(tasks)
+        report.results.extend(skipped)
+        return report
+
+    def bulk_create_tags(
+            self,
+            desired: typing.Iterable[typing.Union[str, typing.Mapping[str, typing.Any]]],
+            company_ids: typing.Optional[typing.Iterable[str]] = None,
+            concurrency: int = bulk.DEFAULT_CONCURRENCY,
+            rate: typing.Optional[float] = None,
+            max_retries: int = bulk.DEFAULT_MAX_RETRIES
+    ) -> bulk.BulkReport:
+        """
+        Create the tags of a desired tag set that don't exist yet.
+
+        Tags are names or mappings of the arguments of ``create_tag``. With
+        ``company_ids`` every tag is created as a company tag in each of the companies.
+        The current tags are listed once; existing tags are reported as skipped and the
+        missing ones created concurrently, keyed by ``(company_id, name)``.
+
+        More info: https://apidocs.callrail.com/#creating-a-tag
+        """
+        tag_registry: registry.TagRegistry = self.tag_registry
+        tag_registry.refresh()
+
+        company_ids = list(company_ids) if company_ids is not None else None
+        wanted: typing.Dict[typing.Tuple[typing.Optional[str], str], typing.Dict[str, typing.Any]] = {}
+
+        for tag in desired:
+            fields: typing.Dict[str, typing.Any] = {'name': tag} if isinstance(tag, str) else dict(tag)
+            for company_id in (company_ids if company_ids is not None else [fields.get('company_id')]):
+                create: typing.Dict[str, typing.Any] = dict(fields)
+                if company_id is not None:
+                    create.update(company_id=company_id, tag_level='company')
+                wanted[(company_id, create['name'])] = create
+
+        skipped: typing.List[bulk.BulkResult] = [
+            bulk.BulkResult(key, True, 0, skipped=True)
+            for key in wanted if tag_registry.exact(key[1], key[0]) is not None
+        ]
+        tasks: typing.List[bulk.Task] = [
+            (key, lambda create=create: self.create_tag(**create), bulk.is_unprocessed)
+            for key, create in wanted.items() if tag_registry.exact(key[1], key[0]) is None
+        ]
+
+        return self._run_bulk(tasks, skipped, concurrency, rate, max_retries)
+
+    def bulk_update_tags(
+            self,
+            updates: typing.Mapping[typing.Union[str, int], typing.Mapping[str, typing.Any]],
+            company_ids: typing.Optional[typing.Iterable[str]] = None,
+            concurrency: int = bulk.DEFAULT_CONCURRENCY,
+            rate: typing.Optional[float] = None,
+            max_retries: int = bulk.DEFAULT_MAX_RETRIES
+    ) -> bulk.BulkReport:
+        """
+        Update tags to a desired state.
+
+        ``updates`` maps tag IDs or names to the arguments of ``Tag.update``. A name
+        matches the tags of that name in ``company_ids``, or in every company without
+        them. The current tags are listed once and only the tags that differ from the
+        desired state are updated, concurrently, keyed by tag ID. Like ``Tag.update``,
+        tags can be disabled but not re-enabled.
+
+        More info: https://apidocs.callrail.com/#updating-a-tag
+        """
+        self.tag_registry.refresh()
+        company_ids = list(company_ids) if company_ids is not None else None
+        tasks: typing.List[bulk.Task] = []
+        skipped: typing.List[bulk.BulkResult] = []
+
+        for name_or_id, changes in updates.items():
+            for field in changes:
+                if field not in tags.Tag.UPDATABLE_FIELDS:
+                    raise LightValidationError(f'{field} is not updatable!')
+            if 'disabled' in changes and changes['disabled'] not in (True, 'true'):
+                raise LightValidationError('Tags can only be disabled, not re-enabled!')
+
+            targets, missing = self._tag_targets([name_or_id], company_ids)
+            skipped.extend(missing)
+
+            for tag in targets:
+                current: typing.Dict[str, typing.Any] = {
+                    'name': tag.name,
+                    'color': tag.color,
+                    'disabled': tag.status == 'disabled',
+                }
+                if all(current[field] == value for field, value in changes.items()):
+                    skipped.append(bulk.BulkResult(tag.id, True, 0, skipped=True))
+                else:
+                    tasks.append((tag.id, lambda tag=tag, changes=changes: tag.update(**changes)))
+
+        return self._run_bulk(tasks, skipped, concurrency, rate, max_retries)
+
+    def bulk_delete_tags(
+            self,
+            names_or_ids: typing.Iterable[typing.Union[str, int]],
+            company_ids: typing.Optional[typing.Iterable[str]] = None,
+            concurrency: int = bulk.DEFAULT_CONCURRENCY,
+            rate: typing.Optional[float] = None,
+            max_retries: int = bulk.DEFAULT_MAX_RETRIES
+    ) -> bulk.BulkReport:
+        """
+        Delete tags by ID or name.
+
+        A name matches the tags of that name in ``company_ids``, or in every company
+        without them. The current tags are listed once; tags that don't exist are
+        reported as skipped and the others deleted concurrently, keyed by tag ID. A tag
+        already gone when a retried delete arrives counts as deleted.
+
+        More info: https://apidocs.callrail.com/#disabling-a-tag
+        """
+        self.tag_registry.refresh()
+        targets, skipped = self._tag_targets(names_or_ids, company_ids)
+
+        def delete(tag: tags.Tag) -> None:
+            try:
+                tag.delete()
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                self.tag_registry.discard(tag)
+
+        tasks: typing.List[bulk.Task] = [(tag.id, lambda tag=tag: delete(tag)) for tag in targets]
+
+        return self._run_bulk(tasks, skipped, concurrency, rate, max_retries)
     
     #########################
     # Companies
@@ -291,6 +717,7 @@ class Account(base.CallRailBase):
     ) -> typing.Union[typing.List[companies.Company], None]:
         """
         List all companies under account scope.
+        Pass ``as_structs=True`` to get msgspec structs instead of Company objects.
 
         More info: https://apidocs.callrail.com/#creating-a-company
         """
@@ -316,6 +743,15 @@ class Account(base.CallRailBase):
         if searching:
             params['searching'] = searching
 
+        if kwargs.get('as_structs', False):
+            return self.api_client._get_structs(
+                endpoint=f'a/{self.id}',
+                response_data_key='companies',
+                path='companies.json',
+                params=params or None,
+                pagination_type=pagination_type,
+            )
+
         if companies_response := typing.cast(
             typing.List[typing.Dict[str, typing.Any]],
             self.api_client._get(
@@ -325,7 +761,7 @@ class Account(base.CallRailBase):
                 params=params or None,
                 pagination_type=pagination_type,
         )):
-            return [companies.Company.from_json(self.api_client, self.id, company) for company in companies_response]
+            return companies.Company.from_json_page(self.api_client, self.id, companies_response)
         else:
             return None
         
@@ -381,6 +817,7 @@ class Account(base.CallRailBase):
             path='companies.json',
             data=body
         )
+        self.api_client._invalidate_cache(self.id, 'companies')
 
         return companies.Company.from_json(
             self.api_client,
@@ -398,6 +835,8 @@ class Account(base.CallRailBase):
     ) -> typing.Union[typing.List[forms.FormSubmission], None]:
         """
         List form submissions.
+        Pass ``as_structs=True`` to get msgspec structs instead of FormSubmission objects.
+        Pass a ``field_profile`` to request only the fields a job reads, see ``pycallrail.profiling.FieldProfile``.
 
         More information: https://apidocs.callrail.com/#listing-all-form-submissions
         """
@@ -407,6 +846,12 @@ class Account(base.CallRailBase):
         sorting = kwargs.get('sorting', None)
         filtering = kwargs.get('filtering', None)
         fields = kwargs.get('fields', None)
+        field_profile: typing.Optional[profiling.FieldProfile] = kwargs.get('field_profile', None)
+
+        model: typing.Type[forms.FormSubmission] = forms.FormSubmission
+        if field_profile is not None:
+            fields = fields or field_profile.fields_param(forms.FormSubmission)
+            model = field_profile.profiled(forms.FormSubmission, self.api_client)
 
         params = {}
 
@@ -417,6 +862,15 @@ class Account(base.CallRailBase):
         if fields:
             params['fields'] = fields
 
+        if kwargs.get('as_structs', False):
+            return self.api_client._get_structs(
+                endpoint=f'a/{self.id}',
+                response_data_key='form_submissions',
+                path='form_submissions.json',
+                params=params or None,
+                pagination_type=pagination_type,
+            )
+
         if forms_response := typing.cast(
             typing.List[typing.Dict[str, typing.Any]],
             self.api_client._get(
@@ -427,11 +881,29 @@ class Account(base.CallRailBase):
                 pagination_type=pagination_type,
             )
         ):
-            return [forms.FormSubmission.from_json(self.api_client, self.id, submission) for submission in forms_response]
+            return model.from_json_page(self.api_client, self.id, forms_response)
         else:
             logging.warning('No form submissions found')
             return None
         
+    def iter_form_submissions(
+            self,
+            start_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            end_date: typing.Optional[typing.Union[str, dt.date]] = None,
+            **kwargs
+    ) -> typing.Iterator[forms.FormSubmission]:
+        """
+        Iterate over the form submissions of this account, page by page.
+
+        Unlike ``list_form_submissions`` a page is only requested once the records of the previous
+        one were consumed, so memory doesn't grow with the number of form submissions.
+        Takes ``start_date`` and ``end_date`` as dates or ISO 8601 strings and the keyword
+        arguments of ``list_form_submissions``, except ``as_structs``.
+
+        More info: https://apidocs.callrail.com/#listing-all-form-submissions
+        """
+        return self._iter_models(forms.FormSubmission, 'form_submissions', 'form_submissions.json', start_date, end_date, kwargs)
+
     def create_form_submission(
             self,
             company_id: str,
@@ -460,12 +932,121 @@ class Account(base.CallRailBase):
             path='form_submissions.json',
             data=body
         )
+        self.api_client._invalidate_cache(self.id, 'form_submissions')
 
         return forms.FormSubmission.from_json(
             self.api_client,
             self.id,
             typing.cast(typing.Dict[str, typing.Any], data)
         )
+
+    def bulk_form_submissions(
+            self,
+            submissions: typing.Union[typing.Iterable[typing.Mapping[str, typing.Any]], queue.Queue],
+            concurrency: int = bulk.DEFAULT_CONCURRENCY,
+            rate: typing.Optional[float] = None,
+            max_retries: int = bulk.DEFAULT_MAX_RETRIES,
+            checkpoint_path: typing.Optional[str] = None,
+            key: typing.Optional[typing.Callable[[typing.Mapping[str, typing.Any]], str]] = None,
+            on_result: typing.Optional[typing.Callable[[bulk.BulkResult], None]] = None
+    ) -> bulk.BulkReport:
+        """
+        Create or update many form submissions.
+
+        Submissions with an ``id`` update that form submission with their other fields,
+        the others are created from the fields taken by ``create_form_submission``. A
+        queue is read until ``None`` is put on it.
+
+        Every submission has an idempotency key, derived from its content unless ``key``
+        is given. Duplicates are sent once and reported as skipped with the outcome of
+        the submission they duplicate, and with a checkpoint file the submissions
+        completed by an earlier run are skipped. Creates are only retried when the API
+        certainly didn't process them, updates on any transient failure.
+
+        More information: https://apidocs.callrail.com/#creating-a-form-submission
+        """
+        create_fields: typing.Tuple[str, ...] = (
+            'company_id', 'referrer', 'referring_url', 'landing_page_url', 'form_url', 'form_data'
+        )
+        key_for: typing.Callable[[typing.Mapping[str, typing.Any]], str] = key or bulk.idempotency_key
+        items = bulk.iter_queue(submissions) if isinstance(submissions, queue.Queue) else submissions
+        checkpoint: typing.Optional[bulk.Checkpoint] = bulk.Checkpoint(checkpoint_path) if checkpoint_path else None
+        skipped: typing.List[bulk.BulkResult] = []
+        duplicates: typing.List[str] = []
+
+        def task(item_key: str, submission: typing.Mapping[str, typing.Any]) -> bulk.Task:
+            fields: typing.Dict[str, typing.Any] = dict(submission)
+            submission_id: typing.Optional[str] = fields.pop('id', None)
+
+            def send() -> typing.Any:
+                if submission_id is not None:
+                    for field in fields:
+                        if field not in forms.FormSubmission.UPDATABLE_FIELDS:
+                            raise LightValidationError(f'{field} is not updatable!')
+                    response = self.api_client._put(
+                        endpoint=f'a/{self.id}',
+                        path=f'form_submissions/{submission_id}.json',
+                        data=fields
+                    )
+                else:
+                    for field in create_fields:
+                        if field not in fields:
+                            raise LightValidationError(f'{field} is required!')
+                    for field in fields:
+                        if field not in create_fields:
+                            raise LightValidationError(f'{field} is not a form submission field!')
+                    response = self.api_client._post(
+                        endpoint=f'a/{self.id}',
+                        path='form_submissions.json',
+                        data=fields
+                    )
+
+                if checkpoint is not None:
+                    created_id = response.get('id') if isinstance(response, dict) else None
+                    checkpoint.record(item_key, created_id or submission_id)
+                return response
+
+            return (item_key, send, bulk.is_transient if submission_id is not None else bulk.is_unprocessed)
+
+        def tasks() -> typing.Iterator[bulk.Task]:
+            seen: typing.Set[str] = set()
+            for submission in items:
+                item_key: str = key_for(submission)
+                if item_key in seen:
+                    # resolved from the outcome of the first once the run is done
+                    duplicates.append(item_key)
+                    continue
+                if checkpoint is not None and checkpoint.is_done(item_key):
+                    result = bulk.BulkResult(item_key, True, 0, skipped=True)
+                    skipped.append(result)
+                    if on_result is not None:
+                        on_result(result)
+                    continue
+                seen.add(item_key)
+                yield task(item_key, submission)
+
+        try:
+            report: bulk.BulkReport = bulk.BulkExecutor(concurrency=concurrency, rate=rate, max_retries=max_retries).run(
+                tasks(), on_result=on_result
+            )
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            self.api_client._invalidate_cache(self.id, 'form_submissions')
+
+        originals: typing.Dict[typing.Hashable, bulk.BulkResult] = {result.key: result for result in report.results}
+        for item_key in duplicates:
+            original: bulk.BulkResult = originals[item_key]
+            result = bulk.BulkResult(
+                item_key, original.ok, 0, response=original.response, error=original.error, skipped=True
+            )
+            skipped.append(result)
+            if on_result is not None:
+                on_result(result)
+
+        report.results.extend(skipped)
+        logging.info('Bulk form submissions: %s', report.summary())
+        return report
     
     #########################
     # Text Messages
@@ -477,6 +1058,7 @@ class Account(base.CallRailBase):
     ) -> typing.Union[typing.List[messages.TextMessageConversation], None]:
         """
         List all text message conversations.
+        Pass ``as_structs=True`` to get msgspec structs instead of TextMessageConversation objects.
         More information: https://apidocs.callrail.com/#listing-all-conversations
         """
         
@@ -499,6 +1081,15 @@ class Account(base.CallRailBase):
             params['fields'] = fields
 
 
+        if kwargs.get('as_structs', False):
+            return self.api_client._get_structs(
+                endpoint=f'a/{self.id}',
+                response_data_key='conversations',
+                path='text-messages.json',
+                params=params or None,
+                pagination_type=pagination_type,
+            )
+
         if text_messages_response := typing.cast(
             typing.List[typing.Dict[str, typing.Any]],
             self.api_client._get(
@@ -563,26 +1154,44 @@ class Account(base.CallRailBase):
         logging.warning('Endpoint is rate limited! Be careful!')
         logging.warning('Automated messaging is not allowed. Please use this only for use in person to person communication')
 
-        body = {
-            'company_id': company_id,
-            'customer_phone_number': customer_phone_number,
-            'content': content
-        }
-
-        if tracking_number:
-            body['tracking_number'] = tracking_number # type: ignore
-
-        if len(content) >= 140:
-            raise ValueError('Content must be less than 140 characters')
+        body = self._text_body(
+            company_id=company_id,
+            customer_phone_number=customer_phone_number,
+            content=content,
+            tracking_number=tracking_number
+        )
         
         data = self.api_client._post(
             endpoint=f'a/{self.id}',
             path='text-messages.json',
             data=body
         )
+        self.api_client._invalidate_cache(self.id, 'text-messages')
 
         return messages.TextMessageConversation.from_json(
             self.api_client,
             self.id,
             typing.cast(typing.Dict[str, typing.Any], data)
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def _text_body(
+            company_id: str,
+            customer_phone_number: str,
+            content: str,
+            tracking_number: typing.Optional[typing.Union[str, int]] = None
+    ) -> typing.Dict[str, typing.Any]:
+        # request body of send_text, shared with the write queue
+        body: typing.Dict[str, typing.Any] = {
+            'company_id': company_id,
+            'customer_phone_number': customer_phone_number,
+            'content': content
+        }
+
+        if tracking_number:
+            body['tracking_number'] = tracking_number
+
+        if len(content) >= 140:
+            raise ValueError('Content must be less than 140 characters')
+
+        return body
\ No newline at end of file
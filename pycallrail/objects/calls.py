@@ -1,15 +1,38 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
+import re
 from dateutil import parser as dateparser
 import pycallrail.base as base
+import pycallrail.mixins as mixins
 import pycallrail.callrail as crl
 import typing
 import typing_extensions
 import requests
+from pycallrail.errors import IncompleteDownloadError
 
+DEFAULT_CHUNK_SIZE: int = 64 * 1024
+DEFAULT_DOWNLOAD_RETRIES: int = 3
 
-class Call(base.CallRailBase):
+# errors after which an interrupted download is resumed
+RESUMABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+_CONTENT_RANGE = re.compile(r'bytes (?:(\d+)-\d+|\*)/(\d+|\*)')
+
+
+def _total_length(response: requests.Response, offset: int) -> typing.Optional[int]:
+    # full size of the resource from Content-Range, or Content-Length of a complete response
+    match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+    if match is not None:
+        return int(match.group(2)) if match.group(2) != '*' else None
+    if 'Content-Length' in response.headers:
+        length: int = int(response.headers['Content-Length'])
+        return length + offset if response.status_code == 206 else length
+    return None
+
+
+class Call(mixins.DirtyTrackingMixin, base.CallRailBase):
     """
     Represents a CallRail call.
     
@@ -92,7 +115,24 @@ class Call(base.CallRailBase):
     call_highlights: typing.Optional[typing.List[typing.Any]]
     agent_email: typing.Optional[str]
     keypad_entries: typing.Optional[typing.MutableMapping[str, typing.Any]]
+    spam: typing.Optional[bool]
 
+    REQUIRED_FIELDS = ('start_time',)
+    UPDATABLE_FIELDS = ('tags', 'note', 'value', 'lead_status', 'customer_name', 'spam')
+    DEFAULT_FIELDS = (
+        'answered', 'business_phone_number', 'customer_city', 'customer_country', 'customer_name',
+        'customer_phone_number', 'customer_state', 'direction', 'duration', 'id', 'recording',
+        'recording_duration', 'recording_player', 'start_time', 'tracking_phone_number', 'voicemail'
+    )
+    WRITE_ONLY_FIELDS = ('spam',)
+    INTERNED_FIELDS = (
+        'business_phone_number', 'customer_city', 'customer_country', 'customer_state', 'direction',
+        'tracking_phone_number', 'call_type', 'company_id', 'company_name', 'company_time_zone',
+        'device_type', 'formatted_call_type', 'formatted_business_phone_number',
+        'formatted_tracking_phone_number', 'formatted_tracking_source', 'lead_status', 'source',
+        'source_name', 'tracker_id', 'medium', 'campaign', 'referrer_domain', 'utm_source', 'utm_medium',
+        'utm_campaign', 'agent_email'
+    )
 
     def __init__(
             self,
@@ -109,6 +149,8 @@ class Call(base.CallRailBase):
                 raise AttributeError(f'{key} is not a valid attribute for {self.__class__.__name__}.')
             else:
                 setattr(self, key, value)
+
+        self._mark_clean()
     
     @classmethod
     def from_json(
@@ -124,11 +166,25 @@ class Call(base.CallRailBase):
         :param json_data: The JSON data to deserialize.
         """
 
-        # first lets convert the start_time to a datetime
-        json_data['start_time'] = dateparser.parse(json_data['start_time'])
+        return cls._decode(api_client, account_id, json_data)
+
+    @classmethod
+    def from_json_page(
+        cls,
+        api_client: crl.CallRail,
+        account_id: str,
+        records: typing.Iterable[typing.Dict[str, typing.Any]]
+    ) -> typing.List[Call]:
+        """
+        Deserialize a page of JSON data to Call objects.
+
+        :param api_client: The CallRail API client.
+        :param account_id: The account ID.
+        :param records: The JSON data of the page.
+        """
+
+        return cls._decode_page(api_client, account_id, records)
 
-        return cls(api_client, account_id, **json_data)
-    
     
     def update(
             self, 
@@ -143,54 +199,42 @@ class Call(base.CallRailBase):
         """
         Update a Call object.
         More information: https://apidocs.callrail.com/#updating-a-call
+
+        Only the fields that changed since the call was loaded are sent, together with
+        any attributes changed directly on the object. No request is made when nothing changed.
         """
         # update the attributes
-        if append_tags and tags and hasattr(self, 'tags'):
-            self.tags.extend(tags) # type: ignore
-        else:
-            self.tags = tags
-        if note:
+        if tags is not None:
+            if append_tags and hasattr(self, 'tags') and self.tags is not None:
+                self.tags.extend(tags)
+            else:
+                self.tags = list(tags)
+        if note is not None:
             self.note = note
-        if value:
+        if value is not None:
             self.value = value
-        if lead_status:
+        if lead_status is not None:
             self.lead_status = lead_status
-        if customer_name:
+        if customer_name is not None:
             self.customer_name = customer_name
-        if spam:
+        if spam is not None:
             self.spam = spam
 
-        # form the request body
-        body: typing.Dict[str, typing.Any] = {
-            'tags': tags,
-            'note': note,
-            'value': value,
-            'lead_status': lead_status,
-            'append_tags': append_tags,
-            'customer_name': customer_name,
-            'spam': spam
-        }
-
-        # send the request
-        response_data: typing.Dict[str, typing.Any] = typing.cast(
-            typing.Dict[str, typing.Any], 
-            self.api_client._put(
-                endpoint = f'a/{self.account_id}',
-                path=f'calls/{self.id}.json',
-                data=body
-            )
-        )
+        # appending sends only the new tags, so concurrent taggers don't overwrite each other
+        extra: typing.Dict[str, typing.Any] = {}
+        if append_tags and tags:
+            extra = {'tags': tags, 'append_tags': True}
 
-        # update the attributes
-        for key, value in response_data.items():
-            # raise an error if the attribute doesn't exist
-            if key not in self.__class__.__annotations__.keys():
-                raise AttributeError(f'{key} is not a valid attribute for {self.__class__.__name__}.')
-            else:
-                setattr(self, key, value)
-        
-        
-        
+        self._save(extra)
+
+    def _send_update(self, body: typing.Dict[str, typing.Any]) -> typing.Any:
+        response = self.api_client._put(
+            endpoint = f'a/{self.account_id}',
+            path=f'calls/{self.id}.json',
+            data=body
+        )
+        self.api_client._invalidate_cache(self.account_id, 'calls')
+        return response
 
     def get_recording(self) -> typing.Union[bytes, None]:
         """
@@ -203,4 +247,86 @@ class Call(base.CallRailBase):
             with self.api_client.session.get(url=self.recording) as response:
                 return response.content
         else:
-            return None
\ No newline at end of file
+            return None
+
+    def download_recording(
+            self,
+            destination: typing.Union[str, os.PathLike, typing.BinaryIO],
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            max_retries: int = DEFAULT_DOWNLOAD_RETRIES
+    ) -> typing.Optional[int]:
+        """
+        Stream the recording of the call to a file or a writable binary object, in chunks
+        so memory use doesn't grow with the length of the recording.
+        More information: https://apidocs.callrail.com/#get-the-recording-of-the-call
+
+        An interrupted download is resumed with a Range request where it stopped. A path
+        is written to ``<path>.part`` first and renamed once complete, so a later call
+        resumes a partial file left by an earlier one. The number of bytes received is
+        checked against the length announced by the server.
+
+        If no recording exists, None is returned, otherwise the number of bytes written.
+
+        :param destination: Path of the file, or a writable binary object.
+        :param chunk_size: Bytes read from the connection at a time.
+        :param max_retries: Times an interrupted download is resumed.
+        """
+        if not self.recording:
+            return None
+
+        if not isinstance(destination, (str, os.PathLike)):
+            return self._stream_recording(destination, 0, chunk_size, max_retries)
+
+        partial: str = os.fspath(destination) + '.part'
+        offset: int = os.path.getsize(partial) if os.path.exists(partial) else 0
+        with open(partial, 'ab') as f:
+            size: int = self._stream_recording(f, offset, chunk_size, max_retries)
+        os.replace(partial, destination)
+        return size - offset
+
+    def _stream_recording(
+            self,
+            fileobj: typing.BinaryIO,
+            offset: int,
+            chunk_size: int,
+            max_retries: int
+    ) -> int:
+        # writes the recording from offset on, returns the offset reached
+        url: str = typing.cast(str, self.recording)
+        received: int = offset
+        total: typing.Optional[int] = None
+        retries: int = 0
+
+        while True:
+            headers: typing.Dict[str, str] = {'Range': f'bytes={received}-'} if received else {}
+            try:
+                with self.api_client.session.get(url=url, headers=headers, stream=True) as response:
+                    if response.status_code == 416:
+                        # the partial file of an earlier call is already complete
+                        total = _total_length(response, received)
+                        if total == received:
+                            return received
+                        raise IncompleteDownloadError(url, total if total is not None else -1, received)
+                    response.raise_for_status()
+
+                    total = _total_length(response, received)
+                    # a server ignoring the range resends the whole recording
+                    skip: int = received if response.status_code != 206 else 0
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if skip:
+                            dropped: int = min(skip, len(chunk))
+                            chunk, skip = chunk[dropped:], skip - dropped
+                        if chunk:
+                            fileobj.write(chunk)
+                            received += len(chunk)
+            except RESUMABLE_ERRORS:
+                retries += 1
+                if retries > max_retries:
+                    raise
+                continue
+
+            if total is None or received == total:
+                return received
+            retries += 1
+            if received > total or retries > max_retries:
+                raise IncompleteDownloadError(url, total, received)
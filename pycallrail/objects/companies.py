@@ -3,6 +3,8 @@ from __future__ import annotations
 import datetime as dt
 from dateutil import parser as dateparser
 import pycallrail.base as base
+import pycallrail.mixins as mixins
+import pycallrail.identity as identity
 import pycallrail.callrail as crl
 import typing
 import typing_extensions
@@ -11,7 +13,7 @@ import typeguard
 from pycallrail.errors import LightValidationError
 
 @typeguard.typechecked
-class Company(base.CallRailBase):
+class Company(mixins.DirtyTrackingMixin, base.CallRailBase):
     """
     Represents a Company.
 
@@ -41,6 +43,20 @@ class Company(base.CallRailBase):
     """ Deprecated """
     form_capture: bool
 
+    REQUIRED_FIELDS = ('disabled_at',)
+    UPDATABLE_FIELDS = (
+        'name',
+        'callscore_enabled',
+        'keyword_spotting_enabled',
+        'callscribe_enabled',
+        'time_zone',
+        'swap_exclude_jquery',
+        'swap_ppc_override',
+        'swap_landing_override',
+        'swap_cookie_duration',
+        'external_form_capture'
+    )
+
     def __init__(
         self,
         api_client: crl.CallRail,
@@ -60,6 +76,8 @@ class Company(base.CallRailBase):
             else:
                 setattr(self, k, v)
 
+        self._mark_clean()
+
     @classmethod
     def from_json(
         cls,
@@ -77,9 +95,24 @@ class Company(base.CallRailBase):
         :return: A Company object.
         """
 
-        json_data['disabled_at'] = dateparser.parse(json_data['disabled_at']) if json_data['disabled_at'] else None
+        return cls._decode(api_client, account_id, json_data)
 
-        return cls(api_client, account_id, **json_data)
+    @classmethod
+    def from_json_page(
+        cls,
+        api_client: crl.CallRail,
+        account_id: str,
+        records: typing.Iterable[typing.Dict[str, typing.Any]]
+    ) -> typing.List[Company]:
+        """
+        Deserialize a page of JSON data to Company objects.
+
+        :param api_client: The CallRail API client.
+        :param account_id: The account ID.
+        :param records: The JSON data of the page.
+        """
+
+        return cls._decode_page(api_client, account_id, records)
 
     def delete(self) -> None:
         """
@@ -91,35 +124,31 @@ class Company(base.CallRailBase):
             path=f'/companies/{self.id}.json'
         )
 
+        self.api_client._invalidate_cache(self.account_id, 'companies')
+        identity.discard(self.api_client, self)
+
     def update(
             self,
             **kwargs
     ) -> None:
-        
-        UPDATABLE_FIELDS: typing.List[str] = [
-            'name',
-            'callscore_enabled',
-            'keyword_spotting_enabled',
-            'callscribe_enabled',
-            'time_zone',
-            'swap_exclude_jquery',
-            'swap_ppc_override',
-            'swap_landing_override',
-            'swap_cookie_duration',
-            'external_form_capture'
-        ]
-
-        body = {}
+        """
+        Update the Company.
+
+        Only fields that differ from the loaded values are sent. No request is made when nothing changed.
+        """
 
         for k,v in kwargs.items():
-            if k not in UPDATABLE_FIELDS:
+            if k not in self.UPDATABLE_FIELDS:
                 raise LightValidationError(f'{k} is not updatable!')
             else:
                 setattr(self, k, v)
-                body[k] = v
 
+        self.save()
+
+    def _send_update(self, body: typing.Dict[str, typing.Any]) -> typing.Any:
         self.api_client._put(
             endpoint=f'/a/{self.account_id}',
             path=f'/companies/{self.id}.json',
             data=body
-        )
\ No newline at end of file
+        )
+        self.api_client._invalidate_cache(self.account_id, 'companies')
\ No newline at end of file
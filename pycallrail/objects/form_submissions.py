@@ -3,13 +3,14 @@ from __future__ import annotations
 import datetime as dt
 from dateutil import parser as dateparser
 import pycallrail.base as base
+import pycallrail.mixins as mixins
 import pycallrail.callrail as crl
 import typing
 import typing_extensions
 import requests
 
 
-class FormSubmission(base.CallRailBase):
+class FormSubmission(mixins.DirtyTrackingMixin, base.CallRailBase):
     """
     Represents a form submission.
 
@@ -47,6 +48,19 @@ class FormSubmission(base.CallRailBase):
     timeline_url: typing.Optional[str]
     milestones: typing.Optional[typing.Any]
 
+    REQUIRED_FIELDS = ('submitted_at',)
+    UPDATABLE_FIELDS = ('tags', 'note', 'value', 'lead_status')
+    DEFAULT_FIELDS = (
+        'id', 'company_id', 'person_id', 'form_data', 'form_url', 'landing_page_url', 'referrer',
+        'referring_url', 'submitted_at', 'first_form', 'customer_phone_number', 'customer_name',
+        'formatted_customer_phone_number', 'formatted_customer_name', 'source', 'keywords',
+        'campaign', 'medium'
+    )
+    INTERNED_FIELDS = (
+        'company_id', 'form_url', 'referrer', 'source', 'campaign', 'medium', 'lead_status',
+        'utm_source', 'utm_campaign', 'form_name'
+    )
+
     def __init__(
         self,
         api_client: crl.CallRail,
@@ -63,6 +77,8 @@ class FormSubmission(base.CallRailBase):
             else:
                 setattr(self, k, v)
 
+        self._mark_clean()
+
     @classmethod
     def from_json(
         cls,
@@ -78,14 +94,25 @@ class FormSubmission(base.CallRailBase):
         :param account_id: The CallRail account ID
         :return: The FormSubmission object
         """
-        json_data['submitted_at'] = dateparser.parse(json_data['submitted_at'])
-        
-        return cls(
-            api_client=api_client,
-            account_id=account_id,
-            **json_data
-        )
-        
+        return cls._decode(api_client, account_id, json_data)
+
+    @classmethod
+    def from_json_page(
+        cls,
+        api_client: crl.CallRail,
+        account_id: str,
+        records: typing.Iterable[typing.Dict[str, typing.Any]]
+    ) -> typing.List[FormSubmission]:
+        """
+        Deserialize a page of JSON data to FormSubmission objects.
+
+        :param api_client: The CallRail API client.
+        :param account_id: The account ID.
+        :param records: The JSON data of the page.
+        """
+
+        return cls._decode_page(api_client, account_id, records)
+
     def update(
         self,
         tags: typing.Optional[typing.List[typing.Any]] = None,
@@ -97,44 +124,35 @@ class FormSubmission(base.CallRailBase):
         """
         Update a Form Submission.
         More information: https://apidocs.callrail.com/#updating-a-form-submission
+
+        Only the fields that changed since the submission was loaded are sent.
+        No request is made when nothing changed.
         """
 
         # update the attributes
-        if append_tags and tags and hasattr(self, 'tags'):
-            self.tags.extend(tags) # type: ignore
-        elif tags:
-            self.tags = tags
-        if note:
+        if tags is not None:
+            if append_tags and hasattr(self, 'tags') and self.tags is not None:
+                self.tags.extend(tags)
+            else:
+                self.tags = list(tags)
+        if note is not None:
             self.note = note
-        if value:
+        if value is not None:
             self.value = value
-        if lead_status:
+        if lead_status is not None:
             self.lead_status = lead_status
 
-        # form the request
-        body: typing.Dict[str, typing.Any] = {
-            'tags': tags,
-            'note': note,
-            'value': value,
-            'lead_status': lead_status
-        }
-
-        # send the request
-        response: typing.Dict[str, typing.Any] = typing.cast(
-            typing.Dict[str, typing.Any],
-            self.api_client._put(
-                endpoint=f'a/{self.account_id}',
-                path=f'form_submissions/{self.id}.json',
-                data=body
-            )
-        )
+        extra: typing.Dict[str, typing.Any] = {}
+        if append_tags and tags:
+            extra = {'tags': tags, 'append_tags': True}
 
-        # update the object
-        for k,v in response.items():
-            # raise an error if the attribute is not found
-            if k not in self.__class__.__annotations__.keys():
-                raise AttributeError(f'{k} is not a valid attribute for {self.__class__.__name__}')
-            else:
-                setattr(self, k, v)
+        self._save(extra)
 
-        
\ No newline at end of file
+    def _send_update(self, body: typing.Dict[str, typing.Any]) -> typing.Any:
+        response = self.api_client._put(
+            endpoint=f'a/{self.account_id}',
+            path=f'form_submissions/{self.id}.json',
+            data=body
+        )
+        self.api_client._invalidate_cache(self.account_id, 'form_submissions')
+        return response
@@ -3,13 +3,17 @@ from __future__ import annotations
 import datetime as dt
 from dateutil import parser as dateparser
 import pycallrail.base as base
+import pycallrail.mixins as mixins
+import pycallrail.identity as identity
+import pycallrail.registry as registry
 import pycallrail.callrail as crl
 import typing
 import logging
 import typeguard
+from pycallrail.helpers import parse_datetime
 
 @typeguard.typechecked
-class Tag(base.CallRailBase):
+class Tag(mixins.DirtyTrackingMixin, base.CallRailBase):
     """
     Represents a Tag.
 
@@ -25,6 +29,8 @@ class Tag(base.CallRailBase):
     status: str
     created_at: dt.datetime
 
+    UPDATABLE_FIELDS = ('name', 'color', 'disabled')
+
     def __init__(
         self,
         api_client: crl.CallRail,
@@ -50,6 +56,8 @@ class Tag(base.CallRailBase):
         self.status = status
         self.created_at = created_at
 
+        self._mark_clean()
+
     @classmethod
     def from_json(
         cls,
@@ -60,9 +68,9 @@ class Tag(base.CallRailBase):
         """
         Deserialize JSON data to a Tag object.
         """
-        json_data['created_at'] = dateparser.parse(json_data['created_at'])
+        json_data['created_at'] = parse_datetime(json_data['created_at'])
 
-        return cls(
+        return identity.merge(api_client, cls(
             api_client=api_client,
             account_id=account_id,
             id=json_data['id'],
@@ -73,7 +81,7 @@ class Tag(base.CallRailBase):
             company_id=json_data['company_id'],
             status=json_data['status'],
             created_at=json_data['created_at']
-        )
+        ))
     
     def update(
             self,
@@ -83,6 +91,8 @@ class Tag(base.CallRailBase):
     ) -> None:
         """
         Updates the Tag.
+
+        Only fields that differ from the loaded values are sent. No request is made when nothing changed.
         """
         if name:
             self.name = name
@@ -91,26 +101,18 @@ class Tag(base.CallRailBase):
         if disabled == 'true' or disabled == True:
             self.disabled = True
 
-        body: typing.Dict[str, typing.Any] = {
-            'name': name,
-            'color': color,
-            'disabled': disabled
-        }
+        self.save()
 
-        response: typing.Dict[str, typing.Any] = typing.cast(
-            typing.Dict[str, typing.Any],
-            self.api_client._put(
-                endpoint=f'a/{self.account_id}',
-                path=f'tags/{self.id}.json',
-                data=body
-            )
+    def _send_update(self, body: typing.Dict[str, typing.Any]) -> typing.Any:
+        response = self.api_client._put(
+            endpoint=f'a/{self.account_id}',
+            path=f'tags/{self.id}.json',
+            data=body
         )
-
-        for key, value in response.items():
-            if key not in self.__class__.__annotations__.keys():
-                raise AttributeError(f'{key} is not a valid attribute for {self.__class__.__name__}')
-            else:
-                setattr(self, key, value)
+        self.api_client._invalidate_cache(self.account_id, 'tags')
+        if (tag_registry := registry.registry_for(self.api_client, self.account_id)) is not None:
+            tag_registry.add(self)
+        return response
     
     def delete(self) -> None:
         """
@@ -121,4 +123,9 @@ class Tag(base.CallRailBase):
             path=f'tags/{self.id}.json'
         )
 
+        self.api_client._invalidate_cache(self.account_id, 'tags')
+        identity.discard(self.api_client, self)
+        if (tag_registry := registry.registry_for(self.api_client, self.account_id)) is not None:
+            tag_registry.discard(self)
+
     
\ No newline at end of file
@@ -3,10 +3,12 @@ from __future__ import annotations
 import datetime as dt
 from dateutil import parser as dateparser
 import pycallrail.base as base
+import pycallrail.interning as interning
 import pycallrail.callrail as crl
 import typing
 import logging
 import typeguard
+from pycallrail.helpers import parse_datetime
 
 class TextMessage(base.CallRailBase):
     """
@@ -63,6 +65,13 @@ class TextMessageConversation(base.CallRailBase):
     # Optional User Requested Fields
     lead_status: typing.Optional[str]
 
+    REQUIRED_FIELDS = ('id',)
+    INTERNED_FIELDS = (
+        'company_id', 'initial_tracker_id', 'current_tracker_id', 'initial_tracking_number',
+        'current_tracking_number', 'state', 'company_time_zone', 'formatted_initial_tracking_number',
+        'formatted_current_tracking_number', 'tracker_name', 'company_name', 'lead_status'
+    )
+
     def __init__(
         self,
         api_client: crl.CallRail,
@@ -95,21 +104,18 @@ class TextMessageConversation(base.CallRailBase):
         Deserialize JSON to a Text Message Conversation
         """
 
-        json_data['last_message_at'] = dateparser.parse(json_data['last_message_at'])
+        intern = interning.intern_for(api_client) or str
 
+        json_data = dict(json_data)
         json_data['recent_messages'] = [
             TextMessage(
-                message['direction'],
+                intern(message['direction']),
                 message['content'],
-                dateparser.parse(message['created_at'])
+                parse_datetime(message['created_at'])
             ) for message in json_data['recent_messages']
         ]
 
-        return cls(
-            api_client=api_client,
-            account_id=account_id,
-            **json_data
-        )
+        return cls._decode(api_client, account_id, json_data)
 
     def archive(self, state: str = 'archived') -> None:
         """
@@ -125,5 +131,6 @@ class TextMessageConversation(base.CallRailBase):
                 'state': state
             }
         )
+        self.api_client._invalidate_cache(self.account_id, 'text-messages')
 
         self.state = state
\ No newline at end of file
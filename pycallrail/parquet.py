@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import collections
+import datetime as dt
+import json
+import logging
+import os
+import typing
+
+import pycallrail.helpers as helpers
+import pycallrail.sync as sync
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError: # pragma: no cover
+    pyarrow = None # type: ignore
+
+DEFAULT_ROW_GROUP_SIZE: int = 50000
+DEFAULT_COMPRESSION: str = 'snappy'
+DEFAULT_MAX_OPEN_FILES: int = 64
+
+# partition by the UTC date of the resource's timestamp
+DATE_PARTITION: str = 'date'
+
+
+def _require_pyarrow() -> None:
+    if pyarrow is None:
+        raise ImportError('pyarrow is required for Parquet exports. Install it with `pip install pycallrail[parquet]`.')
+
+
+def _arrow_type(annotation: typing.Any) -> typing.Tuple[typing.Any, bool]:
+    # arrow type of an annotated field, and whether values are stored as JSON text
+    args: typing.Tuple[typing.Any, ...] = tuple(arg for arg in typing.get_args(annotation) if arg is not type(None))
+    if typing.get_origin(annotation) is typing.Union:
+        if len(args) == 1:
+            return _arrow_type(args[0])
+        if all(arg in (int, float) for arg in args):
+            return pyarrow.float64(), False
+        return pyarrow.string(), True
+
+    if annotation is bool:
+        return pyarrow.bool_(), False
+    if annotation is int:
+        return pyarrow.int64(), False
+    if annotation is float:
+        return pyarrow.float64(), False
+    if annotation is str:
+        return pyarrow.string(), False
+    if annotation is dt.datetime:
+        return pyarrow.timestamp('us', tz='UTC'), False
+    if annotation is dt.date:
+        return pyarrow.date32(), False
+    return pyarrow.string(), True
+
+
+def _coerce(value: typing.Any, arrow_type: typing.Any) -> typing.Any:
+    # value converted to the column type, raises ValueError or TypeError if it can't be
+    if pyarrow.types.is_string(arrow_type):
+        if isinstance(value, str):
+            return value
+        return json.dumps(value, separators=(',', ':')) if isinstance(value, (dict, list)) else str(value)
+    if pyarrow.types.is_boolean(arrow_type):
+        if isinstance(value, str) and value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+        if isinstance(value, (bool, int)):
+            return bool(value)
+        raise ValueError(f'{value!r} is not a boolean')
+    if pyarrow.types.is_integer(arrow_type):
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f'{value!r} is not an integer')
+        return int(value)
+    if pyarrow.types.is_floating(arrow_type):
+        return float(value)
+    if pyarrow.types.is_timestamp(arrow_type):
+        if isinstance(value, str):
+            return helpers.parse_datetime(value)
+        if isinstance(value, dt.datetime):
+            return value
+        raise ValueError(f'{value!r} is not a timestamp')
+    if pyarrow.types.is_date(arrow_type):
+        if isinstance(value, str):
+            return dt.date.fromisoformat(value)
+        if isinstance(value, dt.date):
+            return value
+        raise ValueError(f'{value!r} is not a date')
+    return value
+
+
+def schema_for(model: type, fields: typing.Optional[typing.Iterable[str]] = None) -> typing.Any:
+    """
+    Arrow schema of a model, derived from its annotations. Lists, mappings and nested
+    objects become JSON text columns. All columns are nullable, since the API leaves
+    out fields that weren't requested.
+
+    :param model: A model class, e.g. ``Call``.
+    :param fields: Only these fields, in this order. Defaults to all annotated fields.
+    """
+    _require_pyarrow()
+    hints: typing.Dict[str, typing.Any] = typing.get_type_hints(model)
+    names: typing.List[str] = list(fields) if fields is not None else list(hints)
+
+    unknown: typing.List[str] = [name for name in names if name not in hints]
+    if unknown:
+        raise ValueError(f'{", ".join(unknown)} not a field of {model.__name__}')
+
+    columns: typing.List[typing.Any] = []
+    for name in names:
+        arrow_type, as_json = _arrow_type(hints[name])
+        columns.append(pyarrow.field(name, arrow_type, metadata={'json': 'true'} if as_json else None))
+    return pyarrow.schema(columns)
+
+
+class ParquetExporter(object):
+    """
+    Writes records of a resource to Parquet files as they arrive.
+
+    Records are buffered per partition and written as a row group once
+    ``row_group_size`` records of a partition are buffered; once ``max_buffered_rows``
+    records are buffered in total all partitions are flushed, so memory stays bounded
+    for any export size and number of partitions.
+
+    Files are written to ``<directory>/part-0.parquet``, partitioned exports to
+    Hive-style directories like ``<directory>/date=2023-01-01/company_id=COM1/part-0.parquet``.
+    Existing files of the same name are replaced.
+
+    At most ``max_open_files`` files are open at once; the least recently written one
+    is finished when another partition needs a file. A partition written to again
+    after its file was finished continues in ``part-1.parquet``, ``part-2.parquet``
+    and so on.
+    """
+
+    def __init__(
+            self,
+            resource: str,
+            directory: str,
+            row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+            partition_by: typing.Sequence[str] = (),
+            fields: typing.Optional[typing.Iterable[str]] = None,
+            compression: str = DEFAULT_COMPRESSION,
+            max_buffered_rows: typing.Optional[int] = None,
+            max_open_files: int = DEFAULT_MAX_OPEN_FILES
+    ) -> None:
+        """
+        :param resource: calls, form_submissions or text-messages.
+        :param directory: Directory the files are written to. Created if missing.
+        :param row_group_size: Records per row group.
+        :param partition_by: ``date`` and/or field names, e.g. ``company_id``.
+        :param fields: Only export these fields. Defaults to all fields of the model.
+        :param compression: Parquet compression codec.
+        :param max_buffered_rows: Records buffered across partitions before all are flushed.
+            Defaults to four row groups.
+        :param max_open_files: Files kept open at once across partitions.
+        """
+        _require_pyarrow()
+        self.resource: sync.SyncedResource = sync.RESOURCES[resource]
+        self.directory: str = directory
+        self.row_group_size: int = row_group_size
+        self.partition_by: typing.Tuple[str, ...] = tuple(partition_by)
+        self.compression: str = compression
+        self.max_buffered_rows: int = max_buffered_rows or row_group_size * 4
+        self.max_open_files: int = max(1, max_open_files)
+        self.schema: typing.Any = schema_for(self.resource.model, fields)
+
+        self.rows: int = 0
+        self.row_groups: int = 0
+        self.files: int = 0
+
+        self._json_fields: typing.Set[str] = {
+            field.name for field in self.schema if field.metadata and field.metadata.get(b'json') == b'true'
+        }
+        self._buffers: typing.Dict[typing.Tuple[str, ...], typing.List[typing.Dict[str, typing.Any]]] = {}
+        self._buffered: int = 0
+        # open writers, least recently written first
+        self._writers: collections.OrderedDict[typing.Tuple[str, ...], typing.Any] = collections.OrderedDict()
+        # number of files written per partition
+        self._parts: typing.Dict[typing.Tuple[str, ...], int] = {}
+
+    def _partition_of(self, record: typing.Dict[str, typing.Any]) -> typing.Tuple[str, ...]:
+        values: typing.List[str] = []
+        for name in self.partition_by:
+            if name == DATE_PARTITION:
+                timestamp: typing.Any = record.get(self.resource.timestamp_field)
+                value: typing.Any = helpers.parse_datetime(timestamp).astimezone(dt.timezone.utc).date().isoformat() \
+                    if timestamp else None
+            else:
+                value = record.get(name)
+            values.append(f'{name}={value if value is not None else "__null__"}')
+        return tuple(values)
+
+    def _row(self, record: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        # values that don't match their annotation are cast, or left out if they can't be
+        row: typing.Dict[str, typing.Any] = {}
+        for field in self.schema:
+            value: typing.Any = record.get(field.name)
+            if value is not None:
+                if field.name in self._json_fields:
+                    value = json.dumps(value, separators=(',', ':'))
+                else:
+                    try:
+                        value = _coerce(value, field.type)
+                    except (TypeError, ValueError):
+                        logging.warning('Left out %s of %s %s: %r is not a %s', field.name, self.resource.response_data_key,
+                                        record.get('id'), value, field.type)
+                        value = None
+            row[field.name] = value
+        return row
+
+    def _flush(self, partition: typing.Tuple[str, ...]) -> None:
+        rows: typing.List[typing.Dict[str, typing.Any]] = self._buffers.pop(partition, [])
+        if not rows:
+            return
+
+        writer = self._writers.get(partition)
+        if writer is not None:
+            self._writers.move_to_end(partition)
+        else:
+            while len(self._writers) >= self.max_open_files:
+                self._writers.popitem(last=False)[1].close()
+
+            part: int = self._parts.get(partition, 0)
+            self._parts[partition] = part + 1
+            directory: str = os.path.join(self.directory, *partition)
+            os.makedirs(directory, exist_ok=True)
+            writer = self._writers[partition] = pyarrow.parquet.ParquetWriter(
+                os.path.join(directory, f'part-{part}.parquet'), self.schema, compression=self.compression
+            )
+            self.files += 1
+
+        writer.write_table(pyarrow.Table.from_pylist(rows, schema=self.schema), row_group_size=self.row_group_size)
+        self._buffered -= len(rows)
+        self.row_groups += 1
+
+    def write(self, records: typing.Iterable[typing.Dict[str, typing.Any]]) -> None:
+        """
+        Add records as returned by the API, e.g. a page.
+
+        :param records: The records.
+        """
+        for record in records:
+            partition: typing.Tuple[str, ...] = self._partition_of(record)
+            buffer = self._buffers.setdefault(partition, [])
+            buffer.append(self._row(record))
+            self._buffered += 1
+            self.rows += 1
+
+            if len(buffer) >= self.row_group_size:
+                self._flush(partition)
+            elif self._buffered >= self.max_buffered_rows:
+                for buffered in list(self._buffers):
+                    self._flush(buffered)
+
+    def close(self) -> None:
+        """
+        Write the buffered records and finish the files.
+        """
+        for partition in list(self._buffers):
+            self._flush(partition)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def __enter__(self) -> ParquetExporter:
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.close()
+
+
+def export_parquet(
+        account: typing.Any,
+        resource: str,
+        directory: str,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        partition_by: typing.Sequence[str] = (),
+        fields: typing.Optional[typing.Iterable[str]] = None,
+        compression: str = DEFAULT_COMPRESSION,
+        max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+        **kwargs: typing.Any
+) -> typing.Dict[str, int]:
+    """
+    Export a resource of an account to Parquet, page by page. Returns the number of
+    rows, row groups and files written.
+
+    :param account: The Account.
+    :param resource: calls, form_submissions or text-messages.
+    :param directory: Directory the files are written to.
+    :param row_group_size: Records per row group.
+    :param partition_by: ``date`` and/or field names, e.g. ``company_id``.
+    :param fields: Only export and request these fields.
+    :param compression: Parquet compression codec.
+    :param max_open_files: Files kept open at once across partitions.
+    :param kwargs: Further query string parameters, e.g. ``start_date``.
+    """
+    exporter = ParquetExporter(
+        resource, directory, row_group_size=row_group_size, partition_by=partition_by,
+        fields=fields, compression=compression, max_open_files=max_open_files
+    )
+    params: typing.Dict[str, typing.Any] = dict(kwargs)
+    if fields is not None:
+        params['fields'] = ','.join(fields)
+
+    with exporter:
+        for page in account.api_client._iter_pages(
+            endpoint=f'a/{account.id}',
+            response_data_key=exporter.resource.response_data_key,
+            path=exporter.resource.path,
+            params=params or None
+        ):
+            exporter.write(page)
+
+    return {'rows': exporter.rows, 'row_groups': exporter.row_groups, 'files': exporter.files}
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+import typing
+
+from pycallrail.cache import ResponseCache, resource_of
+from pycallrail.helpers import build_url
+
+# resources whose lists are preloaded
+PRELOADED_RESOURCES: typing.Tuple[str, ...] = ('accounts', 'companies', 'tags')
+
+DEFAULT_MAX_WORKERS: int = 8
+DEFAULT_MAX_SNAPSHOT_AGE: float = 3600.0
+
+# (url, cache params, response)
+Entry = typing.Tuple[str, typing.Dict[str, typing.Any], typing.Any]
+
+
+class Preloader(object):
+    """
+    Loads the reference data of every account into the response cache of a client.
+
+    A refresh issues the requests of ``list_accounts()``, ``Account.list_companies()``
+    and ``Account.list_tags()`` with their default arguments, concurrently across
+    accounts, and caches the results under the same keys, so those calls and
+    ``get_account`` / ``get_company`` are answered from memory afterwards. The
+    loaded data can be snapshot to a JSON file and restored on the next start.
+
+    Usually created through ``CallRail.preload()``.
+    """
+
+    def __init__(
+            self,
+            api_client: typing.Any,
+            snapshot_path: typing.Optional[str] = None,
+            max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> None:
+        """
+        :param api_client: The CallRail API client. A response cache is enabled on it if missing.
+        :param snapshot_path: JSON file the loaded data is saved to and restored from.
+        :param max_workers: Number of accounts loaded concurrently.
+        """
+        self.api_client: typing.Any = api_client
+        self.snapshot_path: typing.Optional[str] = snapshot_path
+        self.max_workers: int = max_workers
+
+        if api_client.cache is None:
+            api_client.cache = ResponseCache()
+
+        cache: ResponseCache = api_client.cache
+        if cache.cache_lists is not True:
+            cache.cache_lists = set(cache.cache_lists or ()) | set(PRELOADED_RESOURCES)
+
+        self.refreshed_at: typing.Optional[float] = None
+        self._entries: typing.List[Entry] = []
+        self._stop = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+
+    @property
+    def cache(self) -> ResponseCache:
+        return self.api_client.cache
+
+    def _store(
+            self,
+            entries: typing.List[Entry],
+            url: str,
+            params: typing.Dict[str, typing.Any],
+            value: typing.Any,
+            ttl: typing.Optional[float] = None
+    ) -> None:
+        self.cache.set(url, params, value, ttl)
+        entries.append((url, params, value))
+
+    def _load_list(
+            self,
+            endpoint: str,
+            response_data_key: str,
+            path: typing.Optional[str],
+            params: typing.Optional[typing.Dict[str, typing.Any]],
+            pagination_type: str
+    ) -> typing.Tuple[Entry, typing.List[typing.Dict[str, typing.Any]]]:
+        with self.cache.bypass():
+            records = self.api_client._get(
+                endpoint=endpoint,
+                response_data_key=response_data_key,
+                path=path,
+                params=params,
+                pagination_type=pagination_type
+            ) or []
+
+        url: str = build_url(self.api_client.BASE_URL, endpoint, path)
+        return (url, self.api_client._cache_params(params, pagination_type), records), records
+
+    def _load_account(self, account_id: str) -> typing.List[Entry]:
+        entries: typing.List[Entry] = []
+        base_url: str = self.api_client.BASE_URL
+
+        entry, companies = self._load_list(f'a/{account_id}', 'companies', 'companies.json', None, 'RELATIVE')
+        entries.append(entry)
+        for company in companies:
+            url = build_url(base_url, f'a/{account_id}', f'companies/{company["id"]}.json')
+            self._store(entries, url, self.api_client._cache_params(None, 'NONE'), company)
+
+        entry, _ = self._load_list(f'a/{account_id}', 'tags', 'tags.json', None, 'RELATIVE')
+        entries.append(entry)
+
+        return entries
+
+    def refresh(self) -> None:
+        """
+        Load accounts, companies and tags from the API and save the snapshot, if any.
+        """
+        entry, accounts = self._load_list('a.json', 'accounts', None, {}, 'OFFSET')
+        entries: typing.List[Entry] = [entry]
+        for account in accounts:
+            url = build_url(self.api_client.BASE_URL, 'a', f'/{account["id"]}.json')
+            self._store(entries, url, self.api_client._cache_params({}, 'NONE'), account)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for account_entries in executor.map(self._load_account, [account['id'] for account in accounts]):
+                entries.extend(account_entries)
+
+        self._entries = entries
+        self.refreshed_at = time.time()
+
+        if self.snapshot_path:
+            self.save()
+
+    def save(self, path: typing.Optional[str] = None) -> None:
+        """
+        Save the loaded data to a JSON file.
+
+        :param path: Overrides the snapshot path given to the constructor.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError('No path to save the snapshot to')
+
+        snapshot: typing.Dict[str, typing.Any] = {
+            'saved_at': self.refreshed_at or time.time(),
+            'entries': self._entries,
+        }
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    def restore(self, max_age: float = DEFAULT_MAX_SNAPSHOT_AGE, path: typing.Optional[str] = None) -> bool:
+        """
+        Load a snapshot into the response cache. Returns False if there is no snapshot
+        or it is older than ``max_age`` seconds.
+
+        Entries expire when they would have expired had they been cached at the time
+        the snapshot was taken; entries already past their TTL are skipped.
+
+        :param max_age: Maximum age of the snapshot, in seconds.
+        :param path: Overrides the snapshot path given to the constructor.
+        """
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return False
+
+        with open(path) as f:
+            snapshot: typing.Dict[str, typing.Any] = json.load(f)
+
+        now: float = time.time()
+        if snapshot['saved_at'] + max_age < now:
+            return False
+
+        entries: typing.List[Entry] = []
+        for url, params, value in snapshot['entries']:
+            ttl: float = snapshot['saved_at'] + self.cache.ttl_for(resource_of(url)[1]) - now
+            if ttl > 0:
+                self._store(entries, url, params, value, ttl)
+
+        self._entries = entries
+        self.refreshed_at = snapshot['saved_at']
+        return True
+
+    def start(self, interval: float, immediately: bool = False) -> None:
+        """
+        Refresh in a background thread every ``interval`` seconds until ``stop()``.
+
+        Keep the interval below the TTL of the preloaded resources so the cache
+        stays warm. Failed refreshes are logged and retried on the next interval.
+
+        :param interval: Seconds between refreshes.
+        :param immediately: Refresh once right away, e.g. after restoring a snapshot.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError('Background refresh is already running')
+
+        self._stop.clear()
+
+        def run() -> None:
+            wait: float = 0 if immediately else interval
+            while not self._stop.wait(wait):
+                try:
+                    self.refresh()
+                except Exception:
+                    logging.exception('Preload refresh failed')
+                wait = interval
+
+        self._thread = threading.Thread(target=run, name='pycallrail-preload', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: typing.Optional[float] = None) -> None:
+        """
+        Stop the background refresh.
+
+        :param timeout: Seconds to wait for a running refresh to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import typing
+
+import pycallrail.base as base
+import pycallrail.identity as identity
+
+
+class FieldProfile(object):
+    """
+    Records which model attributes a job reads, so later runs only request those fields.
+
+    Pass the profile to ``Account.list_calls`` or ``Account.list_form_submissions``
+    through the ``field_profile`` keyword. On the first run for a model every optional
+    field is requested and the reads are recorded; once the profile was saved, only the
+    optional fields that were read are requested. Fields that are always returned by the
+    API cannot be excluded and are never part of the request.
+
+    A field read on a later run that was not requested raises an AttributeError like
+    any missing field, but is recorded so the next run requests it.
+
+    Profiling doesn't work with a client keeping an identity map: the map hands out
+    the live instances instead of the recording ones, so listing with a profile raises
+    a ValueError there.
+
+    Usable as a context manager, which saves the profile on exit.
+    """
+
+    def __init__(self, path: typing.Optional[str] = None) -> None:
+        """
+        :param path: JSON file the profile is loaded from and saved to.
+        """
+        self.path: typing.Optional[str] = path
+        self._learned: typing.Dict[str, typing.FrozenSet[str]] = {}
+        self._reads: typing.Dict[str, typing.Set[str]] = {}
+        self._classes: typing.Dict[type, type] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._learned = {model: frozenset(fields) for model, fields in json.load(f).items()}
+
+    def __enter__(self) -> FieldProfile:
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.save()
+
+    @staticmethod
+    def optional_fields(model: type) -> typing.List[str]:
+        """
+        Fields of a model that are only returned when requested.
+
+        :param model: The model class.
+        """
+        excluded = set(getattr(model, 'DEFAULT_FIELDS', ())) | set(getattr(model, 'WRITE_ONLY_FIELDS', ()))
+        return [field for field in model.__annotations__ if field not in excluded]
+
+    def is_learned(self, model: type) -> bool:
+        """
+        Whether a saved profile exists for the model.
+
+        :param model: The model class.
+        """
+        return model.__name__ in self._learned
+
+    def reads(self, model: type) -> typing.Set[str]:
+        """
+        Fields of a model read since the profile was created.
+
+        :param model: The model class.
+        """
+        return set(self._reads.get(model.__name__, ()))
+
+    def fields_param(self, model: type) -> typing.Optional[str]:
+        """
+        Value of the ``fields`` query parameter for a model.
+
+        :param model: The model class.
+        """
+        optional: typing.List[str] = self.optional_fields(model)
+
+        if self.is_learned(model):
+            wanted = self._learned[model.__name__] | self._reads.get(model.__name__, set())
+            optional = [field for field in optional if field in wanted]
+
+        return ','.join(optional) or None
+
+    def profiled(self, model: type, api_client: typing.Any = None) -> type:
+        """
+        Return a subclass of the model that records attribute reads into this profile.
+
+        Instances keep the class name, equality and hashing of the model and pickle as
+        plain model instances.
+
+        :param model: The model class.
+        :param api_client: The client the instances are decoded with. Raises a
+            ValueError when it keeps an identity map, which would hand out
+            instances that don't record their reads.
+        """
+        if identity.identity_map_for(api_client) is not None:
+            raise ValueError('Field profiles cannot be used with a client keeping an identity map')
+
+        if model in self._classes:
+            return self._classes[model]
+
+        with self._lock:
+            reads: typing.Set[str] = self._reads.setdefault(model.__name__, set())
+            annotations: typing.Dict[str, typing.Any] = model.__annotations__
+            get_attribute = model.__getattribute__
+
+            def __getattribute__(obj: typing.Any, name: str) -> typing.Any:
+                if name in annotations:
+                    reads.add(name)
+                return get_attribute(obj, name)
+
+            def __reduce__(obj: typing.Any) -> typing.Tuple[typing.Any, ...]:
+                state = obj.__getstate__()
+                return (base._restore_model, (model, state, 'api_client' in obj.__dict__))
+
+            profiled = type(model.__name__, (model,), {
+                '__annotations__': annotations,
+                '__getattribute__': __getattribute__,
+                '__reduce__': __reduce__,
+                '__module__': model.__module__,
+                '__qualname__': model.__qualname__,
+            })
+            self._classes[model] = profiled
+
+        return profiled
+
+    def save(self, path: typing.Optional[str] = None, prune: bool = False) -> None:
+        """
+        Save the profile. This run's reads are added to the saved fields of each model,
+        so a run that only touches some fields doesn't drop the fields of other jobs.
+
+        :param path: Overrides the path given to the constructor.
+        :param prune: Replace the saved fields of the models read during this run
+            with this run's reads, dropping fields that are no longer used.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError('No path to save the field profile to')
+
+        profile: typing.Dict[str, typing.List[str]] = {
+            model: sorted(fields) for model, fields in self._learned.items()
+        }
+        for model, fields in self._reads.items():
+            if fields:
+                kept: typing.FrozenSet[str] = frozenset() if prune else self._learned.get(model, frozenset())
+                profile[model] = sorted(kept | fields)
+
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(profile, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+        self._learned = {model: frozenset(fields) for model, fields in profile.items()}
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import threading
+import time
+import typing
+
+import pycallrail.identity as identity
+import pycallrail.objects.tags as tags
+
+DEFAULT_REFRESH_INTERVAL: float = 300.0
+
+NameKey = typing.Tuple[typing.Optional[str], str]
+
+
+class TagRegistry(object):
+    """
+    Tags of an account indexed by id, by name and by company and name.
+
+    Get it through ``Account.tag_registry``. The tag list is fetched on first use and
+    again once it is older than ``refresh_interval``; a refresh updates the indexed
+    tags in place. ``Account.create_tag``, ``Tag.update`` and ``Tag.delete`` keep the
+    registry in sync in between.
+    """
+
+    def __init__(
+            self,
+            account: typing.Any,
+            refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+            clock: typing.Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        :param account: The Account the tags belong to.
+        :param refresh_interval: Seconds after which the tag list is fetched again.
+        :param clock: Monotonic time source, in seconds.
+        """
+        self.account: typing.Any = account
+        self.refresh_interval: float = refresh_interval
+        self.clock: typing.Callable[[], float] = clock
+        self.refreshed_at: typing.Optional[float] = None
+
+        self._by_id: typing.Dict[typing.Union[int, str], tags.Tag] = {}
+        self._by_name: typing.Dict[str, typing.Dict[typing.Union[int, str], tags.Tag]] = {}
+        self._by_company: typing.Dict[NameKey, tags.Tag] = {}
+        self._keys: typing.Dict[typing.Union[int, str], typing.Tuple[str, NameKey]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key_for(tag: tags.Tag) -> NameKey:
+        """
+        Company and name of a tag. Account level tags have no company.
+
+        :param tag: The tag.
+        """
+        company_id: typing.Optional[str] = tag.company_id if getattr(tag, 'tag_level', None) == 'company' else None
+        return (company_id, tag.name)
+
+    def _index(self, tag: tags.Tag) -> None:
+        self._unindex(tag.id)
+        name_key: NameKey = self.key_for(tag)
+        self._by_id[tag.id] = tag
+        self._by_name.setdefault(tag.name, {})[tag.id] = tag
+        self._by_company[name_key] = tag
+        self._keys[tag.id] = (tag.name, name_key)
+
+    def _unindex(self, tag_id: typing.Union[int, str]) -> None:
+        # the keys a tag was indexed under, its name may have changed since
+        keys = self._keys.pop(tag_id, None)
+        if keys is None:
+            return
+        name, name_key = keys
+
+        del self._by_id[tag_id]
+        named = self._by_name[name]
+        del named[tag_id]
+        if not named:
+            del self._by_name[name]
+        if self._by_company.get(name_key) is not None and self._by_company[name_key].id == tag_id:
+            del self._by_company[name_key]
+
+    def add(self, tag: tags.Tag) -> None:
+        """
+        Index a created or updated tag, replacing the entry with the same id.
+
+        :param tag: The tag.
+        """
+        with self._lock:
+            self._index(tag)
+
+    def discard(self, tag: tags.Tag) -> None:
+        """
+        Remove a deleted tag.
+
+        :param tag: The tag.
+        """
+        with self._lock:
+            self._unindex(tag.id)
+
+    def refresh(self) -> None:
+        """
+        Fetch the tag list and update the indexes: new tags are added, changed tags
+        are updated in place and tags that are gone are removed. Unsaved changes to
+        an indexed tag are kept.
+        """
+        fetched: typing.List[tags.Tag] = self.account.list_tags() or []
+
+        with self._lock:
+            seen: typing.Set[typing.Union[int, str]] = set()
+            for tag in fetched:
+                seen.add(tag.id)
+                existing = self._by_id.get(tag.id)
+                if existing is not None and existing is not tag:
+                    identity.merge_state(existing, tag)
+                    tag = existing
+                self._index(tag)
+
+            for tag_id in [tag_id for tag_id in self._by_id if tag_id not in seen]:
+                self._unindex(tag_id)
+
+            self.refreshed_at = self.clock()
+
+    def _ensure_fresh(self) -> None:
+        # under the lock, so concurrent lookups of a stale registry refresh it once
+        with self._lock:
+            if self.refreshed_at is None or self.refreshed_at + self.refresh_interval <= self.clock():
+                self.refresh()
+
+    def get(self, tag_id: typing.Union[int, str]) -> typing.Optional[tags.Tag]:
+        """
+        Return a tag by id.
+
+        :param tag_id: The tag id.
+        """
+        self._ensure_fresh()
+        return self._by_id.get(tag_id)
+
+    def find(self, name: str, company_id: typing.Optional[str] = None) -> typing.Optional[tags.Tag]:
+        """
+        Return a tag by name.
+
+        With a company the company's tag of that name is preferred over the account
+        level one. Without a company an account level tag is returned, or the only
+        tag of that name.
+
+        :param name: The tag name.
+        :param company_id: The company the tag is used in.
+        """
+        self._ensure_fresh()
+
+        with self._lock:
+            if company_id is not None and (company_id, name) in self._by_company:
+                return self._by_company[(company_id, name)]
+            if (None, name) in self._by_company:
+                return self._by_company[(None, name)]
+            if company_id is None:
+                named = self._by_name.get(name, {})
+                if len(named) == 1:
+                    return next(iter(named.values()))
+            return None
+
+    def exact(self, name: str, company_id: typing.Optional[str] = None) -> typing.Optional[tags.Tag]:
+        """
+        Return the tag of a company, or the account level tag without a company, by name.
+        Unlike ``find`` there is no fallback to the account level tag.
+
+        :param name: The tag name.
+        :param company_id: The company of a company level tag.
+        """
+        self._ensure_fresh()
+        return self._by_company.get((company_id, name))
+
+    def named(self, name: str) -> typing.List[tags.Tag]:
+        """
+        All tags of a name, across companies.
+
+        :param name: The tag name.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._by_name.get(name, {}).values())
+
+    def all(self) -> typing.List[tags.Tag]:
+        """
+        All tags of the account.
+        """
+        self._ensure_fresh()
+        return list(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, tag_id: typing.Union[int, str]) -> bool:
+        return tag_id in self._by_id
+
+
+def registry_for(api_client: typing.Any, account_id: str) -> typing.Optional[TagRegistry]:
+    """
+    Return the tag registry of an account, if one was created on the client.
+
+    :param api_client: The CallRail API client.
+    :param account_id: The account id.
+    """
+    registries = getattr(api_client, 'tag_registries', None)
+    return registries.get(account_id) if isinstance(registries, dict) else None
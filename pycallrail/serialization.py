@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pickle
+import typing
+
+import pycallrail.base as base
+
+_FORMAT_VERSION = 1
+
+
+def dump_models(models: typing.Iterable[base.CallRailBase]) -> bytes:
+    """
+    Serialize a batch of models to bytes.
+
+    The batch is stored row-wise: field names are written once per model class and
+    layout, each model only contributes a tuple of values. API clients are left out.
+
+    :param models: The models to serialize.
+    """
+    layouts: typing.Dict[typing.Tuple[typing.Any, ...], int] = {}
+    rows: typing.List[typing.Tuple[int, typing.Tuple[typing.Any, ...]]] = []
+
+    for model in models:
+        state: typing.Dict[str, typing.Any] = model.__getstate__()
+        layout = (type(model), tuple(state), 'api_client' in model.__dict__)
+        index: int = layouts.setdefault(layout, len(layouts))
+        rows.append((index, tuple(state.values())))
+
+    return pickle.dumps((_FORMAT_VERSION, list(layouts), rows), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_models(
+    data: bytes,
+    api_client: typing.Optional[typing.Any] = None
+) -> typing.List[typing.Any]:
+    """
+    Deserialize a batch of models written by ``dump_models``.
+
+    Only load data from a trusted source, the format is based on pickle.
+
+    :param data: The serialized batch.
+    :param api_client: Client to attach the models to. Defaults to the client set
+        with ``pycallrail.base.set_default_client``.
+    """
+    version, layouts, rows = pickle.loads(data)
+
+    if version != _FORMAT_VERSION:
+        raise ValueError(f'Unsupported model batch format {version}')
+
+    client = api_client if api_client is not None else base.get_default_client()
+    models: typing.List[typing.Any] = []
+
+    for index, values in rows:
+        cls, keys, attached = layouts[index]
+        obj = cls.__new__(cls)
+        obj.__setstate__(dict(zip(keys, values)))
+        if attached:
+            obj.api_client = client
+        models.append(obj)
+
+    return models
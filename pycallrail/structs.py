@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import typing
+
+import pycallrail.decoders as decoders
+import pycallrail.objects.accounts as accounts
+import pycallrail.objects.calls as calls
+import pycallrail.objects.companies as companies
+import pycallrail.objects.form_submissions as forms
+import pycallrail.objects.tags as tags
+import pycallrail.objects.textmessages as messages
+
+try:
+    import msgspec
+except ImportError: # pragma: no cover
+    msgspec = None # type: ignore
+
+# response data key -> model class
+MODELS: typing.Dict[str, type] = {
+    'accounts': accounts.Account,
+    'calls': calls.Call,
+    'companies': companies.Company,
+    'form_submissions': forms.FormSubmission,
+    'tags': tags.Tag,
+    'conversations': messages.TextMessageConversation,
+}
+
+_STRUCTS: typing.Dict[type, typing.Any] = {}
+_DECODERS: typing.Dict[str, typing.Any] = {}
+_LOCK = threading.RLock()
+
+
+def _require_msgspec() -> None:
+    if msgspec is None:
+        raise ImportError('msgspec is required for struct decoding. Install it with `pip install pycallrail[speed]`.')
+
+
+def struct_for(model: type) -> typing.Any:
+    """
+    Return the msgspec Struct type mirroring a model class.
+
+    Fields are taken from the model annotations. Datetime fields are typed as
+    datetimes so msgspec converts them while decoding; every other field keeps
+    the JSON value as-is. All fields are optional.
+
+    :param model: The model class.
+    """
+    _require_msgspec()
+
+    if model in _STRUCTS:
+        return _STRUCTS[model]
+
+    with _LOCK:
+        datetime_fields = set(decoders.datetime_fields(model))
+        fields: typing.List[typing.Tuple[str, typing.Any, typing.Any]] = []
+
+        for name in model.__annotations__:
+            if name in datetime_fields:
+                fields.append((name, typing.Optional[dt.datetime], None))
+            elif model is messages.TextMessageConversation and name == 'recent_messages':
+                fields.append((name, typing.List[struct_for(messages.TextMessage)], []))
+            else:
+                fields.append((name, typing.Any, None))
+
+        struct = msgspec.defstruct(f'{model.__name__}Struct', fields, module=__name__)
+        _STRUCTS[model] = struct
+
+    return struct
+
+
+def page_decoder(response_data_key: str) -> typing.Any:
+    """
+    Return a msgspec decoder for a page of a resource.
+
+    The decoded page exposes the records under ``response_data_key`` together
+    with the pagination fields of both relative and offset pagination.
+
+    :param response_data_key: Key of the records in the response, e.g. ``calls``.
+    """
+    _require_msgspec()
+
+    if response_data_key in _DECODERS:
+        return _DECODERS[response_data_key]
+
+    if response_data_key not in MODELS:
+        raise ValueError(f'{response_data_key} is not a supported resource')
+
+    page = msgspec.defstruct(
+        f'{MODELS[response_data_key].__name__}Page',
+        [
+            (response_data_key, typing.List[struct_for(MODELS[response_data_key])], []),
+            ('page', typing.Optional[int], None),
+            ('total_pages', typing.Optional[int], None),
+            ('has_next_page', typing.Optional[bool], None),
+            ('next_page', typing.Optional[str], None),
+        ],
+        module=__name__
+    )
+
+    decoder = msgspec.json.Decoder(page)
+    _DECODERS[response_data_key] = decoder
+    return decoder
+
+
+def decode_page(response_data_key: str, content: bytes) -> typing.Any:
+    """
+    Decode the raw bytes of a page into a page struct.
+
+    :param response_data_key: Key of the records in the response, e.g. ``calls``.
+    :param content: Raw response body.
+    """
+    return page_decoder(response_data_key).decode(content)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import sqlite3
+import threading
+import time
+import typing
+
+import pycallrail.bulk as bulk
+import pycallrail.helpers as helpers
+import pycallrail.objects.calls as calls
+import pycallrail.objects.form_submissions as forms
+import pycallrail.objects.textmessages as messages
+
+DEFAULT_OVERLAP: float = 3600.0
+
+
+class SyncedResource(object):
+    """
+    How a resource is listed and which of its timestamps the watermark follows.
+    """
+
+    def __init__(self, path: str, response_data_key: str, timestamp_field: str, model: typing.Any) -> None:
+        """
+        :param path: Path of the listing below the account.
+        :param response_data_key: Key of the records in a page.
+        :param timestamp_field: Field the watermark is taken from.
+        :param model: Class the records are decoded to.
+        """
+        self.path: str = path
+        self.response_data_key: str = response_data_key
+        self.timestamp_field: str = timestamp_field
+        self.model: typing.Any = model
+
+
+RESOURCES: typing.Dict[str, SyncedResource] = {
+    'calls': SyncedResource('calls.json', 'calls', 'start_time', calls.Call),
+    'form_submissions': SyncedResource('form_submissions.json', 'form_submissions', 'submitted_at', forms.FormSubmission),
+    'text-messages': SyncedResource('text-messages.json', 'conversations', 'last_message_at', messages.TextMessageConversation),
+}
+
+_SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS watermarks (
+    account_id TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    mark TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (account_id, resource, scope)
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    account_id TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (account_id, resource, scope, record_id)
+);
+'''
+
+# parameters that don't change which records are listed
+_UNSCOPED_PARAMS: typing.FrozenSet[str] = frozenset(('fields',))
+
+
+def _scope(params: typing.Mapping[str, typing.Any]) -> str:
+    # canonical form of the filter parameters of a sync, '' without filters
+    filters: typing.Dict[str, typing.Any] = {
+        name: value for name, value in params.items() if name not in _UNSCOPED_PARAMS
+    }
+    return json.dumps(filters, sort_keys=True, default=str, separators=(',', ':')) if filters else ''
+
+
+class SyncEngine(object):
+    """
+    Incremental sync of calls, form submissions and text message conversations.
+
+    Keeps a high-water mark per account and resource in a SQLite file: the latest
+    ``start_time``, ``submitted_at`` or ``last_message_at`` seen. A sync only lists the
+    records from ``overlap`` seconds before the mark on, so records updated or
+    arriving late within the overlap are seen again, and yields the records that are
+    new or changed since they were last yielded, told apart by a fingerprint of their
+    content.
+
+    The mark and the fingerprints are saved once a sync was iterated to the end, so an
+    interrupted sync yields its records again the next time. Syncs filtered by query
+    string parameters, e.g. ``company_id``, keep their own mark and fingerprints per
+    set of filters, so they don't move the mark of the unfiltered sync past records
+    it hasn't seen.
+    """
+
+    def __init__(
+            self,
+            api_client: typing.Any,
+            path: str,
+            overlap: float = DEFAULT_OVERLAP,
+            initial_start: typing.Optional[typing.Union[str, dt.date]] = None,
+            clock: typing.Callable[[], float] = time.time
+    ) -> None:
+        """
+        :param api_client: The CallRail API client.
+        :param path: SQLite database file. Created if missing.
+        :param overlap: Seconds before the mark that are listed again.
+        :param initial_start: Where the first sync of a resource starts, all records by default.
+        :param clock: Wall clock time source, in seconds.
+        """
+        self.api_client: typing.Any = api_client
+        self.path: str = path
+        self.overlap: float = overlap
+        self.initial_start: typing.Optional[typing.Union[str, dt.date]] = initial_start
+        self.clock: typing.Callable[[], float] = clock
+
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def mark(self, account_id: str, resource: str, **kwargs: typing.Any) -> typing.Optional[dt.datetime]:
+        """
+        Return the high-water mark of a resource of an account, or None before its first sync.
+
+        :param account_id: The account ID.
+        :param resource: calls, form_submissions or text-messages.
+        :param kwargs: The filters the sync was made with.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT mark FROM watermarks WHERE account_id = ? AND resource = ? AND scope = ?',
+                (account_id, resource, _scope(kwargs))
+            ).fetchone()
+        return helpers.parse_datetime(row[0]) if row is not None else None
+
+    def reset(self, account_id: str, resource: typing.Optional[str] = None) -> None:
+        """
+        Forget the marks and fingerprints of an account, of all filters, so the next sync starts over.
+
+        :param account_id: The account ID.
+        :param resource: Only forget this resource.
+        """
+        query: str = 'DELETE FROM {} WHERE account_id = ?'
+        args: typing.List[str] = [account_id]
+        if resource is not None:
+            query += ' AND resource = ?'
+            args.append(resource)
+
+        with self._lock, self._connection:
+            self._connection.execute(query.format('watermarks'), args)
+            self._connection.execute(query.format('fingerprints'), args)
+
+    def _fingerprints(self, account_id: str, resource: str, scope: str) -> typing.Dict[str, str]:
+        with self._lock:
+            return dict(self._connection.execute(
+                'SELECT record_id, fingerprint FROM fingerprints WHERE account_id = ? AND resource = ? AND scope = ?',
+                (account_id, resource, scope)
+            ).fetchall())
+
+    def _save(
+            self,
+            account_id: str,
+            resource: str,
+            scope: str,
+            mark: typing.Optional[dt.datetime],
+            changed: typing.List[typing.Tuple[str, str, str]]
+    ) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?)',
+                [
+                    (account_id, resource, scope, record_id, fingerprint, timestamp)
+                    for record_id, fingerprint, timestamp in changed
+                ]
+            )
+            if mark is None:
+                return
+            self._connection.execute(
+                'INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?, ?)',
+                (account_id, resource, scope, mark.isoformat(), self.clock())
+            )
+            # records older than the window are never listed again
+            horizon: dt.datetime = mark - dt.timedelta(seconds=self.overlap)
+            stale: typing.List[typing.Tuple[str]] = [
+                (record_id,) for record_id, timestamp in self._connection.execute(
+                    'SELECT record_id, timestamp FROM fingerprints WHERE account_id = ? AND resource = ? AND scope = ?',
+                    (account_id, resource, scope)
+                ) if helpers.parse_datetime(timestamp) < horizon
+            ]
+            self._connection.executemany(
+                'DELETE FROM fingerprints WHERE account_id = ? AND resource = ? AND scope = ? AND record_id = ?',
+                [(account_id, resource, scope, record_id) for record_id, in stale]
+            )
+
+    def sync(self, account: typing.Any, resource: str, **kwargs: typing.Any) -> typing.Iterator[typing.Any]:
+        """
+        Yield the records of a resource of an account that are new or changed since the last sync.
+
+        :param account: The Account.
+        :param resource: calls, form_submissions or text-messages.
+        :param kwargs: Further query string parameters, e.g. ``fields``. Filters like
+            ``company_id`` are synced separately from the other filters and the unfiltered sync.
+        """
+        synced: SyncedResource = RESOURCES[resource]
+        scope: str = _scope(kwargs)
+        mark: typing.Optional[dt.datetime] = self.mark(account.id, resource, **kwargs)
+
+        params: typing.Dict[str, typing.Any] = dict(kwargs)
+        if mark is not None:
+            params['start_date'] = helpers.format_date(mark - dt.timedelta(seconds=self.overlap))
+        elif self.initial_start is not None:
+            params['start_date'] = helpers.format_date(self.initial_start)
+
+        known: typing.Dict[str, str] = self._fingerprints(account.id, resource, scope)
+        changed: typing.List[typing.Tuple[str, str, str]] = []
+        new_mark: typing.Optional[dt.datetime] = mark
+
+        for page in self.api_client._iter_pages(
+            endpoint=f'a/{account.id}',
+            response_data_key=synced.response_data_key,
+            path=synced.path,
+            params=params
+        ):
+            for record in page:
+                record_id: str = str(record['id'])
+                raw_timestamp: typing.Any = record.get(synced.timestamp_field)
+                fingerprint: str = bulk.idempotency_key(record)
+
+                if raw_timestamp is not None:
+                    timestamp: dt.datetime = helpers.parse_datetime(raw_timestamp)
+                    if new_mark is None or timestamp > new_mark:
+                        new_mark = timestamp
+
+                if known.get(record_id) == fingerprint:
+                    continue
+
+                known[record_id] = fingerprint
+                changed.append((
+                    record_id,
+                    fingerprint,
+                    raw_timestamp or dt.datetime.fromtimestamp(self.clock(), dt.timezone.utc).isoformat()
+                ))
+                yield synced.model.from_json(self.api_client, account.id, record)
+
+        self._save(account.id, resource, scope, new_mark, changed)
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import typing
+import uuid
+
+import requests
+
+import pycallrail.bulk as bulk
+from pycallrail.concurrency import RateLimiter
+
+DEFAULT_MAX_ATTEMPTS: int = 5
+DEFAULT_POLL_INTERVAL: float = 1.0
+# seconds a worker owns a write it sent, longer than any request takes
+DEFAULT_LEASE: float = 300.0
+
+# a write is in exactly one of these states
+PENDING: str = 'pending'
+IN_FLIGHT: str = 'in_flight'
+DONE: str = 'done'
+FAILED: str = 'failed'
+# sent, but whether the API processed it is unknown: never resent without requeue()
+UNCERTAIN: str = 'uncertain'
+
+# kind of write -> path below the account and resource written to
+WRITES: typing.Dict[str, typing.Tuple[str, str]] = {
+    'call': ('calls.json', 'calls'),
+    'text': ('text-messages.json', 'text-messages'),
+}
+
+_SCHEMA: str = '''
+CREATE TABLE IF NOT EXISTS writes (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    response TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS writes_pending ON writes (status, next_attempt_at, created_at);
+'''
+
+_COLUMNS: str = 'key, kind, account_id, body, status, attempts, response, error'
+
+
+class QueuedWrite(object):
+    """
+    A write in the queue and its outcome.
+    """
+
+    def __init__(
+            self,
+            key: str,
+            kind: str,
+            account_id: str,
+            body: typing.Dict[str, typing.Any],
+            status: str,
+            attempts: int,
+            response: typing.Any = None,
+            error: typing.Optional[str] = None
+    ) -> None:
+        """
+        :param key: The caller's idempotency key.
+        :param kind: ``call`` or ``text``.
+        :param account_id: The account written to.
+        :param body: The request body.
+        :param status: pending, in_flight, done, failed or uncertain.
+        :param attempts: Number of times the request was sent.
+        :param response: The decoded response of the successful request.
+        :param error: Description of the last failure.
+        """
+        self.key: str = key
+        self.kind: str = kind
+        self.account_id: str = account_id
+        self.body: typing.Dict[str, typing.Any] = body
+        self.status: str = status
+        self.attempts: int = attempts
+        self.response: typing.Any = response
+        self.error: typing.Optional[str] = error
+
+    @classmethod
+    def _from_row(cls, row: typing.Tuple[typing.Any, ...]) -> QueuedWrite:
+        key, kind, account_id, body, status, attempts, response, error = row
+        return cls(
+            key, kind, account_id, json.loads(body), status, attempts,
+            response=json.loads(response) if response is not None else None,
+            error=error
+        )
+
+    def __repr__(self) -> str:
+        return f'<QueuedWrite {self.key!r} {self.kind} {self.status} attempts={self.attempts}>'
+
+
+class WriteQueue(object):
+    """
+    Durable queue of outbound calls and text messages in a SQLite file.
+
+    ``enqueue_call`` and ``enqueue_text`` take the arguments of ``Account.create_call``
+    and ``Account.send_text`` plus an idempotency key chosen by the caller; a key
+    already in the queue is not queued again. ``process`` or a background worker
+    started with ``start`` send the writes in order, no faster than ``rate``, and
+    store their outcome under the key.
+
+    A request is only sent again when the API certainly didn't process it: it was
+    rate limited or never connected. A write whose outcome is unknown, because the
+    connection broke after sending or the process died while it was in flight, is
+    marked uncertain and left for the caller to check and ``requeue``.
+
+    Several processes can share the queue file: a write is claimed by exactly one
+    worker, which owns it for ``lease`` seconds while it is in flight. A write still
+    in flight once its lease expired belongs to a worker that died, and is marked
+    uncertain by the next worker that looks for writes.
+    """
+
+    def __init__(
+            self,
+            api_client: typing.Any,
+            path: str,
+            rate: typing.Optional[float] = None,
+            max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+            backoff: float = bulk.DEFAULT_BACKOFF,
+            lease: float = DEFAULT_LEASE,
+            clock: typing.Callable[[], float] = time.time
+    ) -> None:
+        """
+        :param api_client: The CallRail API client.
+        :param path: SQLite database file. Created if missing.
+        :param rate: Maximum writes per second, on top of the client's rate limit.
+        :param max_attempts: Times a write is sent before it fails.
+        :param backoff: Seconds before resending a rate limited write, doubled on every further attempt.
+        :param lease: Seconds a write in flight stays owned by the worker sending it. Must exceed
+            the time a request takes.
+        :param clock: Wall clock time source, in seconds.
+        """
+        self.api_client: typing.Any = api_client
+        self.path: str = path
+        self.rate_limiter: typing.Optional[RateLimiter] = RateLimiter(rate) if rate else None
+        self.max_attempts: int = max_attempts
+        self.backoff: float = backoff
+        self.lease: float = lease
+        self.clock: typing.Callable[[], float] = clock
+        self.owner: str = uuid.uuid4().hex
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+        self._connection: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        self._recover()
+
+    def _recover(self) -> None:
+        # in flight past its lease, its worker died and it may or may not have been sent
+        now: float = self.clock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                'UPDATE writes SET status = ?, error = ?, updated_at = ? WHERE status = ? AND lease_expires_at < ?',
+                (UNCERTAIN, 'interrupted while in flight', now, IN_FLIGHT, now)
+            )
+
+    def _enqueue(self, key: str, kind: str, account_id: str, body: typing.Dict[str, typing.Any]) -> QueuedWrite:
+        encoded: str = json.dumps(body, sort_keys=True)
+        now: float = self.clock()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR IGNORE INTO writes (key, kind, account_id, body, status, created_at, next_attempt_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, kind, account_id, encoded, PENDING, now, now, now)
+            )
+            row = self._connection.execute(f'SELECT {_COLUMNS} FROM writes WHERE key = ?', (key,)).fetchone()
+
+        write: QueuedWrite = QueuedWrite._from_row(row)
+        if (write.kind, write.account_id, write.body) != (kind, account_id, json.loads(encoded)):
+            raise ValueError(f'Idempotency key {key!r} was already used for a different write')
+        return write
+
+    def enqueue_call(self, account: typing.Any, key: str, **kwargs: typing.Any) -> QueuedWrite:
+        """
+        Queue an outbound call. Returns the queued write, the existing one if the key
+        was queued before.
+        More info: https://apidocs.callrail.com/#creating-an-outbound-phone-call
+
+        :param account: The Account placing the call.
+        :param key: Idempotency key of the call.
+        :param kwargs: The arguments of ``Account.create_call``.
+        """
+        return self._enqueue(key, 'call', account.id, account._call_body(**kwargs))
+
+    def enqueue_text(self, account: typing.Any, key: str, **kwargs: typing.Any) -> QueuedWrite:
+        """
+        Queue a text message. Returns the queued write, the existing one if the key
+        was queued before.
+        More information: https://apidocs.callrail.com/#sending-a-text-message
+
+        :param account: The Account sending the text message.
+        :param key: Idempotency key of the text message.
+        :param kwargs: The arguments of ``Account.send_text``.
+        """
+        return self._enqueue(key, 'text', account.id, account._text_body(**kwargs))
+
+    def _claim(self) -> typing.Optional[QueuedWrite]:
+        # marks the oldest due write in flight before it is sent
+        while True:
+            now: float = self.clock()
+            with self._lock:
+                row = self._connection.execute(
+                    f'SELECT {_COLUMNS} FROM writes WHERE status = ? AND next_attempt_at <= ? '
+                    'ORDER BY created_at, rowid LIMIT 1',
+                    (PENDING, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                with self._connection:
+                    # only one worker moves the write out of pending, even across processes
+                    claimed: bool = self._connection.execute(
+                        'UPDATE writes SET status = ?, attempts = attempts + 1, owner = ?, lease_expires_at = ?, '
+                        'updated_at = ? WHERE key = ? AND status = ?',
+                        (IN_FLIGHT, self.owner, now + self.lease, now, row[0], PENDING)
+                    ).rowcount == 1
+
+            if claimed:
+                break
+            # claimed by another worker since it was selected, try the next one
+
+        write: QueuedWrite = QueuedWrite._from_row(row)
+        write.status = IN_FLIGHT
+        write.attempts += 1
+        return write
+
+    def _finish(self, write: QueuedWrite, next_attempt_at: typing.Optional[float] = None) -> None:
+        # a write requeued after its lease expired is no longer ours to update
+        with self._lock, self._connection:
+            self._connection.execute(
+                'UPDATE writes SET status = ?, response = ?, error = ?, next_attempt_at = COALESCE(?, next_attempt_at), '
+                'owner = NULL, lease_expires_at = NULL, updated_at = ? WHERE key = ? AND owner = ?',
+                (
+                    write.status,
+                    json.dumps(write.response) if write.response is not None else None,
+                    write.error,
+                    next_attempt_at,
+                    self.clock(),
+                    write.key,
+                    self.owner
+                )
+            )
+
+    def _send(self, write: QueuedWrite) -> QueuedWrite:
+        path, resource = WRITES[write.kind]
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        try:
+            write.response = self.api_client._post(endpoint=f'a/{write.account_id}', path=path, data=write.body)
+            write.status, write.error = DONE, None
+        except Exception as e:
+            write.error = repr(e)
+            if bulk.is_unprocessed(e) and write.attempts < self.max_attempts:
+                delay: typing.Optional[float] = bulk.retry_after(e)
+                if delay is None:
+                    delay = self.backoff * 2 ** (write.attempts - 1)
+                write.status = PENDING
+                self._finish(write, next_attempt_at=self.clock() + delay)
+                return write
+            if bulk.is_unprocessed(e) or (
+                isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code < 500
+            ):
+                write.status = FAILED
+            else:
+                write.status = UNCERTAIN
+            logging.warning('Queued %s %s %s: %r', write.kind, write.key, write.status, e)
+        else:
+            self.api_client._invalidate_cache(write.account_id, resource)
+
+        self._finish(write)
+        return write
+
+    def process(self, max_writes: typing.Optional[int] = None) -> typing.List[QueuedWrite]:
+        """
+        Send the writes that are due, in the order they were queued. Returns the writes
+        sent, with their outcome.
+
+        :param max_writes: Stop after sending this many writes.
+        """
+        self._recover()
+        sent: typing.List[QueuedWrite] = []
+        while max_writes is None or len(sent) < max_writes:
+            write: typing.Optional[QueuedWrite] = self._claim()
+            if write is None:
+                break
+            sent.append(self._send(write))
+        return sent
+
+    def start(self, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """
+        Send queued writes in a background thread until ``stop()``.
+
+        :param poll_interval: Seconds to wait for new writes once the queue is drained.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError('Write queue worker is already running')
+
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.is_set():
+                try:
+                    if self.process(max_writes=1):
+                        continue
+                except Exception:
+                    logging.exception('Write queue worker failed')
+                self._stop.wait(poll_interval)
+
+        self._thread = threading.Thread(target=run, name='pycallrail-write-queue', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: typing.Optional[float] = None) -> None:
+        """
+        Stop the background worker after the write it is sending.
+
+        :param timeout: Seconds to wait for the worker to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get(self, key: str) -> typing.Optional[QueuedWrite]:
+        """
+        Return a queued write and its outcome by idempotency key, or None.
+
+        :param key: The idempotency key.
+        """
+        with self._lock:
+            row = self._connection.execute(f'SELECT {_COLUMNS} FROM writes WHERE key = ?', (key,)).fetchone()
+        return QueuedWrite._from_row(row) if row is not None else None
+
+    def requeue(self, key: str) -> bool:
+        """
+        Queue an uncertain or failed write again, e.g. after checking it didn't reach
+        the API. Returns whether the write was requeued.
+
+        :param key: The idempotency key.
+        """
+        now: float = self.clock()
+        with self._lock, self._connection:
+            return self._connection.execute(
+                'UPDATE writes SET status = ?, attempts = 0, error = NULL, owner = NULL, lease_expires_at = NULL, '
+                'next_attempt_at = ?, updated_at = ? WHERE key = ? AND status IN (?, ?)',
+                (PENDING, now, now, key, UNCERTAIN, FAILED)
+            ).rowcount > 0
+
+    def close(self) -> None:
+        self.stop()
+        self._connection.close()
+
+    @property
+    def stats(self) -> typing.Dict[str, int]:
+        """
+        Number of writes per status.
+        """
+        with self._lock:
+            counts = dict(self._connection.execute('SELECT status, COUNT(*) FROM writes GROUP BY status').fetchall())
+        return {status: counts.get(status, 0) for status in (PENDING, IN_FLIGHT, DONE, FAILED, UNCERTAIN)}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM writes WHERE status = ?', (PENDING,)).fetchone()[0]
@@ -48,6 +48,12 @@ extras_require = {
         'requests_mock',
         'typeguard',
         'python-dateutil'
+    ],
+    'speed': [
+        'msgspec'
+    ],
+    'parquet': [
+        'pyarrow'
     ]
 }
 
@@ -70,6 +76,11 @@ setup(
     include_package_data=True,
     install_requires=requirements,
     extras_require=extras_require,
+    entry_points={
+        'console_scripts': [
+            'pycallrail=pycallrail.cli:main'
+        ]
+    },
     python_requires='>=3.8.0',
     classifiers=[
         'Development Status :: 5 - Production/Stable',
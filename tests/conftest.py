@@ -0,0 +1,30 @@
+import pytest
+
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+import typing
+
+# Builds the ACC1 account the tests list and write through.
+@pytest.fixture
+def make_account() -> typing.Callable[[CallRail], Account]:
+    def make(api_client: CallRail) -> Account:
+        return Account(api_client=api_client, id='ACC1', name='Account', outbound_recording_enabled=True, hipaa_account=False)
+
+    return make
+
+# Builds the JSON data of a call as the API returns it, with the given fields overriding the defaults.
+@pytest.fixture
+def call() -> typing.Callable[..., typing.Dict[str, typing.Any]]:
+    def make(call_id: str, start_time: str, company_id: str = 'COM1', **fields: typing.Any) -> typing.Dict[str, typing.Any]:
+        json_data: typing.Dict[str, typing.Any] = {
+            'id': call_id,
+            'start_time': start_time,
+            'company_id': company_id,
+            'customer_phone_number': '+13036231131',
+            'duration': 4,
+            'tags': [{'name': 'Lead'}],
+        }
+        json_data.update(fields)
+        return json_data
+
+    return make
@@ -0,0 +1,203 @@
+import pathlib
+import queue
+import pytest_mock
+import requests_mock
+
+from pycallrail.bulk import BulkExecutor, BulkResult, is_transient
+from pycallrail.callrail import CallRail
+from pycallrail.errors import LightValidationError
+from pycallrail.objects.accounts import Account
+from pycallrail.objects.calls import Call
+import requests
+import typing
+
+# Tests that bulk call updates report per-call results and retry transient failures.
+def test_bulk_update_calls(requests_mock: requests_mock.Mocker, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    account = make_account(CallRail(api_key='123'))
+    url = 'https://api.callrail.com/v3/a/ACC1/calls/{}.json'
+    requests_mock.put(url.format('CAL1'), json={'id': 'CAL1', 'lead_status': 'good_lead'})
+    requests_mock.put(url.format('CAL2'), [
+        {'status_code': 429, 'headers': {'Retry-After': '0'}},
+        {'json': {'id': 'CAL2', 'lead_status': 'good_lead'}},
+    ])
+    requests_mock.put(url.format('CAL3'), status_code=404)
+    updates = [
+        ('CAL1', {'lead_status': 'good_lead'}),
+        ('CAL2', {'lead_status': 'good_lead'}),
+        ('CAL3', {'lead_status': 'good_lead'}),
+        ('CAL4', {'duration': 10}),
+    ]
+
+    # Act
+    report = account.bulk_update_calls(iter(updates), concurrency=2)
+
+    # Assert
+    results = {result.key: result for result in report}
+    assert results['CAL1'].ok and results['CAL1'].response['lead_status'] == 'good_lead'
+    assert results['CAL2'].ok and results['CAL2'].attempts == 2
+    assert not results['CAL3'].ok and results['CAL3'].attempts == 1
+    assert isinstance(results['CAL4'].error, LightValidationError)
+    assert requests_mock.last_request.json() == {'lead_status': 'good_lead'}
+    assert report.summary()['succeeded'] == 2
+    assert report.summary()['attempts'] == 5
+
+# Tests that retries stop after max_retries with the last error reported.
+def test_bulk_executor_gives_up() -> None:
+    # Arrange
+    waits: typing.List[float] = []
+    executor = BulkExecutor(max_retries=2, backoff=1, sleep=waits.append)
+
+    def fail() -> None:
+        raise requests.ConnectionError('connection reset')
+
+    # Act
+    report = executor.run([('item', fail)])
+
+    # Assert
+    assert report.failed[0].attempts == 3
+    assert isinstance(report.failed[0].error, requests.ConnectionError)
+    assert len(waits) == 2 and 0.5 <= waits[0] <= 1 and 1 <= waits[1] <= 2
+    assert is_transient(report.failed[0].error)
+
+def submission(name: str) -> typing.Dict[str, typing.Any]:
+    return {
+        'company_id': 'COM1',
+        'referrer': 'google',
+        'referring_url': 'https://www.google.com',
+        'landing_page_url': 'https://www.example.com',
+        'form_url': 'https://www.example.com/contact',
+        'form_data': {'name': name}
+    }
+
+# Tests that duplicates are sent once and a rerun skips the checkpointed submissions.
+def test_bulk_form_submissions_checkpoint(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    account = make_account(CallRail(api_key='123'))
+    checkpoint_path = str(tmp_path / 'checkpoint.jsonl')
+    requests_mock.post('https://api.callrail.com/v3/a/ACC1/form_submissions.json', json={'id': 'FOR1'})
+    requests_mock.put('https://api.callrail.com/v3/a/ACC1/form_submissions/FOR2.json', json={'id': 'FOR2'})
+    items = [submission('Jane'), submission('Jane'), {'id': 'FOR2', 'note': 'called back'}]
+
+    # Act
+    first = account.bulk_form_submissions(items, checkpoint_path=checkpoint_path)
+    second = account.bulk_form_submissions(items + [submission('John')], checkpoint_path=checkpoint_path)
+
+    # Assert
+    assert first.summary()['succeeded'] == 3
+    assert first.summary()['skipped'] == 1
+    assert second.summary()['skipped'] == 3
+    assert len(second.succeeded) == 4
+    assert requests_mock.call_count == 3
+    assert requests_mock.last_request.json()['form_data'] == {'name': 'John'}
+
+# Tests that a duplicate of a failed submission is reported as skipped with the failure.
+def test_bulk_form_submissions_duplicate_of_failure(requests_mock: requests_mock.Mocker, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    account = make_account(CallRail(api_key='123'))
+    requests_mock.post('https://api.callrail.com/v3/a/ACC1/form_submissions.json', status_code=502)
+    results: typing.List[BulkResult] = []
+
+    # Act
+    report = account.bulk_form_submissions([submission('Jane'), submission('Jane')], max_retries=0, on_result=results.append)
+
+    # Assert
+    assert report.summary()['failed'] == 2
+    assert report.summary()['skipped'] == 1
+    assert report.results[1].skipped and report.results[1].error is report.results[0].error
+    assert len(results) == 2
+    assert requests_mock.call_count == 1
+
+# Tests that creates are only retried when the API certainly didn't process them.
+def test_bulk_form_submissions_retries_creates_safely(requests_mock: requests_mock.Mocker, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    account = make_account(CallRail(api_key='123'))
+    requests_mock.post('https://api.callrail.com/v3/a/ACC1/form_submissions.json', [
+        {'status_code': 429, 'headers': {'Retry-After': '0'}},
+        {'status_code': 502},
+        {'json': {'id': 'FOR1'}},
+    ])
+
+    # Act
+    report = account.bulk_form_submissions([submission('Jane')])
+
+    # Assert
+    assert report.failed[0].attempts == 2
+    assert report.failed[0].error.response.status_code == 502 # type: ignore
+    assert requests_mock.call_count == 2
+
+# Tests that submissions are read from a queue until None is put.
+def test_bulk_form_submissions_from_queue(requests_mock: requests_mock.Mocker, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    account = make_account(CallRail(api_key='123'))
+    requests_mock.post('https://api.callrail.com/v3/a/ACC1/form_submissions.json', json={'id': 'FOR1'})
+    source: queue.Queue = queue.Queue()
+    for name in ('Jane', 'John'):
+        source.put(submission(name))
+    source.put({'company_id': 'COM1'})
+    source.put(None)
+
+    # Act
+    report = account.bulk_form_submissions(source)
+
+    # Assert
+    assert len(report.succeeded) == 2
+    assert isinstance(report.failed[0].error, LightValidationError)
+
+# Tests that recordings are archived once and skipped by the next run while their file is intact.
+def test_archive_recordings(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    account = make_account(cr)
+    recording_url = 'https://api.callrail.com/v3/a/ACC1/calls/{}/recording.json'
+    requests_mock.get(recording_url.format('CAL1'), content=b'first')
+    requests_mock.get(recording_url.format('CAL2'), content=b'second')
+    archived_calls = [
+        Call(cr, 'ACC1', id='CAL1', recording=recording_url.format('CAL1')),
+        Call(cr, 'ACC1', id='CAL2', recording=recording_url.format('CAL2')),
+        Call(cr, 'ACC1', id='CAL3', recording=None),
+    ]
+    results: typing.List[typing.Any] = []
+
+    # Act
+    first = account.archive_recordings(archived_calls, str(tmp_path), concurrency=2, on_result=results.append)
+    (tmp_path / 'CAL2.mp3').write_bytes(b'sec')
+    second = account.archive_recordings(archived_calls, str(tmp_path))
+
+    # Assert
+    assert first.summary()['succeeded'] == 3
+    assert first.summary()['skipped'] == 1
+    assert len(results) == 3
+    assert (tmp_path / 'CAL1.mp3').read_bytes() == b'first'
+    assert (tmp_path / 'CAL2.mp3').read_bytes() == b'second'
+    assert second.summary()['skipped'] == 2
+    assert [result.key for result in second if not result.skipped] == ['CAL2']
+    assert requests_mock.call_count == 3
+
+# Tests that calls selected by a filter are listed page by page while their recordings are archived.
+def test_archive_recordings_streams_filtered_calls(
+        requests_mock: requests_mock.Mocker, mocker: pytest_mock.MockerFixture, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]
+) -> None:
+    # Arrange
+    account = make_account(CallRail(api_key='123'))
+    list_calls = mocker.spy(Account, 'list_calls')
+    recording_url = 'https://api.callrail.com/v3/a/ACC1/calls/{}/recording.json'
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/calls.json', json={
+        'calls': [{'id': 'CAL1', 'start_time': '2023-01-01T10:00:00Z', 'recording': recording_url.format('CAL1')}],
+        'has_next_page': True,
+        'next_page': 'https://api.callrail.com/v3/a/ACC1/calls.json?page=2'
+    })
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/calls.json?page=2', json={
+        'calls': [{'id': 'CAL2', 'start_time': '2023-01-01T10:00:00Z', 'recording': recording_url.format('CAL2')}], 'has_next_page': False
+    })
+    requests_mock.get(recording_url.format('CAL1'), content=b'first')
+    requests_mock.get(recording_url.format('CAL2'), content=b'second')
+
+    # Act
+    report = account.archive_recordings({'start_date': '2023-01-01'}, str(tmp_path), concurrency=1)
+
+    # Assert
+    assert report.summary()['succeeded'] == 2
+    list_calls.assert_not_called()
+    assert requests_mock.request_history[0].qs['start_date'] == ['2023-01-01']
+    assert (tmp_path / 'CAL2.mp3').read_bytes() == b'second'
@@ -0,0 +1,130 @@
+import pytest
+import requests
+import requests_mock
+
+from pycallrail.cache import MISS, ResponseCache, resource_of
+from pycallrail.errors import CachedNotFoundError
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+import typing
+
+COMPANY_URL = 'https://api.callrail.com/v3/a/ACC1/companies/COM1.json'
+
+# Tests that urls are mapped to their account and resource.
+def test_resource_of() -> None:
+    # Act & Assert
+    assert resource_of(COMPANY_URL) == ('ACC1', 'companies')
+    assert resource_of('https://api.callrail.com/v3/a/ACC1.json') == ('ACC1', 'accounts')
+    assert resource_of('https://api.callrail.com/v3/a.json') == (None, 'accounts')
+    assert resource_of('https://api.callrail.com/a/ACC1/tags/1.json') == ('ACC1', 'tags')
+
+# Tests that entries expire after the TTL of their resource and count hits and misses.
+def test_cache_ttl() -> None:
+    # Arrange
+    now: typing.List[float] = [0.0]
+    cache = ResponseCache(ttls={'companies': 10}, clock=lambda: now[0])
+    cache.set(COMPANY_URL, None, {'id': 'COM1'})
+
+    # Act
+    fresh = cache.get(COMPANY_URL)
+    now[0] = 11.0
+    expired = cache.get(COMPANY_URL)
+
+    # Assert
+    assert fresh == {'id': 'COM1'}
+    assert expired is MISS
+    assert cache.stats == {'hits': 1, 'negative_hits': 0, 'misses': 1, 'size': 0}
+
+# Tests that the least recently used entry is evicted and callers get copies.
+def test_cache_lru() -> None:
+    # Arrange
+    cache = ResponseCache(max_entries=2)
+    cache.set('https://api.callrail.com/v3/a/ACC1/companies/1.json', None, {'id': '1'})
+    cache.set('https://api.callrail.com/v3/a/ACC1/companies/2.json', None, {'id': '2'})
+    cache.get('https://api.callrail.com/v3/a/ACC1/companies/1.json')['id'] = 'mutated'
+
+    # Act
+    cache.set('https://api.callrail.com/v3/a/ACC1/companies/3.json', None, {'id': '3'})
+
+    # Assert
+    assert cache.get('https://api.callrail.com/v3/a/ACC1/companies/1.json') == {'id': '1'}
+    assert cache.get('https://api.callrail.com/v3/a/ACC1/companies/2.json') is MISS
+    assert len(cache) == 2
+
+# Tests that nested values such as tags lists can't be mutated through a cache hit.
+def test_cache_copies_nested_values() -> None:
+    # Arrange
+    cache = ResponseCache()
+    call_url: str = 'https://api.callrail.com/v3/a/ACC1/calls/CAL1.json'
+    cache.set(call_url, None, {'id': 'CAL1', 'tags': [{'name': 'lead'}]})
+    cache.get(call_url)['tags'].append({'name': 'mutated'})
+
+    # Act
+    cached = cache.get(call_url)
+
+    # Assert
+    assert cached == {'id': 'CAL1', 'tags': [{'name': 'lead'}]}
+
+# Tests that getters are served from the cache until a write invalidates it.
+def test_get_company_cached_and_invalidated(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123', cache=ResponseCache())
+    account = Account(api_client=api_client, id='ACC1', name='Account', outbound_recording_enabled=True, hipaa_account=False)
+    company_json: typing.Dict[str, typing.Any] = {'id': 'COM1', 'name': 'Widgets', 'disabled_at': None}
+    requests_mock.get(COMPANY_URL, json=company_json)
+    requests_mock.put('https://api.callrail.com/a/ACC1/companies/COM1.json', json={})
+
+    # Act
+    first = account.get_company('COM1')
+    second = account.get_company('COM1')
+    second.update(name='Gadgets')
+    third = account.get_company('COM1')
+
+    # Assert
+    assert first.name == 'Widgets'
+    assert second.name == 'Gadgets'
+    assert third.name == 'Widgets'
+    assert [r.method for r in requests_mock.request_history] == ['GET', 'PUT', 'GET']
+    assert api_client.cache.stats['hits'] == 1 # type: ignore
+
+# Tests that a 404 is remembered and raised locally until it expires.
+def test_get_call_not_found_cached(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    now: typing.List[float] = [0.0]
+    api_client = CallRail(api_key='123', cache=ResponseCache(negative_ttl=5, clock=lambda: now[0]))
+    account = Account(api_client=api_client, id='ACC1', name='Account', outbound_recording_enabled=True, hipaa_account=False)
+    url = 'https://api.callrail.com/v3/a/ACC1/calls/CAL1.json'
+    requests_mock.get(url, status_code=404)
+
+    # Act
+    with pytest.raises(requests.HTTPError) as first:
+        account.get_call('CAL1')
+    with pytest.raises(CachedNotFoundError) as second:
+        account.get_call('CAL1')
+    now[0] = 6.0
+    with pytest.raises(requests.HTTPError) as third:
+        account.get_call('CAL1')
+
+    # Assert
+    assert not isinstance(first.value, CachedNotFoundError)
+    assert second.value.response.status_code == 404
+    assert not isinstance(third.value, CachedNotFoundError)
+    assert requests_mock.call_count == 2
+    assert api_client.cache.stats['negative_hits'] == 1 # type: ignore
+
+# Tests that writes to the resource drop remembered 404s.
+def test_not_found_invalidated_by_writes(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123', cache=ResponseCache())
+    account = Account(api_client=api_client, id='ACC1', name='Account', outbound_recording_enabled=True, hipaa_account=False)
+    requests_mock.get(COMPANY_URL, [{'status_code': 404}, {'json': {'id': 'COM1', 'name': 'Widgets', 'disabled_at': None}}])
+    requests_mock.post('https://api.callrail.com/v3/a/ACC1/companies.json', json={'id': 'COM1', 'name': 'Widgets', 'disabled_at': None})
+    with pytest.raises(requests.HTTPError):
+        account.get_company('COM1')
+
+    # Act
+    account.create_company(name='Widgets', time_zone='America/New_York')
+    company = account.get_company('COM1')
+
+    # Assert
+    assert company.name == 'Widgets'
@@ -2,9 +2,11 @@ import pytest
 import pytest_mock
 import requests_mock
 import requests
+import io
 
 from pycallrail.callrail import CallRail
 from pycallrail.objects.calls import Call
+from pycallrail.errors import IncompleteDownloadError
 import typing
 import logging
 import datetime as dt
@@ -451,4 +453,76 @@ def test_deserialize_json_data_to_call_object(mocker: pytest_mock.MockerFixture)
     assert call.call_highlights == [{'start_time': '2022-01-01T00:00:00Z', 'end_time': '2022-01-01T00:01:00Z', 'text': 'highlighted text'}]
     assert call.agent_email == 'johndoe@example.com'
     assert isinstance(call.keypad_entries, dict)
-    assert call.keypad_entries == {'1': 2, '2': 3}
\ No newline at end of file
+    assert call.keypad_entries == {'1': 2, '2': 3}
+
+class FakeRecordingResponse(object):
+    def __init__(self, status_code: int, headers: typing.Dict[str, str], chunks: typing.List[bytes], error: typing.Optional[Exception] = None) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.chunks = chunks
+        self.error = error
+
+    def __enter__(self) -> 'FakeRecordingResponse':
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int) -> typing.Iterator[bytes]:
+        yield from self.chunks
+        if self.error is not None:
+            raise self.error
+
+def make_recorded_call(api_client: CallRail) -> Call:
+    return Call(api_client, 'ACC1', id='CAL1', recording='https://api.callrail.com/v3/a/ACC1/calls/CAL1/recording.json')
+
+# Tests that an interrupted recording download is resumed with a Range request.
+def test_download_recording_resumes(mocker: pytest_mock.MockerFixture, tmp_path: typing.Any) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    get = mocker.patch.object(api_client.session, 'get', side_effect=[
+        FakeRecordingResponse(200, {'Content-Length': '6'}, [b'abc'], requests.exceptions.ChunkedEncodingError()),
+        FakeRecordingResponse(206, {'Content-Range': 'bytes 3-5/6'}, [b'de', b'f']),
+    ])
+    path = tmp_path / 'recording.mp3'
+
+    # Act
+    written = make_recorded_call(api_client).download_recording(str(path), chunk_size=2)
+
+    # Assert
+    assert written == 6
+    assert path.read_bytes() == b'abcdef'
+    assert get.call_args_list[1].kwargs['headers'] == {'Range': 'bytes=3-'}
+    assert get.call_args_list[1].kwargs['stream'] is True
+
+# Tests that a server ignoring the Range header doesn't duplicate bytes in a writable object.
+def test_download_recording_range_ignored(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    mocker.patch.object(api_client.session, 'get', side_effect=[
+        FakeRecordingResponse(200, {'Content-Length': '4'}, [b'ab'], requests.ConnectionError()),
+        FakeRecordingResponse(200, {'Content-Length': '4'}, [b'abcd']),
+    ])
+    buffer = io.BytesIO()
+
+    # Act
+    written = make_recorded_call(api_client).download_recording(buffer)
+
+    # Assert
+    assert written == 4
+    assert buffer.getvalue() == b'abcd'
+
+# Tests that a download still short of the announced length after the retries raises.
+def test_download_recording_incomplete(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    mocker.patch.object(api_client.session, 'get', return_value=FakeRecordingResponse(206, {'Content-Range': 'bytes 0-9/10'}, []))
+    no_recording = Call(api_client, 'ACC1', id='CAL2', recording=None)
+
+    # Act / Assert
+    with pytest.raises(IncompleteDownloadError):
+        make_recorded_call(api_client).download_recording(io.BytesIO(), max_retries=1)
+    assert no_recording.download_recording(io.BytesIO()) is None
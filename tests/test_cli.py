@@ -0,0 +1,134 @@
+import csv
+import gzip
+import json
+import pathlib
+import pytest
+import requests_mock
+
+from pycallrail.cli import _ResumeState, main
+import typing
+
+ACCOUNTS: typing.List[typing.Dict[str, typing.Any]] = [
+    {'id': 'ACC1', 'name': 'One', 'outbound_recording_enabled': True, 'hipaa_account': False},
+    {'id': 'ACC2', 'name': 'Two', 'outbound_recording_enabled': True, 'hipaa_account': False},
+]
+
+def mock_calls(requests_mock: requests_mock.Mocker) -> None:
+    requests_mock.get('https://api.callrail.com/v3/a.json', json={'page': 1, 'total_pages': 1, 'accounts': ACCOUNTS})
+    for account_id in ('ACC1', 'ACC2'):
+        requests_mock.get(f'https://api.callrail.com/v3/a/{account_id}/calls.json', json={
+            'calls': [{'id': f'CAL-{account_id}', 'start_time': '2023-01-01T10:00:00-05:00', 'tags': ['Lead']}],
+            'has_next_page': False
+        })
+
+# Tests that the calls of all accounts are streamed to stdout as NDJSON tagged with the account.
+def test_export_ndjson_stdout(requests_mock: requests_mock.Mocker, capsysbinary: pytest.CaptureFixture) -> None:
+    # Arrange
+    mock_calls(requests_mock)
+
+    # Act
+    exit_code = main(['export', 'calls', '--api-key', '123', '--start-date', '2023-01-01', '--end-date', '2023-01-02'])
+
+    # Assert
+    records = [json.loads(line) for line in capsysbinary.readouterr().out.decode().splitlines()]
+    assert exit_code == 0
+    assert sorted((record['account_id'], record['id']) for record in records) == [('ACC1', 'CAL-ACC1'), ('ACC2', 'CAL-ACC2')]
+    assert requests_mock.request_history[-1].qs['start_date'] == ['2023-01-01']
+
+# Tests that a resumed gzip CSV export skips the finished accounts and appends to the file.
+def test_export_csv_gzip_resume(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path) -> None:
+    # Arrange
+    mock_calls(requests_mock)
+    output = str(tmp_path / 'calls.csv.gz')
+    state = tmp_path / 'state.jsonl'
+    args = ['export', 'calls', '--api-key', '123', '--format', 'csv', '--gzip', '--fields', 'id,tags',
+            '-o', output, '--resume', str(state)]
+    main(args + ['--account', 'ACC1'])
+    requests_mock.reset_mock()
+
+    # Act
+    main(args + ['--account', 'ACC1', '--account', 'ACC2'])
+
+    # Assert
+    with gzip.open(output, 'rt', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert rows == [
+        {'account_id': 'ACC1', 'id': 'CAL-ACC1', 'tags': '["Lead"]'},
+        {'account_id': 'ACC2', 'id': 'CAL-ACC2', 'tags': '["Lead"]'},
+    ]
+    assert [request.path for request in requests_mock.request_history] == ['/v3/a/acc2/calls.json']
+
+# Tests that resources without dates reject a date window.
+def test_export_rejects_dates_for_tags() -> None:
+    # Act / Assert
+    with pytest.raises(SystemExit):
+        main(['export', 'tags', '--api-key', '123', '--start-date', '2023-01-01'])
+
+# Tests that a run interrupted mid-account leaves no partial records, so the resumed gzip output holds every record once.
+def test_export_resume_after_interruption(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path) -> None:
+    # Arrange
+    mock_calls(requests_mock)
+    requests_mock.get('https://api.callrail.com/v3/a/ACC2/calls.json', json={
+        'calls': [{'id': 'CAL-1', 'start_time': '2023-01-01T10:00:00-05:00'}],
+        'has_next_page': True,
+        'next_page': 'https://api.callrail.com/v3/a/ACC2/calls.json?page=2'
+    })
+    second_page = requests_mock.get('https://api.callrail.com/v3/a/ACC2/calls.json?page=2', status_code=500)
+    output = str(tmp_path / 'calls.ndjson.gz')
+    args = ['export', 'calls', '--api-key', '123', '--gzip', '--concurrency', '1', '--account', 'ACC1', '--account', 'ACC2',
+            '-o', output, '--resume', str(tmp_path / 'state.jsonl')]
+    with pytest.raises(Exception):
+        main(args)
+    requests_mock.get(second_page._url, json={
+        'calls': [{'id': 'CAL-2', 'start_time': '2023-01-01T11:00:00-05:00'}], 'has_next_page': False
+    })
+
+    # Act
+    main(args)
+
+    # Assert
+    with gzip.open(output, 'rt') as f:
+        records = [json.loads(line) for line in f]
+    assert [(record['account_id'], record['id']) for record in records] == [
+        ('ACC1', 'CAL-ACC1'), ('ACC2', 'CAL-1'), ('ACC2', 'CAL-2')
+    ]
+
+# Tests that a state file of an export to stdout can't resume an export to a file, which would truncate it.
+def test_export_rejects_resume_with_other_output(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path) -> None:
+    # Arrange
+    mock_calls(requests_mock)
+    state = str(tmp_path / 'state.jsonl')
+    output = tmp_path / 'calls.ndjson'
+    output.write_text('kept\n')
+    main(['export', 'calls', '--api-key', '123', '--account', 'ACC1', '--resume', state])
+
+    # Act / Assert
+    with pytest.raises(SystemExit):
+        main(['export', 'calls', '--api-key', '123', '--account', 'ACC1', '-o', str(output), '--resume', state])
+    assert output.read_text() == 'kept\n'
+
+# Tests that a resume cuts the output at the first unfinished unit and redoes finished units written after it.
+def test_resume_state_cuts_interleaved_units(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    interleaved = _ResumeState(str(tmp_path / 'interleaved.jsonl'), 'calls.ndjson')
+    interleaved.start('ACC1', 0)
+    interleaved.start('ACC2', 10)
+    interleaved.finish('ACC2', 10, 30)
+    interleaved.close()
+    sequential = _ResumeState(str(tmp_path / 'sequential.jsonl'), 'calls.ndjson')
+    sequential.start('ACC1', 0)
+    sequential.finish('ACC1', 0, 20)
+    sequential.start('ACC2', 20)
+    sequential.close()
+
+    # Act
+    interleaved = _ResumeState(str(tmp_path / 'interleaved.jsonl'), 'calls.ndjson')
+    interleaved_offset = interleaved.resume()
+    sequential = _ResumeState(str(tmp_path / 'sequential.jsonl'), 'calls.ndjson')
+    sequential_offset = sequential.resume()
+
+    # Assert
+    assert interleaved_offset == 0
+    assert not interleaved.is_done('ACC1') and not interleaved.is_done('ACC2')
+    assert sequential_offset == 20
+    assert sequential.is_done('ACC1') and not sequential.is_done('ACC2')
@@ -0,0 +1,158 @@
+import datetime as dt
+import pytest
+import pytest_mock
+import requests_mock
+import threading
+import time
+import typing
+
+from pycallrail.callrail import CallRail
+from pycallrail.concurrency import RateLimiter, SingleFlight, fan_out
+
+# Tests that concurrent identical GET requests share one request and get their own copies.
+def test_get_coalesces_identical_requests(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    release = threading.Event()
+
+    def fetch(*args: typing.Any) -> typing.Dict[str, typing.Any]:
+        release.wait(5)
+        return {'id': 'COM1', 'tags': ['a']}
+
+    fetch_mock = mocker.patch.object(cr, '_fetch', side_effect=fetch)
+    results: typing.List[typing.Any] = []
+
+    def get() -> None:
+        results.append(cr._get(endpoint='a/ACC1', path='companies/COM1.json'))
+
+    threads = [threading.Thread(target=get) for _ in range(5)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    # wait until the other four requests joined the first one
+    while sum(flight.waiters for flight in list(cr.single_flight._flights.values())) < 4: # type: ignore
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert fetch_mock.call_count == 1
+    assert results == [{'id': 'COM1', 'tags': ['a']}] * 5
+    assert len({id(result['tags']) for result in results}) == 5
+
+# Tests that waiters get the exception of the shared call and later calls run again.
+def test_single_flight_error_shared() -> None:
+    # Arrange
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    errors: typing.List[BaseException] = []
+
+    def fail() -> None:
+        started.set()
+        release.wait(5)
+        raise ValueError('boom')
+
+    def call() -> None:
+        try:
+            flight.do('key', fail)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=call)
+    waiter.start()
+
+    # Act
+    while flight._flights['key'].waiters < 1:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    waiter.join()
+
+    # Assert
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
+    assert flight.do('key', lambda: 'ok') == 'ok'
+    assert len(flight) == 0
+
+# Tests that the rate limiter allows a burst and then spaces requests at the rate.
+def test_rate_limiter() -> None:
+    # Arrange
+    now: typing.List[float] = [0.0]
+    waits: typing.List[float] = []
+
+    def sleep(seconds: float) -> None:
+        waits.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+
+    # Act
+    for _ in range(4):
+        limiter.acquire()
+
+    # Assert
+    assert waits == [0.5, 0.5]
+
+# Tests that every request of a client with a rate limit waits for the limiter.
+def test_client_rate_limit(mocker: pytest_mock.MockerFixture, requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    cr = CallRail(api_key='123', rate_limit=10)
+    acquire = mocker.patch.object(cr.rate_limiter, 'acquire')
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/companies/COM1.json', json={'id': 'COM1'})
+    requests_mock.put('https://api.callrail.com/v3/a/ACC1/calls/CAL1.json', json={'id': 'CAL1'})
+
+    # Act
+    cr._get(endpoint='a/ACC1', path='companies/COM1.json')
+    cr._put(endpoint='a/ACC1', path='calls/CAL1.json', data={'note': 'note'})
+
+    # Assert
+    assert acquire.call_count == 2
+
+# Tests that fan_out merges producers into one stream and raises a producer's error.
+def test_fan_out() -> None:
+    # Arrange
+    def failing() -> typing.Iterator[int]:
+        yield 1
+        raise ValueError('boom')
+
+    # Act
+    merged = list(fan_out([('a', lambda: iter([1, 2, 3])), ('b', lambda: iter([4, 5]))], max_workers=2, buffer=1))
+
+    # Assert
+    assert sorted(merged) == [('a', 1), ('a', 2), ('a', 3), ('b', 4), ('b', 5)]
+    assert [item for key, item in merged if key == 'a'] == [1, 2, 3]
+    with pytest.raises(ValueError):
+        list(fan_out([('a', failing)]))
+
+# Tests that the calls of every account are streamed page by page, tagged with the account id.
+def test_iter_calls_all_accounts(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    requests_mock.get('https://api.callrail.com/v3/a.json', json={'page': 1, 'total_pages': 1, 'accounts': [
+        {'id': 'ACC1', 'name': 'One', 'outbound_recording_enabled': True, 'hipaa_account': False},
+        {'id': 'ACC2', 'name': 'Two', 'outbound_recording_enabled': True, 'hipaa_account': False},
+    ]})
+
+    def call(call_id: str) -> typing.Dict[str, typing.Any]:
+        return {'id': call_id, 'start_time': '2017-01-24T11:27:48.119-05:00'}
+
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/calls.json', json={
+        'calls': [call('CAL1')], 'has_next_page': True, 'next_page': 'https://api.callrail.com/v3/a/ACC1/calls.json?page=2'
+    })
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/calls.json?page=2', json={'calls': [call('CAL2')], 'has_next_page': False})
+    requests_mock.get('https://api.callrail.com/v3/a/ACC2/calls.json', json={'calls': [call('CAL3')], 'has_next_page': False})
+
+    # Act
+    merged = [(account_id, c.id) for account_id, c in cr.iter_calls_all_accounts(start_date=dt.date(2023, 1, 1), end_date='2023-01-02')]
+
+    # Assert
+    assert sorted(merged) == [('ACC1', 'CAL1'), ('ACC1', 'CAL2'), ('ACC2', 'CAL3')]
+    first_page = [r for r in requests_mock.request_history if r.path == '/v3/a/acc2/calls.json'][0]
+    assert first_page.qs['start_date'] == ['2023-01-01']
+    assert first_page.qs['end_date'] == ['2023-01-02']
@@ -0,0 +1,133 @@
+import pytest
+import pytest_mock
+
+from pycallrail.callrail import CallRail
+import pycallrail.decoders as decoders
+from pycallrail.decoders import compile_decoder, datetime_fields, get_decoder, invalidate_decoder
+from pycallrail.objects.calls import Call
+from pycallrail.objects.companies import Company
+import typing
+import datetime as dt
+
+# Tests that datetime fields are derived from the model annotations.
+def test_datetime_fields_from_annotations() -> None:
+    # Act
+    call_fields = datetime_fields(Call)
+    company_fields = datetime_fields(Company)
+
+    # Assert
+    assert call_fields == ('start_time',)
+    assert set(company_fields) == {'created_at', 'disabled_at'}
+
+# Tests that the generated decoder populates the object and converts datetimes.
+def test_decoder_populates_object(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+    json_data: typing.Dict[str, typing.Any] = {
+        'id': 'CAL8154748ae6bd4e278a7cddd38a662f4f',
+        'duration': 4,
+        'start_time': '2017-01-24T11:27:48.119-05:00',
+        'created_at': '2017-01-24T11:27:48.119-05:00'
+    }
+
+    # Act
+    call = Call.from_json(api_client, '123', json_data)
+
+    # Assert
+    assert call.id == json_data['id']
+    assert call.account_id == '123'
+    assert call.api_client == api_client
+    assert isinstance(call.start_time, dt.datetime)
+    assert call.start_time.utcoffset() == dt.timedelta(hours=-5)
+    # created_at is annotated as a string on calls and is left untouched
+    assert call.created_at == json_data['created_at']
+    # the input is not mutated
+    assert json_data['start_time'] == '2017-01-24T11:27:48.119-05:00'
+
+# Tests that unknown keys and missing required keys are rejected.
+def test_decoder_validation(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+
+    # Act & Assert
+    with pytest.raises(AttributeError):
+        Call.from_json(api_client, '123', {'start_time': '2017-01-24T11:27:48.119-05:00', 'invalid': True})
+    with pytest.raises(KeyError):
+        Call.from_json(api_client, '123', {'id': '1'})
+
+# Tests that empty datetime strings decode to None.
+def test_decoder_empty_datetime(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+
+    # Act
+    company = Company.from_json(api_client, '123', {'id': 'COM1', 'disabled_at': '', 'created_at': None})
+
+    # Assert
+    assert company.disabled_at is None
+    assert company.created_at is None
+
+# Tests that decoders are cached per class and regenerated once invalidated after fields are added.
+def test_decoder_cache_regenerates() -> None:
+    # Arrange
+    class Model(object):
+        id: str
+        REQUIRED_FIELDS = ('id',)
+
+    decoder = get_decoder(Model)
+
+    # Act
+    cached = get_decoder(Model)
+    Model.__annotations__['created_at'] = dt.datetime
+    stale = get_decoder(Model)
+    invalidate_decoder(Model)
+    regenerated = get_decoder(Model)
+
+    obj = Model()
+    regenerated(obj, {'id': '1', 'created_at': '2022-01-01T00:00:00+00:00'})
+
+    # Assert
+    assert cached is decoder
+    assert stale is decoder
+    assert regenerated is not decoder
+    assert obj.created_at == dt.datetime(2022, 1, 1, tzinfo=dt.timezone.utc)
+    assert 'created_at' in compile_decoder(Model).__source__
+
+# Tests that an invalidated decoder is regenerated after a field's type was replaced in place.
+def test_decoder_cache_regenerates_changed_type() -> None:
+    # Arrange
+    class Model(object):
+        id: str
+        created_at: str
+        REQUIRED_FIELDS = ('id',)
+
+    decoder = get_decoder(Model)
+
+    # Act
+    Model.__annotations__['created_at'] = dt.datetime
+    invalidate_decoder(Model)
+    regenerated = get_decoder(Model)
+
+    obj = Model()
+    regenerated(obj, {'id': '1', 'created_at': '2022-01-01T00:00:00+00:00'})
+
+    # Assert
+    assert regenerated is not decoder
+    assert obj.created_at == dt.datetime(2022, 1, 1, tzinfo=dt.timezone.utc)
+
+# Tests that a page of records is decoded with a single decoder lookup.
+def test_decoder_page_single_lookup(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+    records: typing.List[typing.Dict[str, typing.Any]] = [
+        {'id': f'CAL{i}', 'start_time': '2017-01-24T11:27:48.119-05:00'} for i in range(3)
+    ]
+    lookup = mocker.spy(decoders, 'get_decoder')
+
+    # Act
+    page = Call.from_json_page(api_client, '123', records)
+
+    # Assert
+    assert lookup.call_count == 1
+    assert [call.id for call in page] == ['CAL0', 'CAL1', 'CAL2']
+    assert all(isinstance(call.start_time, dt.datetime) for call in page)
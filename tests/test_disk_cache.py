@@ -0,0 +1,96 @@
+import pathlib
+import requests_mock
+
+from pycallrail.callrail import CallRail
+from pycallrail.disk_cache import DiskCache
+import typing
+
+CALLS_URL = 'https://api.callrail.com/v3/a/ACC1/calls.json'
+
+# Tests that a rerun reads the pages of both paginators from disk.
+def test_rerun_served_from_disk(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = str(tmp_path / 'cache.sqlite')
+    requests_mock.get(CALLS_URL, [
+        {'json': {'page': 1, 'total_pages': 2, 'calls': [{'id': 'CAL1'}]}},
+        {'json': {'page': 2, 'total_pages': 2, 'calls': [{'id': 'CAL2'}]}},
+    ])
+    first_run = CallRail(api_key='123', disk_cache=DiskCache(path))
+    expected = first_run._get(endpoint='a/ACC1', path='calls.json', response_data_key='calls', params={'per_page': 1})
+
+    second_run = CallRail(api_key='123', disk_cache=DiskCache(path))
+
+    # Act
+    result = second_run._get(endpoint='a/ACC1', path='calls.json', response_data_key='calls', params={'per_page': 1})
+
+    # Assert
+    assert result == expected == [{'id': 'CAL1'}, {'id': 'CAL2'}]
+    assert requests_mock.call_count == 2
+    assert second_run.disk_cache.stats['hits'] == 2 # type: ignore
+
+# Tests that pages expire after max_age and the least recently used pages are evicted beyond max_bytes.
+def test_age_and_size_eviction(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    now: typing.List[float] = [0.0]
+    cache = DiskCache(str(tmp_path / 'cache.sqlite'), max_age=60, clock=lambda: now[0])
+    cache.set(CALLS_URL, {'page': 1}, {'calls': [{'id': 'CAL1'}]})
+    now[0] = 30.0
+    cache.set(CALLS_URL, {'page': 2}, {'calls': [{'id': 'CAL2'}]})
+
+    # Act
+    now[0] = 61.0
+    expired = cache.get(CALLS_URL, {'page': 1})
+    fresh = cache.get(CALLS_URL, {'page': 2})
+
+    cache.max_bytes = cache.stats['bytes']
+    now[0] = 62.0
+    cache.set(CALLS_URL, {'page': 3}, {'calls': [{'id': 'CAL3'}]})
+
+    # Assert
+    assert expired is None
+    assert fresh == {'calls': [{'id': 'CAL2'}]}
+    assert cache.get(CALLS_URL, {'page': 2}) is None
+    assert cache.get(CALLS_URL, {'page': 3}) == {'calls': [{'id': 'CAL3'}]}
+
+# Tests that writes through the client drop the cached pages of the resource.
+def test_invalidated_by_writes(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    cr = CallRail(api_key='123', disk_cache=DiskCache(str(tmp_path / 'cache.sqlite')))
+    cr.disk_cache.set(CALLS_URL, None, {'calls': []}) # type: ignore
+    cr.disk_cache.set('https://api.callrail.com/v3/a/ACC1/tags.json', None, {'tags': []}) # type: ignore
+
+    # Act
+    cr._invalidate_cache('ACC1', 'calls')
+
+    # Assert
+    assert cr.disk_cache.get(CALLS_URL) is None # type: ignore
+    assert len(cr.disk_cache) == 1 # type: ignore
+
+# Tests that the running size total follows inserts, replacements and deletes and survives reopening.
+def test_running_size_total(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = str(tmp_path / 'cache.sqlite')
+    cache = DiskCache(path)
+
+    def stored_bytes() -> int:
+        return cache._connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    # Act
+    cache.set(CALLS_URL, {'page': 1}, {'calls': [{'id': 'CAL1'}]})
+    cache.set(CALLS_URL, {'page': 2}, {'calls': [{'id': 'CAL2'}]})
+    after_insert = cache.stats['bytes']
+    cache.set(CALLS_URL, {'page': 1}, {'calls': [{'id': f'CAL{i}'} for i in range(50)]})
+    after_replace = cache.stats['bytes']
+    replaced_stored = stored_bytes()
+    cache.invalidate('ACC1', 'calls')
+    after_delete = cache.stats['bytes']
+    cache.set(CALLS_URL, {'page': 1}, {'calls': [{'id': 'CAL1'}]})
+    cache.close()
+    reopened = DiskCache(path)
+
+    # Assert
+    assert after_insert > 0
+    assert after_replace == replaced_stored
+    assert after_replace > after_insert
+    assert after_delete == 0
+    assert reopened.stats['bytes'] == reopened._total() > 0
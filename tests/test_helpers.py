@@ -1,7 +1,7 @@
 import pytest
 import pytest_mock
 import typing
-from pycallrail.helpers import build_url
+from pycallrail.helpers import build_url, normalize_url
 
 # Tests that the function returns a valid URL string when base_url and endpoint are valid strings. 
 def test_happy_path_build_url() -> None:
@@ -84,4 +84,13 @@ def test_general_behavior_special_characters() -> None:
     actual_url: str = build_url(base_url, endpoint, path)
 
     # Assert
-    assert actual_url == expected_url
\ No newline at end of file
+    assert actual_url == expected_url
+
+# Tests that query parameters in the url and given separately normalize to the same url.
+def test_normalize_url() -> None:
+    # Act
+    separate: str = normalize_url('https://API.callrail.com/v3/a.json?page=2', {'per_page': 10, 'fields': None})
+    inline: str = normalize_url('https://api.callrail.com/v3/a.json?per_page=10&page=2')
+
+    # Assert
+    assert separate == inline == 'https://api.callrail.com/v3/a.json?page=2&per_page=10'
@@ -0,0 +1,64 @@
+import pathlib
+import requests_mock
+
+from pycallrail.callrail import CallRail
+from pycallrail.http_cache import ConditionalCache, DiskStorage, MemoryStorage
+import typing
+
+TAGS_URL = 'https://api.callrail.com/v3/a/ACC1/tags.json'
+
+TAGS_PAGE: typing.Dict[str, typing.Any] = {
+    'tags': [{'id': 1, 'name': 'Existing Customer'}],
+    'has_next_page': False
+}
+
+# Tests that a 304 response is answered from the stored body.
+def test_not_modified_served_from_cache(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    http_cache = ConditionalCache()
+    cr = CallRail(api_key='123', http_cache=http_cache)
+    requests_mock.get(TAGS_URL, [
+        {'json': TAGS_PAGE, 'headers': {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}},
+        {'status_code': 304},
+    ])
+
+    # Act
+    first = cr._get(endpoint='a/ACC1', path='tags.json', response_data_key='tags', pagination_type='RELATIVE')
+    first[0]['name'] = 'mutated'
+    second = cr._get(endpoint='a/ACC1', path='tags.json', response_data_key='tags', pagination_type='RELATIVE')
+
+    # Assert
+    assert second == TAGS_PAGE['tags']
+    assert 'If-None-Match' not in requests_mock.request_history[0].headers
+    assert requests_mock.request_history[1].headers['If-None-Match'] == '"v1"'
+    assert requests_mock.request_history[1].headers['If-Modified-Since'] == 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert http_cache.stats == {'revalidated': 1, 'misses': 1}
+
+# Tests that responses without validators are not stored.
+def test_response_without_validators_not_stored(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    storage = MemoryStorage()
+    cr = CallRail(api_key='123', http_cache=ConditionalCache(storage))
+    requests_mock.get(TAGS_URL, json=TAGS_PAGE)
+
+    # Act
+    cr._get(endpoint='a/ACC1', path='tags.json', response_data_key='tags', pagination_type='RELATIVE')
+    cr._get(endpoint='a/ACC1', path='tags.json', response_data_key='tags', pagination_type='RELATIVE')
+
+    # Assert
+    assert len(storage) == 0
+    assert 'If-None-Match' not in requests_mock.last_request.headers
+
+# Tests that the disk storage keeps validators across cache instances.
+def test_disk_storage(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    ConditionalCache(DiskStorage(str(tmp_path))).store(TAGS_URL, {'page': 2}, {'ETag': '"v2"'}, TAGS_PAGE)
+    http_cache = ConditionalCache(DiskStorage(str(tmp_path)))
+
+    # Act
+    headers = http_cache.request_headers(TAGS_URL + '?page=2')
+    body = http_cache.not_modified(TAGS_URL, {'page': '2'})
+
+    # Assert
+    assert headers == {'If-None-Match': '"v2"'}
+    assert body == TAGS_PAGE
@@ -0,0 +1,123 @@
+import pytest
+import pytest_mock
+import requests_mock
+
+import gc
+from pycallrail.callrail import CallRail
+from pycallrail.identity import IdentityMap
+from pycallrail.objects.accounts import Account
+from pycallrail.objects.calls import Call
+from pycallrail.objects.tags import Tag
+import typing
+
+def call_json(**kwargs: typing.Any) -> typing.Dict[str, typing.Any]:
+    data: typing.Dict[str, typing.Any] = {
+        "id": "CAL8154748ae6bd4e278a7cddd38a662f4f",
+        "duration": 4,
+        "start_time": "2017-01-24T11:27:48.119-05:00"
+    }
+    data.update(kwargs)
+    return data
+
+# Tests that the identity map is disabled by default.
+def test_identity_map_disabled_by_default() -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+
+    # Act
+    call_1 = Call.from_json(api_client, '123', call_json())
+    call_2 = Call.from_json(api_client, '123', call_json())
+
+    # Assert
+    assert api_client.identity_map is None
+    assert call_1 is not call_2
+
+# Tests that the same call resolves to one instance that is refreshed in place.
+def test_identity_map_reuses_and_refreshes_instances(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = CallRail('test_key', identity_map=True)
+    account = Account(api_client, '123', 'test_name', True, False)
+    mocker.patch.object(api_client, '_get', return_value=[call_json(note='new note')])
+
+    # Act
+    call = Call.from_json(api_client, '123', call_json())
+    listed = typing.cast(typing.List[Call], account.list_calls())
+
+    # Assert
+    assert listed[0] is call
+    assert call.note == 'new note'
+    assert len(typing.cast(IdentityMap, api_client.identity_map)) == 1
+
+# Tests that the account is part of the identity.
+def test_identity_map_keyed_by_account() -> None:
+    # Arrange
+    api_client = CallRail('test_key', identity_map=True)
+
+    # Act
+    call_1 = Call.from_json(api_client, '123', call_json())
+    call_2 = Call.from_json(api_client, '456', call_json())
+
+    # Assert
+    assert call_1 is not call_2
+
+# Tests that instances are not kept alive by the identity map.
+def test_identity_map_is_weak() -> None:
+    # Arrange
+    api_client = CallRail('test_key', identity_map=True)
+    identity_map = typing.cast(IdentityMap, api_client.identity_map)
+
+    # Act
+    call = Call.from_json(api_client, '123', call_json())
+    del call
+    gc.collect()
+
+    # Assert
+    assert len(identity_map) == 0
+
+# Tests that deleted tags are dropped from the identity map.
+def test_identity_map_discards_deleted_tags(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = CallRail('test_key', identity_map=True)
+    mocker.patch.object(api_client, '_delete', return_value=None)
+    tag = Tag.from_json(api_client, '123', {
+        "id": 1234569,
+        "name": "Existing Customer",
+        "tag_level": "company",
+        "color": "gray1",
+        "background_color": "gray1",
+        "company_id": "COM8154748ae6bd4e278a7cddd38a662f4f",
+        "status": "enabled",
+        "created_at": "2014-06-06T12:11:02.964-04:00"
+    })
+
+    # Act
+    assert tag in typing.cast(IdentityMap, api_client.identity_map)
+    tag.delete()
+
+    # Assert
+    assert tag not in typing.cast(IdentityMap, api_client.identity_map)
+
+# Tests that refetching an instance keeps its unsaved edits and refreshes the other fields.
+def test_identity_map_keeps_unsaved_changes(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    api_client = CallRail('test_key', identity_map=True)
+    account = Account(api_client, '123', 'test_name', True, False)
+    requests_mock.get(
+        'https://api.callrail.com/v3/a/123/calls/CAL1.json',
+        [
+            {'json': call_json(id='CAL1', note='server', value='1')},
+            {'json': call_json(id='CAL1', note='server', value='2')},
+        ]
+    )
+
+    # Act
+    call = account.get_call('CAL1')
+    call.note = 'mine'
+    refetched = account.get_call('CAL1')
+
+    # Assert
+    assert refetched is call
+    assert call.note == 'mine'
+    assert call.value == '2'
+    assert call.is_dirty
+    assert call.changed_fields() == {'note': 'mine'}
@@ -0,0 +1,81 @@
+import pytest
+
+import json
+from pycallrail.callrail import CallRail
+from pycallrail.interning import InternTable
+from pycallrail.objects.calls import Call
+from pycallrail.objects.textmessages import TextMessageConversation
+import typing
+
+def decoded_calls(api_client: CallRail) -> typing.List[Call]:
+    # strings decoded from separate JSON documents are distinct objects
+    return [
+        Call.from_json(api_client, '123', json.loads(json.dumps({
+            'id': f'CAL{i}',
+            'start_time': '2017-01-24T11:27:48.119-05:00',
+            'company_id': 'COM8154748ae6bd4e278a7cddd38a662f4f',
+            'customer_name': 'James Smith'
+        }))) for i in range(2)
+    ]
+
+# Tests that interned fields share a single string between objects.
+def test_interned_fields_are_shared() -> None:
+    # Arrange
+    api_client = CallRail('test_key', intern_strings=True)
+
+    # Act
+    call_1, call_2 = decoded_calls(api_client)
+
+    # Assert
+    assert call_1.company_id == 'COM8154748ae6bd4e278a7cddd38a662f4f'
+    assert call_1.company_id is call_2.company_id
+    # high-cardinality fields are left alone
+    assert call_1.customer_name is not call_2.customer_name
+    assert 'COM8154748ae6bd4e278a7cddd38a662f4f' in typing.cast(InternTable, api_client.intern_table)
+
+# Tests that interning is disabled by default.
+def test_interning_disabled_by_default() -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+
+    # Act
+    call_1, call_2 = decoded_calls(api_client)
+
+    # Assert
+    assert api_client.intern_table is None
+    assert call_1.company_id is not call_2.company_id
+
+# Tests that the intern table stops growing once full.
+def test_intern_table_is_bounded() -> None:
+    # Arrange
+    intern_table = InternTable(max_size=2)
+    value = ''.join(['c', 'c'])
+
+    # Act
+    intern_table.intern('a')
+    intern_table.intern('b')
+    result = intern_table.intern(value)
+
+    # Assert
+    assert len(intern_table) == 2
+    assert result is value
+    assert 'cc' not in intern_table
+
+# Tests that text message conversations and their messages are interned.
+def test_conversations_are_interned() -> None:
+    # Arrange
+    api_client = CallRail('test_key', intern_strings=True)
+    data = json.dumps({
+        'id': 'KZaGR',
+        'state': 'active',
+        'last_message_at': '2022-01-01T00:00:00Z',
+        'recent_messages': [{'direction': 'incoming', 'content': 'Hello', 'created_at': '2022-01-01T00:00:00Z'}]
+    })
+
+    # Act
+    conversation_1 = TextMessageConversation.from_json(api_client, '123', json.loads(data))
+    conversation_2 = TextMessageConversation.from_json(api_client, '123', json.loads(data))
+
+    # Assert
+    assert conversation_1.state is conversation_2.state
+    assert conversation_1.recent_messages[0].direction is conversation_2.recent_messages[0].direction
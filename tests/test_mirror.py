@@ -0,0 +1,64 @@
+import pathlib
+import requests_mock
+
+from pycallrail.callrail import CallRail
+from pycallrail.mirror import Mirror
+from pycallrail.objects.accounts import Account
+from pycallrail.objects.calls import Call
+from pycallrail.objects.textmessages import TextMessageConversation
+import datetime as dt
+import typing
+
+# Tests that mirrored pages are queried by company, time and phone number and returned as models.
+def test_mirror_query(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account], call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/calls.json', json={
+        'calls': [
+            call('CAL1', '2023-01-01T10:00:00-05:00'),
+            call('CAL2', '2023-01-02T10:00:00-05:00', company_id='COM2'),
+            call('CAL3', '2023-01-03T10:00:00-05:00', customer_phone_number='+13030000000'),
+        ],
+        'has_next_page': False
+    })
+    mirror = Mirror(cr, str(tmp_path / 'mirror.db'))
+
+    # Act
+    written = mirror.mirror(make_account(cr), 'calls')
+    company_calls = mirror.query('calls', company_id='COM1')
+    windowed = mirror.query('calls', account_id='ACC1', start=dt.date(2023, 1, 2), end='2023-01-03T00:00:00Z')
+    by_phone = mirror.query('calls', phone_number='+13030000000', newest_first=True, limit=1)
+
+    # Assert
+    assert written == 3
+    assert [c.id for c in company_calls] == ['CAL1', 'CAL3']
+    assert [c.id for c in windowed] == ['CAL2']
+    assert isinstance(by_phone[0], Call) and by_phone[0].id == 'CAL3'
+    assert by_phone[0].api_client is cr
+    assert requests_mock.call_count == 1
+
+# Tests that upserted models replace their earlier version and round trip through to_json.
+def test_mirror_upsert_models(tmp_path: pathlib.Path, call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    mirror = Mirror(cr, str(tmp_path / 'mirror.db'))
+    first = Call.from_json(cr, 'ACC1', dict(call('CAL1', '2023-01-01T10:00:00-05:00'), note='first'))
+    second = Call.from_json(cr, 'ACC1', dict(call('CAL1', '2023-01-01T10:00:00-05:00'), note='second'))
+    conversation = TextMessageConversation.from_json(cr, 'ACC1', {
+        'id': 'SMS1', 'company_id': 'COM1', 'customer_phone_number': '+13036231131',
+        'last_message_at': '2023-01-01T10:00:00-05:00',
+        'recent_messages': [{'direction': 'incoming', 'content': 'Hi', 'created_at': '2023-01-01T10:00:00-05:00'}]
+    })
+
+    # Act
+    mirror.upsert([first, conversation])
+    mirror.upsert([second])
+
+    # Assert
+    assert mirror.count('calls') == 1
+    assert mirror.get('calls', 'CAL1').note == 'second' # type: ignore
+    assert mirror.get('calls', 'CAL1').start_time == first.start_time # type: ignore
+    assert mirror.get('text-messages', 'SMS1').recent_messages[0].content == 'Hi' # type: ignore
+    assert [m.content for m in mirror.text_messages('SMS1')] == ['Hi']
+    assert mirror.delete('calls', 'CAL1')
+    assert mirror.get('calls', 'CAL1') is None
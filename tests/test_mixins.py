@@ -0,0 +1,124 @@
+import pytest
+import pytest_mock
+import requests_mock
+
+import pycallrail.mixins as mixins
+from pycallrail.callrail import CallRail
+from pycallrail.objects.calls import Call
+from pycallrail.objects.companies import Company
+import pickle
+import typing
+
+def call_json() -> typing.Dict[str, typing.Any]:
+    return {
+        "id": "CAL8154748ae6bd4e278a7cddd38a662f4f",
+        "duration": 4,
+        "start_time": "2017-01-24T11:27:48.119-05:00",
+        "note": "Initial note",
+        "tags": ["Existing"]
+    }
+
+# Tests that a freshly loaded object has no changes.
+def test_loaded_object_is_clean(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+
+    # Act
+    call = Call.from_json(api_client, '123', call_json())
+
+    # Assert
+    assert call.is_dirty is False
+    assert call.changed_fields() == {}
+
+# Tests that direct attribute changes and in place mutations are tracked.
+def test_changes_are_tracked(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+    call = Call.from_json(api_client, '123', call_json())
+
+    # Act
+    call.lead_status = 'good_lead'
+    call.tags.append('New Client')
+    call.duration = 10 # not updatable, ignored
+
+    # Assert
+    assert call.changed_fields() == {'lead_status': 'good_lead', 'tags': ['Existing', 'New Client']}
+
+# Tests that save sends only the changed fields and skips the request when nothing changed.
+def test_save_sends_minimal_body(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    call = Call.from_json(api_client, '123', call_json())
+    url = f'https://api.callrail.com/v3/a/123/calls/{call.id}.json'
+    requests_mock.put(url, json=dict(call_json(), lead_status='good_lead'))
+
+    # Act
+    sent_without_changes = call.save()
+    call.lead_status = 'good_lead'
+    sent = call.save()
+
+    # Assert
+    assert sent_without_changes is False
+    assert sent is True
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request.json() == {'lead_status': 'good_lead'}
+    assert call.is_dirty is False
+
+# Tests that update only sends the given fields and appended tags.
+def test_update_sends_only_changes(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    call = Call.from_json(api_client, '123', call_json())
+    url = f'https://api.callrail.com/v3/a/123/calls/{call.id}.json'
+    requests_mock.put(url, json=dict(call_json(), tags=['Existing', 'New Client']))
+
+    # Act
+    call.update(note='Initial note')
+    call.update(tags=['New Client'], append_tags=True)
+
+    # Assert
+    assert requests_mock.call_count == 1
+    assert requests_mock.last_request.json() == {'tags': ['New Client'], 'append_tags': True}
+    assert call.tags == ['Existing', 'New Client']
+
+# Tests that a company update with unchanged values sends no request.
+def test_company_update_without_changes(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+    company = Company(api_client, '123', id='COM1', name='Widget Shop', time_zone='America/New_York')
+
+    # Act
+    company.update(name='Widget Shop')
+    company.update(name='Widget Shop 2')
+
+    # Assert
+    api_client._put.assert_called_once_with(
+        endpoint='/a/123',
+        path='/companies/COM1.json',
+        data={'name': 'Widget Shop 2'}
+    )
+
+# Tests that the loaded state is left out of pickles and rebuilt on restore.
+def test_pickle_rebuilds_loaded_state(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = mocker.Mock(spec=CallRail)
+    call = Call.from_json(api_client, '123', call_json())
+
+    # Act
+    state = call.__getstate__()
+    restored = pickle.loads(pickle.dumps(call))
+    restored.note = 'Changed note'
+
+    # Assert
+    assert '_loaded' not in state
+    assert restored.changed_fields() == {'note': 'Changed note'}
+
+# Tests that a model without _send_update cannot be instantiated.
+def test_send_update_is_abstract() -> None:
+    # Arrange
+    class Model(mixins.DirtyTrackingMixin):
+        UPDATABLE_FIELDS = ('note',)
+
+    # Act & Assert
+    with pytest.raises(TypeError):
+        Model()
@@ -0,0 +1,103 @@
+import pathlib
+import pytest
+import requests_mock
+
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+from pycallrail.objects.calls import Call
+import datetime as dt
+import typing
+
+pyarrow = pytest.importorskip('pyarrow')
+import pyarrow.parquet as pq
+from pycallrail.parquet import ParquetExporter, export_parquet, schema_for
+
+# Tests that the schema is derived from the model annotations.
+def test_schema_for_call() -> None:
+    # Act
+    schema = schema_for(Call)
+
+    # Assert
+    assert schema.field('duration').type == pyarrow.int64()
+    assert schema.field('answered').type == pyarrow.bool_()
+    assert schema.field('start_time').type == pyarrow.timestamp('us', tz='UTC')
+    assert schema.field('business_phone_number').type == pyarrow.string()
+    assert schema.field('tags').type == pyarrow.string()
+    with pytest.raises(ValueError):
+        schema_for(Call, fields=['missing'])
+
+# Tests that records are written in row groups of the configured size.
+def test_exporter_row_groups(tmp_path: pathlib.Path, call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    exporter = ParquetExporter('calls', str(tmp_path), row_group_size=2, fields=['id', 'start_time', 'tags'])
+
+    # Act
+    with exporter:
+        exporter.write([call(f'CAL{i}', '2023-01-01T10:00:00-05:00', 'COM1') for i in range(5)])
+
+    # Assert
+    parquet_file = pq.ParquetFile(str(tmp_path / 'part-0.parquet'))
+    assert parquet_file.metadata.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.column('id').to_pylist() == ['CAL0', 'CAL1', 'CAL2', 'CAL3', 'CAL4']
+    assert table.column('tags')[0].as_py() == '[{"name":"Lead"}]'
+    assert table.column('start_time')[0].as_py() == dt.datetime(2023, 1, 1, 15, tzinfo=dt.timezone.utc)
+
+# Tests that an export streams the pages into date and company partitions.
+def test_export_parquet_partitioned(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    account = Account(api_client=cr, id='ACC1', name='Account', outbound_recording_enabled=True, hipaa_account=False)
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/calls.json', json={
+        'calls': [
+            call('CAL1', '2023-01-01T10:00:00-05:00', 'COM1'),
+            call('CAL2', '2023-01-01T20:00:00-05:00', 'COM1'),
+            call('CAL3', '2023-01-01T10:00:00-05:00', 'COM2'),
+        ],
+        'has_next_page': False
+    })
+
+    # Act
+    stats = export_parquet(account, 'calls', str(tmp_path), partition_by=['date', 'company_id'])
+
+    # Assert
+    assert stats == {'rows': 3, 'row_groups': 3, 'files': 3}
+    assert pq.read_table(str(tmp_path / 'date=2023-01-02' / 'company_id=COM1' / 'part-0.parquet')).column('id').to_pylist() == ['CAL2']
+    assert pq.read_table(str(tmp_path / 'date=2023-01-01' / 'company_id=COM2' / 'part-0.parquet')).num_rows == 1
+
+# Tests that values not matching their annotation are cast to the column type, or left out if they can't be.
+def test_exporter_casts_mistyped_values(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    exporter = ParquetExporter('calls', str(tmp_path), fields=['id', 'value', 'duration', 'answered', 'start_time'])
+    record: typing.Dict[str, typing.Any] = {
+        'id': 'CAL1', 'value': 100, 'duration': '4', 'answered': 'yes', 'start_time': '2023-01-01T10:00:00Z'
+    }
+
+    # Act
+    with exporter:
+        exporter.write([record])
+
+    # Assert
+    rows = pq.read_table(str(tmp_path / 'part-0.parquet')).to_pylist()
+    assert rows[0]['value'] == '100'
+    assert rows[0]['duration'] == 4
+    assert rows[0]['answered'] is None
+
+# Tests that many partitions never keep more than max_open_files open and reopened partitions write new parts.
+def test_exporter_caps_open_files(tmp_path: pathlib.Path, call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    exporter = ParquetExporter('calls', str(tmp_path), row_group_size=1, partition_by=['company_id'],
+                               fields=['id', 'start_time', 'company_id'], max_open_files=3)
+    open_files: typing.List[int] = []
+
+    # Act
+    with exporter:
+        for i in range(20):
+            exporter.write([call(f'CAL{i}', '2023-01-01T10:00:00-05:00', f'COM{i % 10}')])
+            open_files.append(len(exporter._writers))
+
+    # Assert
+    assert max(open_files) == 3
+    assert exporter.files == 20
+    assert sorted(path.name for path in (tmp_path / 'company_id=COM0').iterdir()) == ['part-0.parquet', 'part-1.parquet']
+    assert sorted(pq.read_table(str(tmp_path / 'company_id=COM0')).column('id').to_pylist()) == ['CAL0', 'CAL10']
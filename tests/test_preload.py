@@ -0,0 +1,123 @@
+import json
+import pathlib
+import time
+import requests_mock
+
+from pycallrail.cache import ResponseCache
+from pycallrail.callrail import CallRail
+import typing
+
+ACCOUNT: typing.Dict[str, typing.Any] = {
+    'id': 'ACC1',
+    'name': 'Account',
+    'outbound_recording_enabled': True,
+    'hipaa_account': False
+}
+
+def mock_reference_data(requests_mock: requests_mock.Mocker) -> None:
+    requests_mock.get('https://api.callrail.com/v3/a.json', json={'page': 1, 'total_pages': 1, 'accounts': [ACCOUNT]})
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/companies.json', json={
+        'companies': [{'id': 'COM1', 'name': 'Widgets', 'disabled_at': None}],
+        'has_next_page': False
+    })
+    requests_mock.get('https://api.callrail.com/v3/a/ACC1/tags.json', json={
+        'tags': [{
+            'id': 1,
+            'name': 'Existing Customer',
+            'tag_level': 'company',
+            'color': 'gray1',
+            'background_color': 'gray1',
+            'company_id': 'COM1',
+            'status': 'enabled',
+            'created_at': '2017-01-24T11:27:48.119-05:00'
+        }],
+        'has_next_page': False
+    })
+
+# Tests that preloaded reference data is served without requests.
+def test_preload_serves_from_cache(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    mock_reference_data(requests_mock)
+    cr = CallRail(api_key='123')
+    cr.preload()
+    requests_made: int = requests_mock.call_count
+
+    # Act
+    account = cr.list_accounts()[0]
+    same_account = cr.get_account('ACC1')
+    companies = account.list_companies()
+    company = account.get_company('COM1')
+    tags = account.list_tags()
+
+    # Assert
+    assert requests_made == 3
+    assert requests_mock.call_count == requests_made
+    assert same_account.name == account.name == 'Account'
+    assert companies[0].name == company.name == 'Widgets' # type: ignore
+    assert tags[0].name == 'Existing Customer' # type: ignore
+
+# Tests that the next start restores the snapshot instead of going to the API.
+def test_preload_snapshot_restore(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path) -> None:
+    # Arrange
+    mock_reference_data(requests_mock)
+    snapshot_path = str(tmp_path / 'preload.json')
+    CallRail(api_key='123').preload(snapshot_path=snapshot_path)
+    requests_mock.reset_mock()
+
+    # Act
+    cr = CallRail(api_key='123')
+    cr.preload(snapshot_path=snapshot_path)
+    companies = cr.list_accounts()[0].list_companies()
+
+    # Assert
+    assert requests_mock.call_count == 0
+    assert companies[0].id == 'COM1' # type: ignore
+
+# Tests that the background refresh replaces the cached data and stops cleanly.
+def test_preload_background_refresh(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    mock_reference_data(requests_mock)
+    cr = CallRail(api_key='123')
+    preloader = cr.preload(refresh_interval=0.01)
+    refreshed_at = preloader.refreshed_at
+
+    # Act
+    deadline: float = time.time() + 5
+    while preloader.refreshed_at == refreshed_at and time.time() < deadline:
+        time.sleep(0.01)
+    preloader.stop()
+
+    # Assert
+    assert preloader.refreshed_at != refreshed_at
+    assert requests_mock.call_count >= 6
+
+# Tests that restored entries expire at their snapshot time plus TTL and expired entries are skipped.
+def test_preload_restore_keeps_snapshot_expiry(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path) -> None:
+    # Arrange
+    mock_reference_data(requests_mock)
+    snapshot_path = str(tmp_path / 'preload.json')
+    CallRail(api_key='123').preload(snapshot_path=snapshot_path)
+    with open(snapshot_path) as f:
+        snapshot: typing.Dict[str, typing.Any] = json.load(f)
+    snapshot['saved_at'] = time.time() - 250
+    with open(snapshot_path, 'w') as f:
+        json.dump(snapshot, f)
+    requests_mock.reset_mock()
+
+    now: typing.List[float] = [0.0]
+    cr = CallRail(api_key='123', cache=ResponseCache(ttls={'tags': 200.0}, clock=lambda: now[0]))
+
+    # Act
+    cr.preload(snapshot_path=snapshot_path)
+    account = cr.list_accounts()[0]
+    account.list_companies()
+    requests_before_expiry: int = requests_mock.call_count
+    account.list_tags()
+    requests_for_tags: int = requests_mock.call_count - requests_before_expiry
+    now[0] = 60.0
+    account.list_companies()
+
+    # Assert
+    assert requests_before_expiry == 0
+    assert requests_for_tags == 1
+    assert requests_mock.call_count == 2
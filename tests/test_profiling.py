@@ -0,0 +1,129 @@
+import pytest
+import pytest_mock
+
+import json
+import pickle
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+from pycallrail.objects.calls import Call
+from pycallrail.objects.form_submissions import FormSubmission
+from pycallrail.profiling import FieldProfile
+import typing
+
+CALL: typing.Dict[str, typing.Any] = {
+    "id": "CAL8154748ae6bd4e278a7cddd38a662f4f",
+    "duration": 4,
+    "start_time": "2017-01-24T11:27:48.119-05:00",
+    "company_id": "COM1",
+    "source": "Google Ads"
+}
+
+# Tests that the first run requests every optional field and records the reads.
+def test_first_run_requests_all_optional_fields(mocker: pytest_mock.MockerFixture, tmp_path: typing.Any) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    account = Account(api_client, 'ACC1', 'test_name', True, False)
+    get = mocker.patch.object(api_client, '_get', return_value=[dict(CALL)])
+    profile = FieldProfile(str(tmp_path / 'profile.json'))
+
+    # Act
+    calls = typing.cast(typing.List[Call], account.list_calls(field_profile=profile))
+    calls[0].company_id
+    calls[0].duration
+
+    # Assert
+    requested = get.call_args.kwargs['params']['fields'].split(',')
+    assert requested == FieldProfile.optional_fields(Call)
+    assert 'duration' not in requested
+    assert 'spam' not in requested
+    assert isinstance(calls[0], Call)
+    assert profile.reads(Call) >= {'company_id', 'duration'}
+
+# Tests that a saved profile narrows the requested fields on the next run.
+def test_saved_profile_narrows_fields(mocker: pytest_mock.MockerFixture, tmp_path: typing.Any) -> None:
+    # Arrange
+    path = str(tmp_path / 'profile.json')
+    api_client = CallRail('test_key')
+    account = Account(api_client, 'ACC1', 'test_name', True, False)
+    get = mocker.patch.object(api_client, '_get', return_value=[dict(CALL)])
+
+    with FieldProfile(path) as profile:
+        calls = typing.cast(typing.List[Call], account.list_calls(field_profile=profile))
+        calls[0].company_id
+        calls[0].duration
+
+    # Act
+    account.list_calls(field_profile=FieldProfile(path))
+
+    # Assert
+    assert json.load(open(path))['Call'] == ['company_id', 'duration']
+    assert get.call_args.kwargs['params']['fields'] == 'company_id'
+
+# Tests that explicitly requested fields take precedence over the profile.
+def test_explicit_fields_win(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    account = Account(api_client, 'ACC1', 'test_name', True, False)
+    get = mocker.patch.object(api_client, '_get', return_value=None)
+
+    # Act
+    account.list_form_submissions(field_profile=FieldProfile(), fields='lead_status')
+
+    # Assert
+    assert get.call_args.kwargs['params']['fields'] == 'lead_status'
+    assert 'submitted_at' not in FieldProfile.optional_fields(FormSubmission)
+
+# Tests that profiled instances behave like and pickle as plain models.
+def test_profiled_instances_pickle_as_models() -> None:
+    # Arrange
+    profile = FieldProfile()
+    profiled = profile.profiled(Call)
+
+    # Act
+    call = profiled.from_json(CallRail('test_key'), 'ACC1', dict(CALL))
+    restored = pickle.loads(pickle.dumps(call))
+
+    # Assert
+    assert profile.profiled(Call) is profiled
+    assert type(call).__name__ == 'Call'
+    assert hash(call) == hash(Call.from_json(CallRail('test_key'), 'ACC1', dict(CALL)))
+    assert type(restored) is Call
+    assert restored.source == 'Google Ads'
+
+# Tests that saving without a path is rejected.
+def test_save_without_path() -> None:
+    with pytest.raises(ValueError):
+        FieldProfile().save()
+
+# Tests that profiling is rejected on a client keeping an identity map, whose instances wouldn't record reads.
+def test_profile_rejected_with_identity_map(mocker: pytest_mock.MockerFixture) -> None:
+    # Arrange
+    api_client = CallRail('test_key', identity_map=True)
+    account = Account(api_client, 'ACC1', 'test_name', True, False)
+    get = mocker.patch.object(api_client, '_get', return_value=[dict(CALL)])
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        account.list_calls(field_profile=FieldProfile())
+    get.assert_not_called()
+
+# Tests that saving keeps the previously learned fields unless pruning is requested.
+def test_save_merges_reads_unless_pruned(tmp_path: typing.Any) -> None:
+    # Arrange
+    path = str(tmp_path / 'profile.json')
+    with open(path, 'w') as f:
+        json.dump({'Call': ['company_id', 'source']}, f)
+
+    merged = FieldProfile(path)
+    merged.profiled(Call).from_json(None, 'ACC1', dict(CALL)).duration
+
+    # Act
+    merged.save()
+    merged_fields = json.load(open(path))['Call']
+    pruned = FieldProfile(path)
+    pruned.profiled(Call).from_json(None, 'ACC1', dict(CALL)).duration
+    pruned.save(prune=True)
+
+    # Assert
+    assert merged_fields == ['company_id', 'duration', 'source']
+    assert json.load(open(path))['Call'] == ['duration']
@@ -0,0 +1,232 @@
+import pytest
+import pytest_mock
+import requests
+
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+from pycallrail.objects.tags import Tag
+from pycallrail.errors import LightValidationError
+from pycallrail.registry import TagRegistry
+import datetime as dt
+import threading
+import typing
+
+def make_tag(api_client: CallRail, id: int, name: str, company_id: str = 'COM1', tag_level: str = 'company') -> Tag:
+    return Tag(
+        api_client=api_client,
+        account_id='ACC1',
+        id=id,
+        name=name,
+        tag_level=tag_level,
+        color='gray1',
+        background_color='gray1',
+        company_id=company_id,
+        status='enabled',
+        created_at=dt.datetime(2017, 1, 24)
+    )
+
+# Tests that tags are resolved by id, by name and by company and name.
+def test_registry_lookups(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    list_tags = mocker.patch.object(Account, 'list_tags', return_value=[
+        make_tag(api_client, 1, 'Lead', tag_level='account'),
+        make_tag(api_client, 2, 'Lead', company_id='COM2'),
+        make_tag(api_client, 3, 'Spam', company_id='COM2'),
+    ])
+
+    # Act
+    tag_registry = account.tag_registry
+
+    # Assert
+    assert tag_registry.get(3).name == 'Spam' # type: ignore
+    assert tag_registry.find('Lead').id == 1 # type: ignore
+    assert tag_registry.find('Lead', company_id='COM2').id == 2 # type: ignore
+    assert tag_registry.find('Lead', company_id='COM3').id == 1 # type: ignore
+    assert tag_registry.find('Spam').id == 3 # type: ignore
+    assert tag_registry.find('Missing') is None
+    assert make_account(api_client).tag_registry is tag_registry
+    list_tags.assert_called_once()
+
+# Tests that a refresh updates tags in place and drops removed ones.
+def test_registry_incremental_refresh(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    mocker.patch.object(Account, 'list_tags', side_effect=[
+        [make_tag(api_client, 1, 'Lead'), make_tag(api_client, 2, 'Spam')],
+        [make_tag(api_client, 1, 'Qualified Lead')],
+    ])
+    tag_registry = account.tag_registry
+    lead: Tag = tag_registry.get(1) # type: ignore
+
+    # Act
+    tag_registry.refresh()
+
+    # Assert
+    assert tag_registry.get(1) is lead
+    assert lead.name == 'Qualified Lead'
+    assert tag_registry.find('Lead') is None
+    assert tag_registry.find('Qualified Lead') is lead
+    assert 2 not in tag_registry
+
+# Tests that a refresh keeps unsaved changes of an indexed tag dirty against the fetched values.
+def test_registry_refresh_keeps_unsaved_changes(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    fetched = make_tag(api_client, 1, 'Lead')
+    fetched.color = 'blue1'
+    fetched._mark_clean()
+    mocker.patch.object(Account, 'list_tags', side_effect=[[make_tag(api_client, 1, 'Lead')], [fetched]])
+    tag_registry = account.tag_registry
+    lead: Tag = tag_registry.get(1) # type: ignore
+    lead.name = 'Qualified Lead'
+
+    # Act
+    tag_registry.refresh()
+
+    # Assert
+    assert lead.name == 'Qualified Lead'
+    assert lead.color == 'blue1'
+    assert lead.changed_fields() == {'name': 'Qualified Lead'}
+
+# Tests that concurrent lookups of a stale registry fetch the tag list once.
+def test_registry_concurrent_refresh(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    started = threading.Event()
+    release = threading.Event()
+
+    def list_tags() -> typing.List[Tag]:
+        started.set()
+        release.wait(5)
+        return [make_tag(api_client, 1, 'Lead')]
+
+    fetch = mocker.patch.object(Account, 'list_tags', side_effect=list_tags)
+    tag_registry = TagRegistry(account)
+
+    # Act
+    first = threading.Thread(target=tag_registry.get, args=(1,))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=tag_registry.get, args=(1,))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    # Assert
+    fetch.assert_called_once()
+    assert tag_registry.get(1).name == 'Lead' # type: ignore
+
+# Tests that create_tag, Tag.update and Tag.delete keep the registry in sync.
+def test_registry_kept_in_sync(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    mocker.patch.object(Account, 'list_tags', return_value=[])
+    tag_registry = account.tag_registry
+    tag_registry.refresh()
+    tag_json: typing.Dict[str, typing.Any] = {
+        'id': 1, 'name': 'Lead', 'tag_level': 'company', 'color': 'gray1', 'background_color': 'gray1',
+        'company_id': 'COM1', 'status': 'enabled', 'created_at': '2017-01-24T11:27:48.119-05:00'
+    }
+    mocker.patch.object(api_client, '_post', return_value=tag_json)
+    mocker.patch.object(api_client, '_put', return_value=None)
+    mocker.patch.object(api_client, '_delete')
+
+    # Act
+    tag = account.create_tag(name='Lead', company_id='COM1', tag_level='company')
+    created = tag_registry.find('Lead', company_id='COM1')
+    tag.update(name='Qualified Lead')
+    renamed = tag_registry.find('Qualified Lead', company_id='COM1')
+    stale = tag_registry.find('Lead', company_id='COM1')
+    tag.delete()
+
+    # Assert
+    assert created is tag
+    assert renamed is tag
+    assert stale is None
+    assert 1 not in tag_registry
+
+# Tests that bulk_create_tags only creates the tags missing from the desired set.
+def test_bulk_create_tags_diffs_current_tags(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    list_tags = mocker.patch.object(Account, 'list_tags', return_value=[
+        make_tag(api_client, 1, 'Lead', company_id='COM1'),
+    ])
+    create_tag = mocker.patch.object(Account, 'create_tag')
+
+    # Act
+    report = account.bulk_create_tags(['Lead', {'name': 'Spam', 'color': 'red1'}], company_ids=['COM1', 'COM2'])
+
+    # Assert
+    assert report.summary()['skipped'] == 1
+    assert report.summary()['succeeded'] == 4
+    assert create_tag.call_count == 3
+    create_tag.assert_any_call(name='Lead', company_id='COM2', tag_level='company')
+    create_tag.assert_any_call(name='Spam', color='red1', company_id='COM1', tag_level='company')
+    list_tags.assert_called_once()
+
+# Tests that bulk_update_tags validates fields and skips tags already in the desired state.
+def test_bulk_update_tags_skips_unchanged(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    mocker.patch.object(Account, 'list_tags', return_value=[
+        make_tag(api_client, 1, 'Lead', company_id='COM1'),
+        make_tag(api_client, 2, 'Lead', company_id='COM2'),
+    ])
+    put = mocker.patch.object(api_client, '_put', return_value=None)
+
+    # Act
+    unchanged = account.bulk_update_tags({'Lead': {'color': 'gray1'}})
+    report = account.bulk_update_tags({'Lead': {'color': 'red1'}}, company_ids=['COM2'])
+
+    # Assert
+    assert unchanged.summary()['skipped'] == 2
+    assert report.summary()['succeeded'] == 1
+    put.assert_called_once()
+    assert account.tag_registry.get(2).color == 'red1' # type: ignore
+    with pytest.raises(LightValidationError):
+        account.bulk_update_tags({'Lead': {'tag_level': 'account'}})
+
+# Tests that bulk_update_tags rejects re-enabling tags, which Tag.update can't send.
+def test_bulk_update_tags_rejects_reenabling(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    mocker.patch.object(Account, 'list_tags', return_value=[make_tag(api_client, 1, 'Lead')])
+    put = mocker.patch.object(api_client, '_put', return_value=None)
+
+    # Act & Assert
+    with pytest.raises(LightValidationError):
+        account.bulk_update_tags({'Lead': {'disabled': False}})
+    put.assert_not_called()
+
+# Tests that bulk_delete_tags deletes tags by id and name and counts tags already gone as deleted.
+def test_bulk_delete_tags(mocker: pytest_mock.MockerFixture, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    api_client = CallRail(api_key='123')
+    account = make_account(api_client)
+    mocker.patch.object(Account, 'list_tags', return_value=[
+        make_tag(api_client, 1, 'Lead', company_id='COM1'),
+        make_tag(api_client, 2, 'Spam', company_id='COM1'),
+    ])
+    gone = requests.Response()
+    gone.status_code = 404
+    delete = mocker.patch.object(api_client, '_delete', side_effect=[None, requests.HTTPError(response=gone)])
+
+    # Act
+    report = account.bulk_delete_tags([1, 'Spam', 'Missing'])
+
+    # Assert
+    assert delete.call_count == 2
+    assert report.summary()['succeeded'] == 3
+    assert report.summary()['skipped'] == 1
+    assert len(account.tag_registry) == 0
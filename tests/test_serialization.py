@@ -0,0 +1,103 @@
+import pytest
+import pytest_mock
+
+import copy
+import pickle
+from pycallrail.base import set_default_client, get_default_client
+from pycallrail.callrail import CallRail
+from pycallrail.objects.calls import Call
+from pycallrail.objects.textmessages import TextMessageConversation
+from pycallrail.serialization import dump_models, load_models
+import typing
+import datetime as dt
+
+@pytest.fixture
+def call_data() -> typing.Dict[str, typing.Any]:
+    return {
+        "answered": False,
+        "customer_city": "Denver",
+        "customer_name": "James Smith",
+        "direction": "inbound",
+        "duration": 4,
+        "id": "CAL8154748ae6bd4e278a7cddd38a662f4f",
+        "start_time": "2017-01-24T11:27:48.119-05:00",
+        "tags": ["New Client"]
+    }
+
+@pytest.fixture(autouse=True)
+def reset_default_client() -> typing.Generator[None, None, None]:
+    yield
+    set_default_client(None)
+
+# Tests that a pickled model leaves out the API client and its session.
+def test_pickle_detaches_client(call_data: typing.Dict[str, typing.Any]) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    call = Call.from_json(api_client, '123', call_data)
+
+    # Act
+    restored: Call = pickle.loads(pickle.dumps(call))
+
+    # Assert
+    assert b'test_key' not in pickle.dumps(call)
+    assert restored.id == call.id
+    assert restored.account_id == '123'
+    assert restored.start_time == call.start_time
+    assert restored.tags == ['New Client']
+    assert restored.api_client is None
+
+# Tests that unpickled models are attached to the default client of the process.
+def test_pickle_attaches_default_client(call_data: typing.Dict[str, typing.Any]) -> None:
+    # Arrange
+    call = Call.from_json(CallRail('test_key'), '123', call_data)
+    worker_client = CallRail('worker_key')
+    set_default_client(worker_client)
+
+    # Act
+    restored: Call = pickle.loads(pickle.dumps(call))
+
+    # Assert
+    assert get_default_client() is worker_client
+    assert restored.api_client is worker_client
+
+# Tests that copies keep the client of the original model.
+def test_copy_keeps_client(call_data: typing.Dict[str, typing.Any]) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    call = Call.from_json(api_client, '123', call_data)
+
+    # Act
+    shallow = copy.copy(call)
+    deep = copy.deepcopy(call)
+
+    # Assert
+    assert shallow.api_client is api_client
+    assert deep.api_client is api_client
+    assert deep.tags == call.tags
+    assert deep.tags is not call.tags
+
+# Tests batch serialization of mixed models.
+def test_dump_and_load_models(call_data: typing.Dict[str, typing.Any]) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    calls = [Call.from_json(api_client, '123', dict(call_data, id=f'CAL{i}')) for i in range(3)]
+    conversation = TextMessageConversation.from_json(api_client, '123', {
+        'id': 'KZaGR',
+        'last_message_at': '2022-01-01T00:00:00Z',
+        'recent_messages': [{'direction': 'incoming', 'content': 'Hello', 'created_at': '2022-01-01T00:00:00Z'}]
+    })
+    worker_client = CallRail('worker_key')
+
+    # Act
+    models = load_models(dump_models(calls + [conversation]), api_client=worker_client)
+
+    # Assert
+    assert [model.id for model in models] == ['CAL0', 'CAL1', 'CAL2', 'KZaGR']
+    assert all(model.api_client is worker_client for model in models)
+    assert isinstance(models[0].start_time, dt.datetime)
+    assert models[3].recent_messages[0].content == 'Hello'
+
+# Tests that unknown batch formats are rejected.
+def test_load_models_invalid_version() -> None:
+    with pytest.raises(ValueError):
+        load_models(pickle.dumps((99, [], [])))
@@ -0,0 +1,85 @@
+import pytest
+import requests_mock
+
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+import typing
+import datetime as dt
+
+msgspec = pytest.importorskip('msgspec')
+
+import pycallrail.structs as structs
+
+# Tests that a page is decoded into structs with datetimes converted.
+def test_decode_page_converts_datetimes() -> None:
+    # Arrange
+    content = b'''{
+        "page": 1, "total_pages": 1,
+        "calls": [{"id": "CAL1", "duration": 4, "start_time": "2017-01-24T11:27:48.119-05:00", "tags": ["a"]}]
+    }'''
+
+    # Act
+    page = structs.decode_page('calls', content)
+
+    # Assert
+    assert page.page == 1
+    assert len(page.calls) == 1
+    assert page.calls[0].id == 'CAL1'
+    assert page.calls[0].duration == 4
+    assert page.calls[0].tags == ['a']
+    assert isinstance(page.calls[0].start_time, dt.datetime)
+    assert page.calls[0].customer_name is None
+
+# Tests that nested text messages are decoded into structs.
+def test_decode_page_conversations() -> None:
+    # Arrange
+    content = b'''{
+        "conversations": [{
+            "id": "KZaGR",
+            "last_message_at": "2016-07-28T19:28:21.578Z",
+            "recent_messages": [{"direction": "incoming", "content": "Hi", "created_at": "2016-07-28T19:28:21.578Z"}]
+        }],
+        "has_next_page": false
+    }'''
+
+    # Act
+    page = structs.decode_page('conversations', content)
+
+    # Assert
+    conversation = page.conversations[0]
+    assert isinstance(conversation.last_message_at, dt.datetime)
+    assert conversation.recent_messages[0].content == 'Hi'
+    assert isinstance(conversation.recent_messages[0].created_at, dt.datetime)
+
+# Tests that unsupported resources are rejected.
+def test_decode_page_unsupported_resource() -> None:
+    with pytest.raises(ValueError):
+        structs.decode_page('invalid', b'{}')
+
+# Tests that list_calls follows relative pagination when decoding structs.
+def test_list_calls_as_structs(requests_mock: requests_mock.Mocker) -> None:
+    # Arrange
+    api_client = CallRail('test_key')
+    account = Account(api_client, 'ACC1', 'test_name', True, False)
+    requests_mock.get(
+        'https://api.callrail.com/v3/a/ACC1/calls.json',
+        json={
+            'calls': [{'id': 'CAL1', 'start_time': '2017-01-24T11:27:48.119-05:00'}],
+            'has_next_page': True,
+            'next_page': 'https://api.callrail.com/v3/a/ACC1/calls.json?relative_pagination=true&offset=1'
+        }
+    )
+    requests_mock.get(
+        'https://api.callrail.com/v3/a/ACC1/calls.json?offset=1',
+        json={
+            'calls': [{'id': 'CAL2', 'start_time': '2017-01-25T11:27:48.119-05:00'}],
+            'has_next_page': False
+        }
+    )
+
+    # Act
+    calls: typing.List[typing.Any] = typing.cast(typing.List[typing.Any], account.list_calls(as_structs=True))
+
+    # Assert
+    assert [call.id for call in calls] == ['CAL1', 'CAL2']
+    assert isinstance(calls[1].start_time, dt.datetime)
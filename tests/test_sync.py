@@ -0,0 +1,76 @@
+import pathlib
+import requests_mock
+
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+from pycallrail.sync import SyncEngine
+import datetime as dt
+import typing
+
+CALLS_URL: str = 'https://api.callrail.com/v3/a/ACC1/calls.json'
+
+# Tests that a sync yields only new or changed calls and lists from the mark minus the overlap.
+def test_sync_yields_changes_after_mark(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account], call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    account = make_account(cr)
+    engine = SyncEngine(cr, str(tmp_path / 'sync.db'), overlap=600)
+    requests_mock.get(CALLS_URL, [
+        {'json': {'calls': [call('CAL1', '2023-01-01T10:00:00+00:00'), call('CAL2', '2023-01-01T11:00:00+00:00')], 'has_next_page': False}},
+        {'json': {'calls': [
+            call('CAL2', '2023-01-01T11:00:00+00:00', note='late update'),
+            call('CAL3', '2023-01-01T12:00:00+00:00'),
+        ], 'has_next_page': False}},
+        {'json': {'calls': [call('CAL3', '2023-01-01T12:00:00+00:00')], 'has_next_page': False}},
+    ])
+
+    # Act
+    first = [c.id for c in engine.sync(account, 'calls')]
+    second = [c.id for c in engine.sync(account, 'calls')]
+    third = [c.id for c in engine.sync(account, 'calls')]
+
+    # Assert
+    assert first == ['CAL1', 'CAL2']
+    assert second == ['CAL2', 'CAL3']
+    assert third == []
+    assert 'start_date' not in requests_mock.request_history[0].qs
+    assert requests_mock.request_history[1].qs['start_date'] == ['2023-01-01t10:50:00+00:00']
+    assert engine.mark('ACC1', 'calls') == dt.datetime(2023, 1, 1, 12, tzinfo=dt.timezone.utc)
+
+# Tests that an interrupted sync doesn't move the mark, so its records are yielded again.
+def test_sync_interrupted(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account], call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    account = make_account(cr)
+    engine = SyncEngine(cr, str(tmp_path / 'sync.db'), initial_start=dt.date(2023, 1, 1))
+    requests_mock.get(CALLS_URL, json={'calls': [call('CAL1', '2023-01-01T10:00:00+00:00')], 'has_next_page': False})
+
+    # Act
+    next(engine.sync(account, 'calls'))
+    retried = [c.id for c in engine.sync(account, 'calls')]
+
+    # Assert
+    assert retried == ['CAL1']
+    assert requests_mock.request_history[0].qs['start_date'] == ['2023-01-01']
+
+# Tests that a filtered sync keeps its own mark and doesn't move the mark of the unfiltered sync.
+def test_sync_filters_keep_their_own_mark(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account], call: typing.Callable[..., typing.Dict[str, typing.Any]]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    account = make_account(cr)
+    engine = SyncEngine(cr, str(tmp_path / 'sync.db'), overlap=0)
+    requests_mock.get(CALLS_URL, [
+        {'json': {'calls': [call('CAL2', '2023-01-02T10:00:00+00:00')], 'has_next_page': False}},
+        {'json': {'calls': [call('CAL1', '2023-01-01T10:00:00+00:00'), call('CAL2', '2023-01-02T10:00:00+00:00')], 'has_next_page': False}},
+    ])
+
+    # Act
+    filtered = [c.id for c in engine.sync(account, 'calls', company_id='COM2', fields='note')]
+    unfiltered = [c.id for c in engine.sync(account, 'calls', fields='note')]
+
+    # Assert
+    assert filtered == ['CAL2']
+    assert unfiltered == ['CAL1', 'CAL2']
+    assert 'start_date' not in requests_mock.request_history[1].qs
+    assert engine.mark('ACC1', 'calls', company_id='COM2') == dt.datetime(2023, 1, 2, 10, tzinfo=dt.timezone.utc)
+    assert engine.mark('ACC1', 'calls', company_id='COM1') is None
@@ -0,0 +1,152 @@
+import pathlib
+import pytest
+import requests_mock
+import requests
+
+from pycallrail.callrail import CallRail
+from pycallrail.objects.accounts import Account
+from pycallrail.write_queue import WriteQueue
+import typing
+
+CALLS_URL: str = 'https://api.callrail.com/v3/a/ACC1/calls.json'
+TEXTS_URL: str = 'https://api.callrail.com/v3/a/ACC1/text-messages.json'
+
+def call_args(number: str) -> typing.Dict[str, typing.Any]:
+    return {'caller_id': 1, 'customer_phone_number': number, 'business_phone_number': '+13038163491'}
+
+# Tests that a key is queued and sent once and its outcome survives a restart.
+def test_write_queue_dedupes_and_persists(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    account = make_account(cr)
+    path = str(tmp_path / 'writes.db')
+    requests_mock.post(CALLS_URL, json={'id': 'CAL1'})
+    requests_mock.post(TEXTS_URL, json={'id': 'SMS1'})
+    write_queue = WriteQueue(cr, path)
+
+    # Act
+    write_queue.enqueue_call(account, 'call-1', **call_args('+13036231131'))
+    write_queue.enqueue_call(account, 'call-1', **call_args('+13036231131'))
+    write_queue.enqueue_text(account, 'text-1', company_id='COM1', customer_phone_number='+13036231131', content='Hi')
+    sent = write_queue.process()
+    write_queue.close()
+    restarted = WriteQueue(cr, path)
+    restarted.enqueue_call(account, 'call-1', **call_args('+13036231131'))
+
+    # Assert
+    assert [write.key for write in sent] == ['call-1', 'text-1']
+    assert requests_mock.call_count == 2
+    assert restarted.process() == []
+    assert restarted.get('call-1').response == {'id': 'CAL1'} # type: ignore
+    assert restarted.stats['done'] == 2
+    with pytest.raises(ValueError):
+        restarted.enqueue_call(account, 'call-1', **call_args('+13030000000'))
+
+# Tests that rate limited writes are resent and writes with an unknown outcome are not.
+def test_write_queue_retries_only_unprocessed(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    account = make_account(cr)
+    requests_mock.post(CALLS_URL, [
+        {'status_code': 429, 'headers': {'Retry-After': '30'}},
+        {'json': {'id': 'CAL1'}},
+        {'exc': requests.exceptions.ReadTimeout},
+    ])
+    now: typing.List[float] = [1000.0]
+    write_queue = WriteQueue(cr, str(tmp_path / 'writes.db'), clock=lambda: now[0])
+    write_queue.enqueue_call(account, 'call-1', **call_args('+13036231131'))
+    write_queue.enqueue_call(account, 'call-2', **call_args('+13036231132'))
+
+    # Act
+    first = write_queue.process()
+    now[0] += 30
+    second = write_queue.process()
+
+    # Assert
+    assert [(write.key, write.status) for write in first] == [('call-1', 'pending'), ('call-2', 'done')]
+    assert [(write.key, write.status, write.attempts) for write in second] == [('call-1', 'uncertain', 2)]
+    assert write_queue.process() == []
+    assert write_queue.requeue('call-1')
+    assert write_queue.stats['pending'] == 1
+
+# Tests that a write in flight when its worker died is marked uncertain once its lease expired.
+def test_write_queue_in_flight_after_restart(tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    path = str(tmp_path / 'writes.db')
+    now: typing.List[float] = [1000.0]
+    write_queue = WriteQueue(cr, path, lease=60, clock=lambda: now[0])
+    write_queue.enqueue_call(make_account(cr), 'call-1', **call_args('+13036231131'))
+    write_queue._claim()
+    write_queue.close()
+
+    # Act
+    restarted = WriteQueue(cr, path, clock=lambda: now[0])
+    leased = restarted.get('call-1').status # type: ignore
+    now[0] += 61
+    sent = restarted.process()
+
+    # Assert
+    assert leased == 'in_flight'
+    assert restarted.get('call-1').status == 'uncertain' # type: ignore
+    assert sent == []
+
+# Tests that a second queue on the same file neither claims nor recovers a write another worker is sending.
+def test_write_queue_shared_between_connections(requests_mock: requests_mock.Mocker, tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    path = str(tmp_path / 'writes.db')
+    requests_mock.post(CALLS_URL, json={'id': 'CAL1'})
+    first = WriteQueue(cr, path)
+    first.enqueue_call(make_account(cr), 'call-1', **call_args('+13036231131'))
+    claimed = first._claim()
+
+    # Act
+    second = WriteQueue(cr, path)
+    sent = second.process()
+    while_sending = second.get('call-1').status # type: ignore
+    first._send(claimed) # type: ignore
+
+    # Assert
+    assert sent == []
+    assert while_sending == 'in_flight'
+    assert second.get('call-1').status == 'done' # type: ignore
+    assert requests_mock.call_count == 1
+
+class RacingConnection(object):
+    """Runs a hook before the first UPDATE, i.e. between a worker selecting a write and claiming it."""
+
+    def __init__(self, connection: typing.Any, hook: typing.Callable[[], None]) -> None:
+        self.connection = connection
+        self.hook: typing.Optional[typing.Callable[[], None]] = hook
+
+    def execute(self, sql: str, *args: typing.Any) -> typing.Any:
+        if sql.startswith('UPDATE') and self.hook is not None:
+            hook, self.hook = self.hook, None
+            hook()
+        return self.connection.execute(sql, *args)
+
+    def __enter__(self) -> typing.Any:
+        return self.connection.__enter__()
+
+    def __exit__(self, *exc_info: typing.Any) -> typing.Any:
+        return self.connection.__exit__(*exc_info)
+
+# Tests that a write selected by two workers at once is only claimed by one of them.
+def test_write_queue_claim_is_atomic(tmp_path: pathlib.Path, make_account: typing.Callable[[CallRail], Account]) -> None:
+    # Arrange
+    cr = CallRail(api_key='123')
+    path = str(tmp_path / 'writes.db')
+    first = WriteQueue(cr, path)
+    second = WriteQueue(cr, path)
+    first.enqueue_call(make_account(cr), 'call-1', **call_args('+13036231131'))
+    claims: typing.List[typing.Any] = []
+    second._connection = RacingConnection(second._connection, lambda: claims.append(first._claim())) # type: ignore
+
+    # Act
+    claims.append(second._claim())
+
+    # Assert
+    assert claims[0] is not None and claims[0].key == 'call-1'
+    assert claims[1] is None
+    assert first.stats['in_flight'] == 1